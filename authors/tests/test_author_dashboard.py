@@ -0,0 +1,62 @@
+from django.urls import reverse
+
+from recipes.models import Recipe
+from recipes.tests.test_recipe_base import RecipeTestBase
+
+
+class AuthorDashboardTest(RecipeTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.author = self.make_author()
+        self.client.login(username='username', password='123456')
+
+    def make_drafts(self, *titles):
+        return Recipe.objects.bulk_create([
+            Recipe(
+                title=title, description='Description', slug=f'draft-{number}',
+                preparation_time=1, preparation_time_unit='min', servings=1,
+                servings_unit='portions', preparation_steps='Steps',
+                author=self.author,
+            )
+            for number, title in enumerate(titles)
+        ])
+
+    def get_titles(self, **params):
+        response = self.client.get(reverse('authors:dashboard'), params)
+        return [recipe.title for recipe in response.context['recipes']]
+
+    def test_dashboard_lists_only_the_author_drafts_newest_first(self):
+        self.make_drafts('First', 'Second')
+        self.make_recipe(
+            title='Published', slug='published',
+            author_data={'username': 'other'},
+        )
+
+        self.assertEqual(self.get_titles(), ['Second', 'First'])
+
+    def test_dashboard_is_paginated(self):
+        self.make_drafts(*[f'Draft {number:02}' for number in range(25)])
+
+        self.assertEqual(len(self.get_titles()), 20)
+        self.assertEqual(self.get_titles(page=2), [f'Draft {number:02}' for number in range(4, -1, -1)])
+
+    def test_dashboard_sorts_and_filters(self):
+        self.make_drafts('Banana cake', 'Apple pie', 'Carrot cake')
+
+        self.assertEqual(self.get_titles(sort='oldest'), ['Banana cake', 'Apple pie', 'Carrot cake'])
+        self.assertEqual(self.get_titles(sort='title'), ['Apple pie', 'Banana cake', 'Carrot cake'])
+        self.assertEqual(self.get_titles(q='cake', sort='title'), ['Banana cake', 'Carrot cake'])
+        self.assertEqual(self.get_titles(sort='invalid'), ['Carrot cake', 'Apple pie', 'Banana cake'])
+
+    def test_dashboard_does_not_load_the_preparation_steps(self):
+        self.make_drafts('Draft')
+        response = self.client.get(reverse('authors:dashboard'))
+        recipe = response.context['recipes'][0]
+
+        self.assertIn('preparation_steps', recipe.get_deferred_fields())
+
+    def test_pagination_links_keep_the_filters(self):
+        self.make_drafts(*[f'Cake {number}' for number in range(25)])
+        response = self.client.get(reverse('authors:dashboard'), {'q': 'cake', 'sort': 'title'})
+
+        self.assertContains(response, '?page=2&amp;sort=title&amp;q=cake')
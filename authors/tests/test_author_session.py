@@ -0,0 +1,79 @@
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from authors.views.all import REGISTER_FORM_COOKIE, get_register_form_state
+from recipes.tests.test_recipe_base import RecipeTestBase
+
+
+class AuthorSessionTest(RecipeTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.form_data = {
+            'username': 'user',
+            'first_name': 'first',
+            'last_name': 'last',
+            'email': 'email@email.com',
+            'password': 'Str0ng321',
+            'password2': 'Str0ng321',
+        }
+
+    def get_session_queries(self, url):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [query['sql'] for query in captured if 'django_session' in query['sql']]
+
+    def test_anonymous_pages_never_touch_the_session(self):
+        recipe = self.make_recipe()
+        urls = [
+            reverse('recipes:home'),
+            reverse('recipes:recipe', args=(recipe.slug,)),
+            reverse('recipes:category', args=(recipe.category.slug,)),
+            reverse('recipes:search') + '?q=recipe',
+            reverse('authors:register'),
+        ]
+
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.get_session_queries(url), [])
+                self.assertNotIn(settings.SESSION_COOKIE_NAME, self.client.cookies)
+
+    def test_logged_in_requests_read_the_session_from_the_cache(self):
+        self.make_author()
+        self.client.login(username='username', password='123456')
+
+        self.assertEqual(self.get_session_queries(reverse('authors:dashboard')), [])
+
+    def test_a_failed_registration_is_kept_in_a_cookie_without_passwords(self):
+        self.form_data['password2'] = 'Other321'
+        url = reverse('authors:register_create')
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.post(url, data=self.form_data, follow=True)
+
+        self.assertNotIn('django_session', str(captured.captured_queries))
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, self.client.cookies)
+        form_state = get_register_form_state(response.wsgi_request)
+        self.assertNotIn('password', form_state['data'])
+        self.assertNotIn('Str0ng321', str(form_state))
+        self.assertEqual(response.context['form']['username'].value(), 'user')
+        self.assertIn(
+            'Password and Confirm password must be equal',
+            response.context['form'].errors['password2'],
+        )
+
+    def test_a_valid_registration_drops_the_kept_form(self):
+        url = reverse('authors:register_create')
+        self.client.post(url, data={**self.form_data, 'password2': ''})
+        response = self.client.post(url, data=self.form_data, follow=True)
+
+        self.assertIn('Your user is created', response.content.decode('utf-8'))
+        self.assertEqual(self.client.cookies[REGISTER_FORM_COOKIE].value, '')
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, self.client.cookies)
+
+    def test_a_tampered_cookie_shows_an_empty_form(self):
+        self.client.cookies[REGISTER_FORM_COOKIE] = 'forged'
+        response = self.client.get(reverse('authors:register'))
+
+        self.assertFalse(response.context['form'].errors)
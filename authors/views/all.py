@@ -1,18 +1,53 @@
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
+from django.core import signing
 from django.http import Http404
 from django.shortcuts import redirect, render
 from django.urls import reverse
+from django.utils.http import urlencode
 
 from authors.forms import LoginForm, RegisterForm
 from authors.forms.recipe import AuthorRecipeForm
 from recipes.models import Recipe
+from utils.pagination import make_pagination
+
+DASHBOARD_PER_PAGE = 20
+DASHBOARD_SORTS = {
+    'newest': ('-id',),
+    'oldest': ('id',),
+    'title': ('title', '-id'),
+}
+
+# a failed registration is shown again from a signed cookie, not the
+# session, anonymous visitors never write the session table. The
+# passwords are never kept.
+REGISTER_FORM_COOKIE = 'register_form'
+REGISTER_FORM_MAX_AGE = 60 * 60
+REGISTER_KEPT_FIELDS = ('username', 'first_name', 'last_name', 'email')
+
+
+def get_register_form_state(request):
+    try:
+        return signing.loads(
+            request.COOKIES[REGISTER_FORM_COOKIE],
+            salt=REGISTER_FORM_COOKIE,
+            max_age=REGISTER_FORM_MAX_AGE,
+        )
+    except (KeyError, signing.BadSignature):
+        return None
 
 
 def register_view(request):
-    register_form_data = request.session.get('register_form_data', None)
-    form = RegisterForm(register_form_data)
+    form = RegisterForm()
+    form_state = get_register_form_state(request)
+
+    if form_state:
+        # the errors of the last post, the passwords are typed again
+        form = RegisterForm(initial=form_state['data'])
+        for field, field_errors in form_state['errors'].items():
+            form.errors[field] = form.error_class(field_errors)
 
     context = {
         'form': form,
@@ -25,8 +60,6 @@ def register_create(request):
     if not request.POST:
         raise Http404()
 
-    POST = request.POST
-    request.session['register_form_data'] = POST
     form = RegisterForm(request.POST)
 
     if form.is_valid():
@@ -35,10 +68,25 @@ def register_create(request):
         user.save()
         messages.success(request, 'Your user is created, please log in.')
 
-        del (request.session['register_form_data'])
-        return redirect('authors:login')
+        response = redirect('authors:login')
+        response.delete_cookie(REGISTER_FORM_COOKIE, path=reverse('authors:register'))
+        return response
 
-    return redirect('authors:register')
+    form_state = {
+        'data': {field: request.POST.get(field, '') for field in REGISTER_KEPT_FIELDS},
+        'errors': {field: list(field_errors) for field, field_errors in form.errors.items()},
+    }
+    response = redirect('authors:register')
+    response.set_cookie(
+        REGISTER_FORM_COOKIE,
+        signing.dumps(form_state, salt=REGISTER_FORM_COOKIE, compress=True),
+        max_age=REGISTER_FORM_MAX_AGE,
+        path=reverse('authors:register'),
+        secure=settings.SESSION_COOKIE_SECURE,
+        httponly=True,
+        samesite='Lax',
+    )
+    return response
 
 
 def login_view(request):
@@ -86,11 +134,29 @@ def logout_view(request):
 
 @login_required(login_url='authors:login', redirect_field_name='next')
 def dashboard(request):
+    sort = request.GET.get('sort', '')
+    if sort not in DASHBOARD_SORTS:
+        sort = 'newest'
+    search_term = request.GET.get('q', '').strip()
+
+    # only the columns the list shows, the index covers author and drafts
     recipes = Recipe.objects.filter(
         is_published=False,
         author=request.user
+    ).only('id', 'title', 'slug').order_by(*DASHBOARD_SORTS[sort])
+
+    if search_term:
+        recipes = recipes.filter(title__icontains=search_term)
+
+    page_obj, pagination_range = make_pagination(
+        request, recipes, DASHBOARD_PER_PAGE
     )
     context = {
-        'recipes': recipes,
+        'recipes': page_obj,
+        'pagination_range': pagination_range,
+        'sort': sort,
+        'sorts': DASHBOARD_SORTS,
+        'q': search_term,
+        'additional_url_query': '&' + urlencode({'sort': sort, 'q': search_term}),
     }
     return render(request, 'authors/pages/dashboard.html', context)
@@ -14,4 +14,78 @@ function delete_confirmation() {
     }
 }
 
-delete_confirmation()
\ No newline at end of file
+delete_confirmation()
+
+function search_suggestions() {
+    const form = document.querySelector('.search-form[data-suggest-url]');
+
+    if (!form) {
+        return;
+    }
+
+    const input = form.querySelector('.search-input');
+    const list = form.querySelector('.search-suggestions');
+    const kinds = {category: 'Category', tag: 'Tag', recipe: 'Recipe'};
+    let timer = null;
+    let controller = null;
+
+    function show(results) {
+        list.replaceChildren();
+
+        for (const result of results) {
+            const link = document.createElement('a');
+            link.href = result.url;
+            link.textContent = result.label;
+
+            const kind = document.createElement('span');
+            kind.className = 'search-suggestion-kind';
+            kind.textContent = kinds[result.kind];
+
+            const item = document.createElement('li');
+            item.append(link, kind);
+            list.append(item);
+        }
+
+        list.hidden = results.length === 0;
+    }
+
+    function fetch_suggestions() {
+        const query = input.value.trim();
+
+        if (controller) {
+            controller.abort();
+        }
+
+        if (query.length < 2) {
+            show([]);
+            return;
+        }
+
+        controller = new AbortController();
+        const url = form.dataset.suggestUrl + '?q=' + encodeURIComponent(query);
+
+        fetch(url, {signal: controller.signal})
+            .then(function(response) { return response.json(); })
+            .then(function(data) { show(data.results); })
+            .catch(function() {});
+    }
+
+    input.addEventListener('input', function() {
+        clearTimeout(timer);
+        timer = setTimeout(fetch_suggestions, 150);
+    });
+
+    input.addEventListener('keydown', function(e) {
+        if (e.key === 'Escape') {
+            show([]);
+        }
+    });
+
+    document.addEventListener('click', function(e) {
+        if (!form.contains(e.target)) {
+            show([]);
+        }
+    });
+}
+
+search_suggestions()
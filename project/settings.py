@@ -109,6 +109,54 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    }
+}
+
+
+# Sessions
+# https://docs.djangoproject.com/en/4.1/topics/http/sessions/
+# read from the cache and written to the database as well, which answers
+# a cache miss. With several processes CACHE_BACKEND must be shared, like
+# the cache generations already require.
+
+SESSION_ENGINE = os.environ.get(
+    'SESSION_ENGINE', 'django.contrib.sessions.backends.cached_db'
+)
+
+
+# Anonymous list pages (recipes.page_cache)
+
+PAGE_CACHE_TIMEOUT = int(os.environ.get('PAGE_CACHE_TIMEOUT', 300))
+
+
+# Pagination counts (utils.counting)
+# exact, cached (COUNT_CACHE_TIMEOUT seconds) or estimated (PostgreSQL
+# planner rows when above COUNT_ESTIMATE_THRESHOLD)
+
+COUNT_STRATEGY = os.environ.get('COUNT_STRATEGY', 'exact')
+COUNT_CACHE_TIMEOUT = int(os.environ.get('COUNT_CACHE_TIMEOUT', 60))
+COUNT_ESTIMATE_THRESHOLD = int(os.environ.get('COUNT_ESTIMATE_THRESHOLD', 100_000))
+
+# Serve the public recipe pages with the async views, for ASGI deployments
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS') == '1'
+
+# Processes resizing the recipe covers, 0 resizes them during the request
+COVER_DERIVATIVE_WORKERS = int(os.environ.get('COVER_DERIVATIVE_WORKERS', 2))
+
+# Sitemaps and feeds (recipes.sitemaps), written to disk on first request
+SITEMAP_ROOT = Path(os.environ.get('SITEMAP_ROOT', BASE_DIR / 'sitemaps'))
+SITEMAP_CHUNK_SIZE = int(os.environ.get('SITEMAP_CHUNK_SIZE', 10_000))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -151,6 +199,10 @@ STATICFILES_DIRS = [
 
 STATIC_ROOT = BASE_DIR / 'static'
 
+# collectstatic minifies, fingerprints and precompresses the files, and
+# utils.static_assets.serve_static serves them with far-future caching
+STATICFILES_STORAGE = 'utils.static_assets.CompressedManifestStaticFilesStorage'
+
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -161,6 +213,9 @@ MEDIA_ROOT = BASE_DIR / 'media'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# in a signed cookie, showing a message never reads or writes the session
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
 MESSAGE_TAGS = {
     constants.DEBUG: 'message-debug',
     constants.ERROR: 'message-error',
@@ -172,6 +227,12 @@ MESSAGE_TAGS = {
 
 # Django Debug Toolbar
 
+# its middleware is sync only and would run every async view in a thread,
+# the toolbar only shows with DEBUG anyway
+if not DEBUG:
+    MIDDLEWARE.remove('debug_toolbar.middleware.DebugToolbarMiddleware')
+    SILENCED_SYSTEM_CHECKS = ['debug_toolbar.W001']
+
 INTERNAL_IPS = [
     "127.0.0.1",
 ]
\ No newline at end of file
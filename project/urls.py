@@ -18,12 +18,15 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from utils.static_assets import serve_static
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('recipes.urls')),
     path('authors/', include('authors.urls')),
+    path('api/', include('recipes.api_urls')),
     path('__debug__/', include('debug_toolbar.urls')),
+    path(f'{settings.STATIC_URL.strip("/")}/<path:path>', serve_static),
 ]
 
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
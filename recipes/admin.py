@@ -1,13 +1,17 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.contenttypes.admin import GenericStackedInline
 
 from tag.models import Tag
+from utils.admin_filters import input_filter
+from utils.counting import EstimatedCountPaginator
 
 from .models import Category, Recipe
+from .publishing import set_published
 
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
+    list_display = ['name', 'slug', 'published_recipes_count']
     prepopulated_fields = {'slug': ('name',)}
 
 
@@ -16,12 +20,41 @@ class CategoryAdmin(admin.ModelAdmin):
 class RecipeAdmin(admin.ModelAdmin):
     list_display = ['id', 'title', 'slug', 'is_published', 'created_at', 'author']
     list_display_links = ['title', 'slug']
-    list_editable = ['is_published', ]
+    list_select_related = ['author']
     prepopulated_fields = {
         'slug': ('title',)
     }
-    search_fields = 'id', 'title', 'description', 'slug', 'preparation_steps'
-    list_filter = 'category', 'author', 'is_published', 'preparation_steps_is_html'
+    # only shows the search box, get_search_results goes to the search index
+    search_fields = 'title',
+    list_filter = (
+        input_filter('author', 'author', 'author__username'),
+        input_filter('category', 'category', 'category__slug'),
+        'is_published', 'preparation_steps_is_html',
+    )
     list_per_page = 10
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     ordering = ('-id',)
     autocomplete_fields = 'tags',
+    actions = ['publish', 'unpublish']
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        if search_term.isdigit():
+            return queryset.filter(pk=int(search_term)), False
+        return queryset.search(search_term), False
+
+    def set_published(self, request, queryset, is_published):
+        changed = set_published(queryset, is_published)
+        state = 'published' if is_published else 'unpublished'
+        self.message_user(request, f'{changed} recipe(s) {state}.', messages.SUCCESS)
+
+    @admin.action(permissions=['change'], description='Publish selected recipes')
+    def publish(self, request, queryset):
+        self.set_published(request, queryset, True)
+
+    @admin.action(permissions=['change'], description='Unpublish selected recipes')
+    def unpublish(self, request, queryset):
+        self.set_published(request, queryset, False)
@@ -0,0 +1,311 @@
+import json
+from functools import wraps
+
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import (get_conditional_response, patch_cache_control,
+                                set_response_etag)
+from django.views.decorators.http import require_safe
+
+from tag.models import Tag
+from utils.pagination import (CURSOR_PARAM, make_keyset_pagination,
+                              make_pagination)
+from utils.sanitizer import render_text
+
+from .models import Category, Recipe
+from .suggest import SUGGESTIONS, suggest, suggestion_url
+
+API_PER_PAGE = 20
+API_MAX_PER_PAGE = 100
+EXPORT_CHUNK_SIZE = 500
+JSON_SEPARATORS = (',', ':')
+# every keystroke asks, the same prefix is answered from the browser cache
+SUGGEST_MAX_AGE = 60
+
+# field: the columns it is read from
+RECIPE_FIELDS = {
+    'id': ('id',),
+    'title': ('title',),
+    'slug': ('slug',),
+    'url': ('slug',),
+    'description': ('description',),
+    'preparation_time': ('preparation_time', 'preparation_time_unit'),
+    'servings': ('servings', 'servings_unit'),
+    'created_at': ('created_at',),
+    'updated_at': ('updated_at',),
+    'cover': ('cover', 'cover_width', 'cover_height'),
+    'author': ('author__username', 'author__first_name', 'author__last_name'),
+    'category': ('category__name', 'category__slug'),
+}
+RECIPE_DETAIL_FIELDS = {
+    **RECIPE_FIELDS,
+    'preparation_steps': (
+        'preparation_steps_html', 'preparation_steps', 'preparation_steps_is_html',
+    ),
+    # read with a query of their own
+    'tags': (),
+}
+CATEGORY_FIELDS = ('id', 'name', 'slug', 'published_recipes_count')
+TAG_FIELDS = ('id', 'name', 'slug', 'published_recipes_count')
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def json_response(request, data, status=200):
+    """
+    A compact JsonResponse with an ETag of its content, answered with a 304
+    when the client already has it.
+    """
+    response = JsonResponse(
+        data, status=status, json_dumps_params={'separators': JSON_SEPARATORS},
+    )
+
+    if status != 200:
+        return response
+
+    set_response_etag(response)
+    return get_conditional_response(
+        request, etag=response.headers['ETag'], response=response,
+    )
+
+
+def api_view(view):
+    """require_safe, with ApiError answered as a JSON error."""
+    @require_safe
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as error:
+            return json_response(request, {'detail': str(error)}, status=error.status)
+
+    return wrapper
+
+
+def get_fields(request, available):
+    """The fields of ?fields=a,b or every available one."""
+    requested = [
+        field.strip() for field in request.GET.get('fields', '').split(',')
+        if field.strip()
+    ]
+    if not requested:
+        return list(available)
+
+    unknown = [field for field in requested if field not in available]
+    if unknown:
+        raise ApiError(f'Unknown fields: {", ".join(unknown)}.')
+
+    return list(dict.fromkeys(requested))
+
+
+def get_columns(fields, available):
+    # the id is the cursor, it is always selected
+    columns = {'id': None}
+    for field in fields:
+        columns.update(dict.fromkeys(available[field]))
+    return list(columns)
+
+
+def get_limit(request):
+    try:
+        limit = int(request.GET.get('limit', API_PER_PAGE))
+    except ValueError:
+        raise ApiError('limit must be a number.')
+    return min(max(limit, 1), API_MAX_PER_PAGE)
+
+
+def filter_recipes(request):
+    """The published recipes, filtered like the home, category, tag and search pages."""
+    queryset = Recipe.objects.published().order_by('-id')
+
+    if category := request.GET.get('category'):
+        queryset = queryset.in_category(category)
+
+    if tag := request.GET.get('tag'):
+        queryset = queryset.with_tag(tag)
+
+    if search_term := request.GET.get('q', '').strip():
+        queryset = queryset.search(search_term)
+
+    return queryset
+
+
+def serialize_recipe(row, fields):
+    data = {}
+
+    for field in fields:
+        if field == 'url':
+            value = reverse('recipes_api:recipe', args=(row.slug,))
+        elif field == 'preparation_time':
+            value = {'value': row.preparation_time, 'unit': row.preparation_time_unit}
+        elif field == 'servings':
+            value = {'value': row.servings, 'unit': row.servings_unit}
+        elif field == 'cover':
+            value = None
+            if row.cover:
+                value = {
+                    'url': default_storage.url(row.cover),
+                    'width': row.cover_width,
+                    'height': row.cover_height,
+                }
+        elif field == 'author':
+            value = None
+            if row.author__username is not None:
+                value = {
+                    'username': row.author__username,
+                    'first_name': row.author__first_name,
+                    'last_name': row.author__last_name,
+                }
+        elif field == 'category':
+            value = None
+            if row.category__slug is not None:
+                value = {'name': row.category__name, 'slug': row.category__slug}
+        elif field == 'preparation_steps':
+            value = row.preparation_steps_html or render_text(
+                row.preparation_steps, row.preparation_steps_is_html,
+            )
+        else:
+            value = getattr(row, field)
+
+        data[field] = value
+
+    return data
+
+
+def page_url(request, **params):
+    query = request.GET.copy()
+    for key in (CURSOR_PARAM, 'page'):
+        query.pop(key, None)
+    query.update(params)
+    return request.build_absolute_uri(f'{request.path}?{query.urlencode()}')
+
+
+def paginate(request, queryset, per_page, keyset=True):
+    """
+    A page of rows with the absolute urls of its neighbours: cursors on
+    (-id), or page numbers when the order is by relevance instead.
+    """
+    if keyset:
+        page_obj, _ = make_keyset_pagination(request, queryset, per_page)
+        next_url = previous_url = None
+        if page_obj.next_cursor:
+            next_url = page_url(request, **{CURSOR_PARAM: page_obj.next_cursor})
+        if page_obj.previous_cursor:
+            previous_url = page_url(request, **{CURSOR_PARAM: page_obj.previous_cursor})
+        return list(page_obj), next_url, previous_url
+
+    page_obj, _ = make_pagination(request, queryset, per_page)
+    next_url = previous_url = None
+    if page_obj.has_next():
+        next_url = page_url(request, page=page_obj.next_page_number())
+    if page_obj.has_previous():
+        previous_url = page_url(request, page=page_obj.previous_page_number())
+    return list(page_obj), next_url, previous_url
+
+
+@api_view
+def recipe_list(request):
+    """Published recipes, newest first, or by relevance with ?q=."""
+    fields = get_fields(request, RECIPE_FIELDS)
+    queryset = filter_recipes(request).values_list(
+        *get_columns(fields, RECIPE_FIELDS), named=True,
+    )
+
+    rows, next_url, previous_url = paginate(
+        request, queryset, get_limit(request),
+        keyset=not request.GET.get('q', '').strip(),
+    )
+
+    return json_response(request, {
+        'next': next_url,
+        'previous': previous_url,
+        'results': [serialize_recipe(row, fields) for row in rows],
+    })
+
+
+@api_view
+def recipe_export(request):
+    """
+    Every published recipe matching the filters as JSON lines, streamed in
+    chunks so the memory stays flat however many there are.
+    """
+    fields = get_fields(request, RECIPE_FIELDS)
+    rows = filter_recipes(request).values_list(
+        *get_columns(fields, RECIPE_FIELDS), named=True,
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    lines = (
+        json.dumps(
+            serialize_recipe(row, fields),
+            cls=DjangoJSONEncoder, separators=JSON_SEPARATORS,
+        ) + '\n'
+        for row in rows
+    )
+
+    response = StreamingHttpResponse(lines, content_type='application/x-ndjson')
+    response['Content-Disposition'] = 'attachment; filename="recipes.jsonl"'
+    return response
+
+
+@api_view
+def recipe_detail(request, slug):
+    fields = get_fields(request, RECIPE_DETAIL_FIELDS)
+    row = Recipe.objects.published().filter(slug=slug).values_list(
+        *get_columns(fields, RECIPE_DETAIL_FIELDS), named=True,
+    ).first()
+
+    if row is None:
+        raise ApiError('Not found.', status=404)
+
+    data = serialize_recipe(row, [field for field in fields if field != 'tags'])
+    if 'tags' in fields:
+        data['tags'] = list(
+            Tag.objects.filter(recipe=row.id).order_by('name').values('name', 'slug')
+        )
+
+    return json_response(request, data)
+
+
+def make_list_view(model, columns):
+    @api_view
+    def view(request):
+        rows, next_url, previous_url = paginate(
+            request, model.objects.values_list(*columns, named=True),
+            get_limit(request),
+        )
+        return json_response(request, {
+            'next': next_url,
+            'previous': previous_url,
+            'results': [row._asdict() for row in rows],
+        })
+
+    view.__name__ = f'{model._meta.model_name}_list'
+    return view
+
+
+category_list = make_list_view(Category, CATEGORY_FIELDS)
+tag_list = make_list_view(Tag, TAG_FIELDS)
+
+
+@api_view
+def suggestions(request):
+    """Recipe titles, categories and tags starting with ?q, from memory."""
+    query = request.GET.get('q', '')
+    results = [
+        {
+            'kind': suggestion.kind,
+            'label': suggestion.label,
+            'url': suggestion_url(suggestion),
+        }
+        for suggestion in suggest(query, SUGGESTIONS)
+    ]
+
+    response = json_response(request, {'query': query, 'results': results})
+    patch_cache_control(response, public=True, max_age=SUGGEST_MAX_AGE)
+    return response
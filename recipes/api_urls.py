@@ -0,0 +1,15 @@
+from django.urls import path
+
+from . import api
+
+# {% url 'recipes_api:recipes' %}
+app_name = 'recipes_api'
+
+urlpatterns = [
+    path('recipes/', api.recipe_list, name='recipes'),
+    path('recipes/<slug:slug>/', api.recipe_detail, name='recipe'),
+    path('export/recipes/', api.recipe_export, name='export'),
+    path('categories/', api.category_list, name='categories'),
+    path('tags/', api.tag_list, name='tags'),
+    path('suggest/', api.suggestions, name='suggest'),
+]
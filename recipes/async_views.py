@@ -0,0 +1,132 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.http.response import Http404
+
+from utils.pagination import amake_keyset_pagination, amake_pagination
+
+from . import views
+from .cards import get_recipe_cards
+from .conditional import ConditionalListMixin
+from .models import Recipe
+from .page_cache import AsyncAnonymousPageCacheMixin
+from tag.models import Tag
+
+# Native async versions of the public views in views.py, served instead
+# of them when ASYNC_VIEWS is on. They build the same querysets and await
+# the database round trips.
+
+
+class AsyncRecipeListMixin:
+    async def get(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        context = await self.aget_context_data()
+        return self.render_to_response(context)
+
+    async def apaginate(self, queryset):
+        if self.use_keyset_pagination():
+            return await amake_keyset_pagination(self.request, queryset, views.PER_PAGE)
+        return await amake_pagination(
+            self.request, queryset, views.PER_PAGE,
+            count_strategy=self.get_count_strategy(),
+        )
+
+    async def aget_context_data(self, **kwargs):
+        page_obj, pagination_range = await self.apaginate(self.object_list)
+        return await self.make_context(page_obj, pagination_range, **kwargs)
+
+    async def make_context(self, page_obj, pagination_range, **kwargs):
+        # cards are rendered from the cache, both are sync
+        recipe_cards = await sync_to_async(get_recipe_cards)(page_obj)
+
+        return {
+            'view': self,
+            'recipes': page_obj,
+            'object_list': page_obj,
+            'recipe_cards': recipe_cards,
+            'pagination_range': pagination_range,
+            **kwargs,
+        }
+
+
+class RecipeListViewBase(AsyncRecipeListMixin, views.RecipeListViewBase):
+    pass
+
+
+class RecipeListViewHome(ConditionalListMixin, AsyncAnonymousPageCacheMixin, RecipeListViewBase):
+    template_name = 'recipes/pages/home.html'
+
+
+class RecipeListViewCategory(ConditionalListMixin, AsyncAnonymousPageCacheMixin, RecipeListViewBase):
+    template_name = 'recipes/pages/category.html'
+
+    def get_queryset(self, *args, **kwargs):
+        # an empty page is the 404, no separate exists() round trip
+        return super().get_queryset(*args, **kwargs).in_category(
+            self.kwargs.get('category_slug'),
+        )
+
+    async def aget_context_data(self, **kwargs):
+        page_obj, pagination_range = await self.apaginate(self.object_list)
+
+        if not page_obj.object_list:
+            raise Http404()
+
+        return await self.make_context(
+            page_obj, pagination_range,
+            title=f'{page_obj[0].category.name} - Category Recipes ',
+        )
+
+
+class RecipeListViewSearch(AsyncRecipeListMixin, views.RecipeListViewSearch):
+    async def aget_context_data(self, **kwargs):
+        search_term = self.request.GET.get('q', '')
+
+        return await super().aget_context_data(
+            page_title=f'Search for "{search_term}"',
+            q=search_term,
+            additional_url_query=f'&q={search_term}',
+        )
+
+
+class RecipeListViewTag(ConditionalListMixin, AsyncAnonymousPageCacheMixin, RecipeListViewBase):
+    template_name = 'recipes/pages/tag.html'
+
+    def get_queryset(self, *args, **kwargs):
+        return super().get_queryset(*args, **kwargs).with_tag(
+            self.kwargs.get('slug', ''),
+        )
+
+    async def aget_context_data(self, **kwargs):
+        # the tag and the page do not depend on each other
+        tag, (page_obj, pagination_range) = await asyncio.gather(
+            Tag.objects.filter(slug=self.kwargs.get('slug', '')).afirst(),
+            self.apaginate(self.object_list),
+        )
+
+        page_title = tag or 'No recipes found'
+
+        return await self.make_context(
+            page_obj, pagination_range, page_title=f'{page_title} - Tag',
+        )
+
+
+class RecipeDetail(views.RecipeDetail):
+    async def get(self, request, *args, **kwargs):
+        try:
+            self.object = await Recipe.objects.select_related(
+                'author', 'category'
+            ).prefetch_related('tags').aget(
+                slug=self.kwargs.get('recipe_slug'),
+                is_published=True,
+            )
+        except Recipe.DoesNotExist:
+            raise Http404()
+
+        related_recipes = [recipe async for recipe in self.get_related_recipes()]
+        recipe_cards = await sync_to_async(get_recipe_cards)(related_recipes)
+
+        context = self.get_context_data(
+            object=self.object, related_recipes=related_recipes, recipe_cards=recipe_cards,
+        )
+        return self.render_to_response(context)
@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils import translation
+
+from utils.cache import get_generations
+
+CARD_TEMPLATE = 'recipes/partials/recipe.html'
+CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+# The category and author of a card are versioned apart from the recipe
+# row, a rename bumps their version instead of every recipe's updated_at.
+def category_version(category_id):
+    return f'recipe-category:{category_id}'
+
+
+def author_version(author_id):
+    return f'recipe-author:{author_id}'
+
+
+def card_versions(recipe):
+    return [category_version(recipe.category_id), author_version(recipe.author_id)]
+
+
+def card_cache_key(recipe, language=None, generations=None):
+    language = language or translation.get_language() or settings.LANGUAGE_CODE
+    if generations is None:
+        generations = get_generations(card_versions(recipe))
+
+    versions = ':'.join(str(generations[name]) for name in card_versions(recipe))
+    return f'recipe-card:{language}:{recipe.id}:{recipe.updated_at.timestamp()}:{versions}'
+
+
+def render_card(recipe):
+    return render_to_string(CARD_TEMPLATE, {'recipe': recipe})
+
+
+def get_recipe_cards(recipes):
+    """
+    Returns the rendered list card of each recipe by id, reading all of them
+    with one cache round trip, after one for the versions of their categories
+    and authors, and rendering only the missing ones.
+    """
+    recipes = list(recipes)
+    generations = get_generations({
+        name for recipe in recipes for name in card_versions(recipe)
+    })
+    recipes_by_key = {
+        card_cache_key(recipe, generations=generations): recipe for recipe in recipes
+    }
+    cards = cache.get_many(recipes_by_key.keys())
+
+    missing = {
+        key: render_card(recipe)
+        for key, recipe in recipes_by_key.items()
+        if key not in cards
+    }
+
+    if missing:
+        cache.set_many(missing, CARD_CACHE_TIMEOUT)
+        cards.update(missing)
+
+    return {recipe.id: cards[key] for key, recipe in recipes_by_key.items()}
+
+
+def delete_recipe_cards(recipe):
+    languages = {settings.LANGUAGE_CODE, translation.get_language()}
+    generations = get_generations(card_versions(recipe))
+    cache.delete_many([
+        card_cache_key(recipe, language, generations) for language in languages if language
+    ])
@@ -0,0 +1,150 @@
+import hashlib
+from collections import namedtuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from utils.cache import get_generation
+
+from .page_cache import PAGE_CACHE_GENERATION
+
+ListStats = namedtuple('ListStats', 'count last_modified')
+
+# What a detail page shows besides the recipe row is versioned apart, a
+# change of it bumps a generation instead of touching updated_at. Tag
+# renames are rare and validate every page again.
+RECIPE_TAGS_GENERATION = 'recipe-tags'
+
+
+def recipe_version(recipe_id):
+    """The tag links and cover derivatives of one recipe."""
+    return f'recipe-detail:{recipe_id}'
+
+
+def list_stats_key(queryset):
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.md5(f'{sql}{params}'.encode()).hexdigest()
+    generation = get_generation(PAGE_CACHE_GENERATION)
+    return f'list-stats:{queryset.db}:{generation}:{digest}'
+
+
+def get_list_stats(queryset):
+    """
+    The number of recipes in the list and when the latest of them changed,
+    one aggregate cached until the next content change.
+    """
+    queryset = queryset.order_by()
+    try:
+        key = list_stats_key(queryset)
+    except EmptyResultSet:
+        # nothing can match, e.g. .none() or an empty __in
+        return ListStats(0, None)
+
+    stats = cache.get(key)
+
+    if stats is None:
+        stats = queryset.aggregate(
+            count=Count('id'), last_modified=Max('updated_at'),
+        )
+        stats = (stats['count'], stats['last_modified'])
+        cache.set(key, stats, settings.PAGE_CACHE_TIMEOUT)
+
+    return ListStats(*stats)
+
+
+def make_etag(request, *parts):
+    # the full path tells the pages, the filters and the cursors apart
+    raw = ':'.join(str(part) for part in (request.get_full_path(), *parts))
+    return quote_etag(hashlib.md5(raw.encode()).hexdigest())
+
+
+def is_conditional_request(request):
+    # a pending message changes the page, len() does not consume it
+    return (
+        request.method in ('GET', 'HEAD') and
+        not len(messages.get_messages(request))
+    )
+
+
+def set_validators(response, etag, last_modified):
+    if response.status_code != 200:
+        return response
+
+    if not response.has_header('ETag'):
+        response['ETag'] = etag
+    if last_modified is not None and not response.has_header('Last-Modified'):
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+
+    # stored, but checked with the server before every use
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    Answers GET and HEAD with 304 Not Modified, before the page is queried
+    or rendered, when the client already has the current version of it.
+    Views return their (etag, last_modified) from get_validators().
+    """
+
+    def get_validators(self):
+        raise NotImplementedError
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return self.adispatch(request, *args, **kwargs)
+
+        if not is_conditional_request(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        etag, last_modified = self.get_validators()
+        response = self.get_not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        response = super().dispatch(request, *args, **kwargs)
+        return set_validators(response, etag, last_modified)
+
+    async def adispatch(self, request, *args, **kwargs):
+        if not await sync_to_async(is_conditional_request)(request):
+            return await super().dispatch(request, *args, **kwargs)
+
+        etag, last_modified = await sync_to_async(self.get_validators)()
+        response = self.get_not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        response = await super().dispatch(request, *args, **kwargs)
+        return set_validators(response, etag, last_modified)
+
+    def get_not_modified(self, request, etag, last_modified):
+        return get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=last_modified and int(last_modified.timestamp()),
+        )
+
+
+class ConditionalListMixin(ConditionalGetMixin):
+    """
+    Validates a recipe list by the count and the latest updated_at of its
+    recipes, and the page generation that a change of the categories and
+    authors on the cards also moves. The count is kept in list_stats for
+    the paginator to reuse.
+    """
+    list_stats = None
+
+    def get_validators(self):
+        self.list_stats = get_list_stats(self.get_queryset())
+        return (
+            make_etag(
+                self.request, *self.list_stats, get_generation(PAGE_CACHE_GENERATION),
+            ),
+            self.list_stats.last_modified,
+        )
@@ -0,0 +1,95 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from tag.models import Tag
+
+from .models import Category, Recipe
+
+COUNTER_FIELD = 'published_recipes_count'
+# model, the name Recipe is reached by from it
+COUNTED_MODELS = ((Category, 'recipe'), (Tag, 'recipe'))
+
+
+def adjust_counts(model, pks, delta):
+    """Adds delta to the counter of the given rows in one UPDATE."""
+    pks = [pk for pk in pks if pk is not None]
+    if pks and delta:
+        model.objects.filter(pk__in=pks).update(
+            **{COUNTER_FIELD: F(COUNTER_FIELD) + delta}
+        )
+
+
+def recipe_tag_ids(recipe_id, tag_ids=None):
+    """The tags linked to the recipe, limited to tag_ids when given."""
+    links = Recipe.tags.through.objects.filter(recipe_id=recipe_id)
+    if tag_ids is not None:
+        links = links.filter(tag_id__in=tag_ids)
+    return list(links.values_list('tag_id', flat=True))
+
+
+def published_recipe_ids(tag_id, recipe_ids=None):
+    """The published recipes linked to the tag, limited to recipe_ids when given."""
+    links = Recipe.tags.through.objects.filter(
+        tag_id=tag_id, recipe__is_published=True,
+    )
+    if recipe_ids is not None:
+        links = links.filter(recipe_id__in=recipe_ids)
+    return list(links.values_list('recipe_id', flat=True))
+
+
+def adjust_published_counts(recipes, delta):
+    """
+    Adds delta to the counters of the categories and tags of the recipes,
+    for bulk changes of is_published. One grouped query per model, one
+    UPDATE per distinct number of recipes.
+    """
+    by_category = recipes.order_by().values('category_id').annotate(
+        recipes=Count('id'),
+    ).values_list('category_id', 'recipes')
+    by_tag = Recipe.tags.through.objects.filter(recipe__in=recipes).order_by().values(
+        'tag_id',
+    ).annotate(recipes=Count('id')).values_list('tag_id', 'recipes')
+
+    for model, rows in ((Category, by_category), (Tag, by_tag)):
+        pks_by_recipes = defaultdict(list)
+        for pk, recipes_count in rows:
+            pks_by_recipes[recipes_count].append(pk)
+        for recipes_count, pks in pks_by_recipes.items():
+            adjust_counts(model, pks, delta * recipes_count)
+
+
+def find_drift(model, relation):
+    """
+    Returns (pk, stored, actual) for every row whose counter differs from
+    the number of published recipes it really has.
+    """
+    rows = model.objects.annotate(
+        actual=Count(relation, filter=Q(**{f'{relation}__is_published': True}))
+    ).exclude(
+        **{COUNTER_FIELD: F('actual')}
+    ).values_list('pk', COUNTER_FIELD, 'actual').order_by('pk')
+    return list(rows)
+
+
+def reconcile_counts(fix=True, batch_size=1000):
+    """
+    Compares every counter with a COUNT of the published recipes and, when
+    fix is set, writes the actual values. Returns the drift by model.
+    """
+    drift = {}
+
+    for model, relation in COUNTED_MODELS:
+        with transaction.atomic():
+            rows = find_drift(model, relation)
+            drift[model] = rows
+
+            if fix and rows:
+                model.objects.bulk_update(
+                    [model(pk=pk, **{COUNTER_FIELD: actual}) for pk, _, actual in rows],
+                    [COUNTER_FIELD],
+                    batch_size=batch_size,
+                )
+
+    return drift
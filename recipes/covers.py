@@ -0,0 +1,211 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import ExifTags, Image, ImageOps, features
+
+from utils.cache import bump_generation
+
+from .cards import delete_recipe_cards
+from .conditional import recipe_version
+from .page_cache import invalidate_pages
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_DIR = 'derivatives'
+# the card and detail widths follow the css, retina is twice the detail
+DERIVATIVE_WIDTHS = {'card': 640, 'detail': 840, 'retina': 1680}
+SIZES = {
+    'card': '(max-width: 640px) 100vw, 640px',
+    'detail': '(max-width: 840px) 100vw, 840px',
+}
+
+# best format first, jpeg is the <img> fallback every browser reads
+FORMATS = tuple(
+    name for name in ('avif', 'webp') if features.check(name)
+) + ('jpeg',)
+EXTENSIONS = {'avif': 'avif', 'webp': 'webp', 'jpeg': 'jpg'}
+SAVE_OPTIONS = {
+    'avif': {'quality': 55},
+    'webp': {'quality': 75, 'method': 4},
+    'jpeg': {'quality': 80, 'optimize': True, 'progressive': True},
+}
+
+# exif orientations that turn the picture by 90 degrees
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+_executor = None
+
+
+def cover_dimensions(file):
+    """Width and height of an image as displayed, after the exif rotation."""
+    file.open()
+    file.seek(0)
+
+    with Image.open(file) as image:
+        width, height = image.size
+        orientation = image.getexif().get(ExifTags.Base.Orientation)
+
+    file.seek(0)
+    if orientation in TRANSPOSED_ORIENTATIONS:
+        return height, width
+    return width, height
+
+
+def derivative_widths(width):
+    """The derivative widths of a cover width, covers are never upscaled."""
+    widths = sorted(set(DERIVATIVE_WIDTHS.values()))
+    if not width:
+        return []
+    return [value for value in widths if value < width] + (
+        [width] if width < widths[-1] else []
+    )
+
+
+def derivative_name(name, width, image_format):
+    path = PurePosixPath(name)
+    return str(
+        PurePosixPath(DERIVATIVE_DIR, path.parent)
+        / f'{path.stem}-{width}.{EXTENSIONS[image_format]}'
+    )
+
+
+def derivative_names(name, width):
+    return [
+        derivative_name(name, value, image_format)
+        for value in derivative_widths(width)
+        for image_format in FORMATS
+    ]
+
+
+def _encode(image, image_format):
+    if image_format == 'jpeg' or 'A' not in image.getbands():
+        image = image.convert('RGB')
+
+    buffer = BytesIO()
+    image.save(buffer, format=image_format.upper(), **SAVE_OPTIONS[image_format])
+    return buffer.getvalue()
+
+
+def generate_derivatives(name, force=False, storage=None):
+    """
+    Writes the resized copies of a cover next to it under DERIVATIVE_DIR,
+    skipping the ones already on disk. Runs in worker processes, so it
+    only touches the storage, never the database. Returns the names written.
+    """
+    storage = storage or default_storage
+    written = []
+
+    with storage.open(name) as file:
+        image = Image.open(file)
+        # let the jpeg decoder skip detail no derivative needs
+        image.draft('RGB', (max(DERIVATIVE_WIDTHS.values()),) * 2)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    has_alpha = 'A' in image.getbands() or 'transparency' in image.info
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    for width in reversed(derivative_widths(image.width)):
+        height = round(image.height * width / image.width)
+        resized = None
+
+        for image_format in FORMATS:
+            target = derivative_name(name, width, image_format)
+            if storage.exists(target):
+                if not force:
+                    continue
+                storage.delete(target)
+
+            if resized is None:
+                resized = image.resize((width, height), Image.Resampling.LANCZOS)
+                # the next, smaller width is resized from this one
+                image = resized
+
+            written.append(storage.save(target, ContentFile(_encode(resized, image_format))))
+
+    return written
+
+
+def delete_derivatives(name, width, storage=None):
+    storage = storage or default_storage
+    for target in derivative_names(name, width):
+        storage.delete(target)
+
+
+def derivatives_ready(recipe, storage=None):
+    """The smallest jpeg is written last, once it exists every derivative does."""
+    widths = derivative_widths(recipe.cover_width)
+    return bool(widths) and (storage or default_storage).exists(
+        derivative_name(recipe.cover.name, widths[0], 'jpeg')
+    )
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(settings.COVER_DERIVATIVE_WORKERS)
+    return _executor
+
+
+def _derivatives_done(recipe, future):
+    error = future.exception()
+    if error is not None:
+        logger.error('Cover derivatives of %s failed: %s', recipe.cover.name, error)
+        return
+
+    # cards and pages rendered meanwhile point to the original upload
+    delete_recipe_cards(recipe)
+    bump_generation(recipe_version(recipe.pk))
+    if recipe.is_published:
+        invalidate_pages()
+
+
+def schedule_derivatives(recipe):
+    """
+    Generates the cover derivatives in the process pool, or right away when
+    COVER_DERIVATIVE_WORKERS is 0.
+    """
+    if not recipe.cover:
+        return
+
+    if settings.COVER_DERIVATIVE_WORKERS < 1:
+        generate_derivatives(recipe.cover.name)
+        return
+
+    future = get_executor().submit(generate_derivatives, recipe.cover.name)
+    future.add_done_callback(partial(_derivatives_done, recipe))
+
+
+def get_cover_context(recipe, variant='card'):
+    """Sources, srcset and size of the <picture> of a recipe cover."""
+    context = {
+        'src': recipe.cover.url,
+        'width': recipe.cover_width,
+        'height': recipe.cover_height,
+        'sizes': SIZES[variant],
+        'sources': [],
+        'srcset': '',
+    }
+
+    if not derivatives_ready(recipe):
+        return context
+
+    for image_format in FORMATS:
+        srcset = ', '.join(
+            f'{default_storage.url(derivative_name(recipe.cover.name, width, image_format))} {width}w'
+            for width in derivative_widths(recipe.cover_width)
+        )
+        if image_format == 'jpeg':
+            context['srcset'] = srcset
+        else:
+            context['sources'].append({'type': f'image/{image_format}', 'srcset': srcset})
+
+    width = min(DERIVATIVE_WIDTHS[variant], recipe.cover_width)
+    context['src'] = default_storage.url(derivative_name(recipe.cover.name, width, 'jpeg'))
+    return context
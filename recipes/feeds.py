@@ -0,0 +1,113 @@
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.views.decorators.http import require_safe
+
+from tag.models import Tag
+
+from .models import Category, Recipe
+from .sitemaps import (FEEDS_DIR, get_site_root, get_site_url, serve,
+                       write_atomically)
+
+FEED_ITEMS = 50
+
+
+class LatestRecipesFeed(Feed):
+    title = 'Latest recipes'
+    description = 'The newest published recipes.'
+
+    def link(self):
+        return reverse('recipes:home')
+
+    def filter_items(self, queryset, obj):
+        return queryset
+
+    def items(self, obj=None):
+        queryset = Recipe.objects.published().only(
+            'id', 'title', 'slug', 'description', 'created_at', 'updated_at',
+        ).order_by('-id')
+        return self.filter_items(queryset, obj)[:FEED_ITEMS].iterator()
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.description
+
+    def item_pubdate(self, item):
+        return item.created_at
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+
+class CategoryRecipesFeed(LatestRecipesFeed):
+    def get_object(self, request, slug):
+        return get_object_or_404(Category, slug=slug)
+
+    def title(self, obj):
+        return f'{obj.name} - Category Recipes'
+
+    def description(self, obj):
+        return f'The newest published recipes in {obj.name}.'
+
+    def link(self, obj):
+        return reverse('recipes:category', args=(obj.slug,))
+
+    def filter_items(self, queryset, obj):
+        return queryset.filter(category=obj)
+
+
+class TagRecipesFeed(LatestRecipesFeed):
+    def get_object(self, request, slug):
+        return get_object_or_404(Tag, slug=slug)
+
+    def title(self, obj):
+        return f'{obj.name} - Tag'
+
+    def description(self, obj):
+        return f'The newest published recipes tagged {obj.name}.'
+
+    def link(self, obj):
+        return reverse('recipes:tag', args=(obj.slug,))
+
+    def filter_items(self, queryset, obj):
+        return queryset.filter(tags=obj)
+
+
+def atom(feed_class):
+    return type(f'{feed_class.__name__}Atom', (feed_class,), {
+        'feed_type': Atom1Feed,
+        'subtitle': feed_class.description,
+    })
+
+
+def cached_feed(feed_class, name):
+    """
+    Serves the feed from a file on disk, rendering it to the file when it
+    is missing. name is formatted with the url kwargs.
+    """
+    feed = feed_class()
+    extension = 'atom' if feed.feed_type is Atom1Feed else 'rss'
+
+    @require_safe
+    def view(request, **kwargs):
+        site_url = get_site_url(request)
+        path = get_site_root(site_url) / FEEDS_DIR / f'{name.format(**kwargs)}.{extension}'
+
+        def generate():
+            response = feed(request, **kwargs)
+            write_atomically(path, [response.content.decode(response.charset)])
+
+        return serve(path, generate, feed.feed_type.content_type)
+
+    return view
+
+
+latest_feed = cached_feed(LatestRecipesFeed, 'latest')
+latest_atom_feed = cached_feed(atom(LatestRecipesFeed), 'latest')
+category_feed = cached_feed(CategoryRecipesFeed, 'category-{slug}')
+category_atom_feed = cached_feed(atom(CategoryRecipesFeed), 'category-{slug}')
+tag_feed = cached_feed(TagRecipesFeed, 'tag-{slug}')
+tag_atom_feed = cached_feed(atom(TagRecipesFeed), 'tag-{slug}')
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from types import ModuleType
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test import AsyncClient, Client, override_settings
+from django.test.utils import setup_test_environment
+from django.urls import include, path
+
+from project import urls as project_urls
+from recipes import async_views, views
+from recipes.urls import get_urlpatterns
+from utils.benchmark import summarize, temporary_database
+
+from .benchmark_views import NO_CACHE
+from .benchmark_views import Command as BenchmarkViewsCommand
+
+PUBLIC_ROUTES = ('home', 'category', 'tag', 'search', 'detail')
+# handler, recipes views
+MODES = {
+    'wsgi': ('wsgi', views),
+    'asgi-sync': ('asgi', views),
+    'asgi-async': ('asgi', async_views),
+}
+
+
+def make_urlconf(views_module):
+    """The project urls with the recipes routes served by views_module."""
+    urlconf = ModuleType(f'benchmark_urls_{views_module.__name__}')
+    urlconf.urlpatterns = [
+        path('', include((get_urlpatterns(views_module), 'recipes'))),
+        *[
+            pattern for pattern in project_urls.urlpatterns
+            if getattr(pattern, 'app_name', None) != 'recipes'
+        ],
+    ]
+    return urlconf
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds a temporary database and compares the requests per second of '
+        'the public recipe views under the WSGI and the ASGI handlers, with '
+        'the sync and the async views, at a given concurrency.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipes', type=int, default=10_000)
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--routes', nargs='+', choices=PUBLIC_ROUTES)
+        parser.add_argument('--modes', nargs='+', choices=MODES)
+        parser.add_argument('--output', help='Write the results to this JSON file.')
+        parser.add_argument(
+            '--no-cache', action='store_true',
+            help='Measure with a dummy cache backend, i.e. every request cold.',
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+
+        with temporary_database():
+            call_command(
+                'seed_recipes', recipes=options['recipes'], seed=options['seed'],
+                stdout=StringIO(),
+            )
+
+            routes = BenchmarkViewsCommand().get_routes()
+            routes = {
+                name: url for name, (_, url) in routes.items()
+                if name in (options['routes'] or PUBLIC_ROUTES)
+            }
+            caches = NO_CACHE if options['no_cache'] else None
+            results = {}
+
+            for mode in options['modes'] or MODES:
+                handler, views_module = MODES[mode]
+                settings = {'ROOT_URLCONF': make_urlconf(views_module)}
+                if caches:
+                    settings['CACHES'] = caches
+
+                with override_settings(**settings):
+                    for name, url in routes.items():
+                        result = self.run_route(handler, url, options)
+                        results[f'{name}:{mode}'] = result
+                        self.stdout.write(
+                            f'{name:<8} {mode:<10} {result["status"]} '
+                            f'rps={result["rps"]:.0f} '
+                            f'p50={result["p50"]:.2f}ms p95={result["p95"]:.2f}ms'
+                        )
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump({
+                    'meta': {
+                        'recipes': options['recipes'],
+                        'requests': options['requests'],
+                        'concurrency': options['concurrency'],
+                        'cache': not options['no_cache'],
+                        'database': connection.vendor,
+                    },
+                    'routes': results,
+                }, file, indent=2)
+
+    def run_route(self, handler, url, options):
+        concurrency = max(options['concurrency'], 1)
+        per_worker = max(options['requests'] // concurrency, 1)
+
+        if handler == 'wsgi':
+            run = self.run_wsgi
+        else:
+            run = self.run_asgi
+
+        run(url, 1, 2)  # warm up
+        start = time.perf_counter()
+        durations, statuses = run(url, concurrency, per_worker)
+        elapsed = time.perf_counter() - start
+
+        return {
+            'url': url,
+            'status': max(statuses),
+            **summarize(durations),
+            # the workers overlap, so rps is over the wall clock
+            'rps': len(durations) / elapsed if elapsed else 0.0,
+        }
+
+    def run_wsgi(self, url, concurrency, per_worker):
+        def worker():
+            client = Client()
+            durations, statuses = [], []
+
+            try:
+                for _ in range(per_worker):
+                    start = time.perf_counter()
+                    statuses.append(client.get(url).status_code)
+                    durations.append((time.perf_counter() - start) * 1000)
+            finally:
+                connections.close_all()
+
+            return durations, statuses
+
+        with ThreadPoolExecutor(concurrency) as executor:
+            futures = [executor.submit(worker) for _ in range(concurrency)]
+            return self.merge(future.result() for future in futures)
+
+    def run_asgi(self, url, concurrency, per_worker):
+        async def worker():
+            client = AsyncClient()
+            durations, statuses = [], []
+
+            for _ in range(per_worker):
+                start = time.perf_counter()
+                statuses.append((await client.get(url)).status_code)
+                durations.append((time.perf_counter() - start) * 1000)
+
+            return durations, statuses
+
+        async def run():
+            return await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+        return self.merge(asyncio.run(run()))
+
+    def merge(self, results):
+        durations, statuses = [], []
+        for worker_durations, worker_statuses in results:
+            durations += worker_durations
+            statuses += worker_statuses
+        return durations, statuses
@@ -0,0 +1,151 @@
+import json
+import time
+import tracemalloc
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from recipes.cards import render_card
+from recipes.models import Recipe
+from recipes.views import PER_PAGE
+from utils.benchmark import summarize, temporary_database
+
+
+def full_models():
+    # what the lists loaded before the card projection
+    return Recipe.objects.filter(is_published=True).select_related(
+        'author', 'category'
+    ).prefetch_related('tags').order_by('-id')
+
+
+def cards():
+    return Recipe.objects.filter(is_published=True).cards().order_by('-id')
+
+
+QUERYSETS = {'models': full_models, 'cards': cards}
+
+
+def value_size(value):
+    if value is None:
+        return 0
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode())
+    return 8
+
+
+def fetched_bytes(queries):
+    """Runs the captured SELECTs again and adds up the size of every value."""
+    total = 0
+    with connection.cursor() as cursor:
+        for query in queries:
+            cursor.execute(query['sql'])
+            for row in cursor.fetchall():
+                total += sum(value_size(value) for value in row)
+    return total
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds a temporary database and compares the bytes fetched, the '
+        'memory allocated and the time to load and render a page of recipe '
+        'cards from full Recipe models and from the card projection.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipes', type=int, default=10_000)
+        parser.add_argument('--pages', type=int, default=20)
+        parser.add_argument('--per-page', type=int, default=int(PER_PAGE))
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Write the results to this JSON file.')
+
+    def handle(self, *args, **options):
+        with temporary_database():
+            call_command(
+                'seed_recipes', recipes=options['recipes'], seed=options['seed'],
+                stdout=StringIO(),
+            )
+            results = {
+                name: self.run_queryset(queryset, options)
+                for name, queryset in QUERYSETS.items()
+            }
+
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<8} queries={result["queries"]:.1f} '
+                f'bytes={result["bytes"]:.0f} '
+                f'allocated={result["allocated"] / 1024:.1f}KiB '
+                f'peak={result["peak"] / 1024:.1f}KiB '
+                f'p50={result["p50"]:.2f}ms p95={result["p95"]:.2f}ms'
+            )
+
+        before, after = results['models'], results['cards']
+        if before['bytes'] and before['peak']:
+            self.stdout.write(self.style.SUCCESS(
+                f'cards fetch {1 - after["bytes"] / before["bytes"]:.0%} fewer bytes '
+                f'and peak at {1 - after["peak"] / before["peak"]:.0%} less memory '
+                f'per page.'
+            ))
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump({
+                    'meta': {
+                        'recipes': options['recipes'],
+                        'pages': options['pages'],
+                        'per_page': options['per_page'],
+                        'database': connection.vendor,
+                    },
+                    'querysets': results,
+                }, file, indent=2)
+
+    def run_queryset(self, make_queryset, options):
+        per_page = options['per_page']
+        total = make_queryset().count()
+        last_page = max(total // per_page, 1)
+        # spread the pages from the first to the last one
+        step = max(last_page // options['pages'], 1)
+        offsets = [page * step * per_page for page in range(options['pages'])]
+
+        durations, queries, fetched, allocated, peak = [], 0, 0, 0, 0
+
+        for offset in offsets:
+            def load_page():
+                rows = list(make_queryset()[offset:offset + per_page])
+                for row in rows:
+                    render_card(row)
+                return rows
+
+            load_page()  # warm up, templates are compiled once
+            start = time.perf_counter()
+            load_page()
+            durations.append((time.perf_counter() - start) * 1000)
+
+            # tracing slows everything down, it gets a run of its own
+            tracemalloc.start()
+            try:
+                with CaptureQueriesContext(connection) as captured:
+                    rows = load_page()
+                # the rows of the page are still alive here
+                current, traced_peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+            allocated += current
+            peak += traced_peak
+            queries += len(captured)
+            fetched += fetched_bytes(captured)
+            del rows
+
+        pages = len(offsets)
+        return {
+            **summarize(durations),
+            'queries': queries / pages,
+            'bytes': fetched / pages,
+            'allocated': allocated / pages,
+            'peak': peak / pages,
+        }
@@ -0,0 +1,91 @@
+import random
+
+from django.core.management.base import BaseCommand
+
+from recipes import search
+from recipes.models import Recipe
+from utils.benchmark import summarize, temporary_database, time_calls
+
+WORDS = (
+    'bolo cenoura chocolate frango arroz feijao torta limao morango queijo '
+    'pizza massa molho tomate batata carne peixe camarao milho abobora '
+    'pudim brigadeiro farofa mandioca coco banana laranja pao manteiga '
+    'forno panela assado cozido grelhado frito recheado cremoso rapido facil'
+).split()
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares the icontains search with the full-text search index on a '
+        'temporary database seeded with synthetic recipes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', nargs='+', type=int, default=[10_000, 100_000, 1_000_000]
+        )
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--per-page', type=int, default=9)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        rand = random.Random(options['seed'])
+        terms = ['cenoura', 'bolo chocolate', 'frango assado', 'pudim']
+
+        with temporary_database():
+            created = 0
+
+            for size in sorted(options['sizes']):
+                self.seed(rand, created, size, options['batch_size'])
+                created = size
+
+                for label, path in (
+                    ('icontains', search.icontains_filter),
+                    ('fulltext', search.search_queryset),
+                ):
+                    durations = []
+                    for term in terms:
+                        durations += time_calls(
+                            lambda: self.run_search(path, term, options['per_page']),
+                            options['repeat'],
+                        )
+
+                    summary = summarize(durations)
+                    self.stdout.write(
+                        f'{size:>9} recipes  {label:<10} '
+                        f'p50={summary["p50"]:.2f}ms '
+                        f'p95={summary["p95"]:.2f}ms '
+                        f'p99={summary["p99"]:.2f}ms'
+                    )
+
+    def run_search(self, path, term, per_page):
+        queryset = Recipe.objects.filter(is_published=True).order_by('-id')
+        queryset = path(queryset, term)
+        # what the paginated view does: a count plus the first page
+        queryset.count()
+        list(queryset[:per_page])
+
+    def filler(self, rand, k):
+        # a long tail vocabulary, so food words only match part of the table
+        return [f'termo{int(rand.paretovariate(1.2)) % 5000}' for _ in range(k)]
+
+    def seed(self, rand, start, stop, batch_size):
+        for batch_start in range(start, stop, batch_size):
+            recipes = []
+
+            for number in range(batch_start, min(batch_start + batch_size, stop)):
+                title = ' '.join(rand.choices(WORDS, k=2) + self.filler(rand, 3))
+                recipes.append(Recipe(
+                    title=title.capitalize(),
+                    description=' '.join(self.filler(rand, 11) + rand.choices(WORDS)),
+                    slug=f'benchmark-{number}',
+                    preparation_time=rand.randint(5, 120),
+                    preparation_time_unit='Minutes',
+                    servings=rand.randint(1, 12),
+                    servings_unit='Portion',
+                    preparation_steps=' '.join(self.filler(rand, 120)),
+                    is_published=rand.random() < 0.9,
+                ))
+
+            search.index_recipes(Recipe.objects.bulk_create(recipes))
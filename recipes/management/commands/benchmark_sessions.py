@@ -0,0 +1,176 @@
+import json
+import random
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment
+from django.urls import reverse
+
+from recipes.models import Recipe
+from utils.benchmark import temporary_database
+
+# Django's defaults, compared with the project settings
+DEFAULT_STORAGE = {
+    'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+    'MESSAGE_STORAGE': 'django.contrib.messages.storage.fallback.FallbackStorage',
+}
+# visits of the traffic mix and how often they come, in requests
+VISITS = {
+    'anonymous': 80,
+    'returning': 8,
+    'author': 8,
+    'register': 3,
+    'login': 1,
+}
+PASSWORD = 'Str0ng321'
+
+
+class SessionQueries:
+    """Counts the reads and writes of the session table."""
+
+    def __init__(self):
+        self.reads = 0
+        self.writes = 0
+        self.written_bytes = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        if 'django_session' in sql:
+            if sql.lstrip().upper().startswith('SELECT'):
+                self.reads += 1
+            else:
+                self.writes += 1
+                self.written_bytes += max(
+                    (len(param) for param in params or () if isinstance(param, str)),
+                    default=0,
+                )
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds a temporary database, replays a mix of anonymous, register, '
+        'login and author requests and reports the reads and writes of the '
+        'session table per 1000 requests, with Django\'s default session '
+        'and message storage and with the project settings.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipes', type=int, default=500)
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Write the results to this JSON file.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+
+        with temporary_database():
+            call_command(
+                'seed_recipes', recipes=options['recipes'], seed=options['seed'],
+                stdout=StringIO(),
+            )
+            self.urls = self.get_urls()
+            User.objects.create_user('benchmark', password=PASSWORD)
+
+            results = {}
+            for name, overrides in (('default', DEFAULT_STORAGE), ('project', {})):
+                with override_settings(**overrides):
+                    cache.clear()
+                    results[name] = self.replay(options)
+
+                result = results[name]
+                self.stdout.write(
+                    f'{name:<8} {result["engine"].rsplit(".", 1)[-1]:<10} '
+                    f'requests={result["requests"]} '
+                    f'reads/1000={result["reads_per_1000"]:.1f} '
+                    f'writes/1000={result["writes_per_1000"]:.1f} '
+                    f'bytes/write={result["bytes_per_write"]:.0f}'
+                )
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump({
+                    'meta': {
+                        'recipes': options['recipes'],
+                        'database': connection.vendor,
+                    },
+                    'results': results,
+                }, file, indent=2)
+
+    def get_urls(self):
+        recipes = list(Recipe.objects.published().select_related('category')[:20])
+        if not recipes:
+            raise CommandError('The seeded dataset is too small, use more --recipes.')
+
+        urls = [reverse('recipes:home'), f'{reverse("recipes:home")}?page=2']
+        for recipe in recipes:
+            urls.append(reverse('recipes:recipe', args=(recipe.slug,)))
+            urls.append(f'{reverse("recipes:search")}?q={recipe.title.split()[0]}')
+            if recipe.category:
+                urls.append(reverse('recipes:category', args=(recipe.category.slug,)))
+        return urls
+
+    def replay(self, options):
+        rand = random.Random(options['seed'])
+        author = Client()
+        author.login(username='benchmark', password=PASSWORD)
+        returning = Client()
+        # back after a failed registration, which used to start a session
+        returning.post(reverse('authors:register_create'), {'username': 'x'})
+
+        queries = SessionQueries()
+        requests = 0
+
+        with connection.execute_wrapper(queries):
+            while requests < options['requests']:
+                visit = rand.choices(list(VISITS), weights=list(VISITS.values()))[0]
+                requests += getattr(self, f'visit_{visit}')(rand, author, returning)
+
+        return {
+            'engine': settings.SESSION_ENGINE,
+            'messages': settings.MESSAGE_STORAGE,
+            'requests': requests,
+            'reads': queries.reads,
+            'writes': queries.writes,
+            'reads_per_1000': queries.reads / requests * 1000,
+            'writes_per_1000': queries.writes / requests * 1000,
+            'bytes_per_write': queries.written_bytes / queries.writes if queries.writes else 0,
+        }
+
+    def visit_anonymous(self, rand, author, returning):
+        Client().get(rand.choice(self.urls))
+        return 1
+
+    def visit_returning(self, rand, author, returning):
+        returning.get(rand.choice(self.urls))
+        return 1
+
+    def visit_author(self, rand, author, returning):
+        author.get(rand.choice([reverse('authors:dashboard'), *self.urls]))
+        return 1
+
+    def visit_register(self, rand, author, returning):
+        client = Client()
+        client.get(reverse('authors:register'))
+        # passwords that do not match, the form is shown again
+        client.post(reverse('authors:register_create'), {
+            'username': f'visitor{rand.randrange(10 ** 6)}',
+            'first_name': 'First',
+            'last_name': 'Last',
+            'email': 'visitor@example.com',
+            'password': PASSWORD,
+            'password2': f'{PASSWORD}0',
+        }, follow=True)
+        return 3
+
+    def visit_login(self, rand, author, returning):
+        client = Client()
+        client.post(reverse('authors:login_create'), {
+            'username': 'benchmark', 'password': PASSWORD,
+        }, follow=True)
+        return 2
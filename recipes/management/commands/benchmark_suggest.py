@@ -0,0 +1,93 @@
+import json
+import random
+import time
+import tracemalloc
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from recipes.suggest import PrefixIndex, load_suggestions, make_suggestion
+from utils.benchmark import summarize, temporary_database, time_calls
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds a temporary database, builds the search suggestion index and '
+        'reports its memory footprint, the build time and the latency of '
+        'lookups and incremental updates.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipes', type=int, default=10_000)
+        parser.add_argument('--lookups', type=int, default=5000)
+        parser.add_argument('--updates', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Write the results to this JSON file.')
+
+    def handle(self, *args, **options):
+        rand = random.Random(options['seed'])
+
+        with temporary_database():
+            call_command(
+                'seed_recipes', recipes=options['recipes'], seed=options['seed'],
+                stdout=StringIO(),
+            )
+            suggestions = list(load_suggestions())
+
+        # the rows are loaded already, only the index is traced
+        tracemalloc.start()
+        try:
+            start = time.perf_counter()
+            index = PrefixIndex.build(suggestions)
+            build_ms = (time.perf_counter() - start) * 1000
+            footprint, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        words = [word for suggestion in suggestions for word in suggestion.folded.split()]
+        prefixes = [
+            word[:rand.randint(2, max(len(word), 2))]
+            for word in rand.choices(words, k=options['lookups'])
+        ]
+        prefixes = iter(prefixes)
+        lookups = summarize(time_calls(lambda: index.lookup(next(prefixes)), options['lookups']))
+
+        changed = iter(rand.choices(suggestions, k=options['updates']))
+
+        def update():
+            suggestion = next(changed)
+            index.add(make_suggestion(
+                suggestion.kind, suggestion.pk, f'{suggestion.label} novo', suggestion.slug,
+            ))
+            index.add(suggestion)
+
+        updates = summarize(time_calls(update, options['updates']))
+
+        self.stdout.write(
+            f'{len(index)} suggestions, {len(index.keys)} keys, '
+            f'built in {build_ms:.0f}ms, '
+            f'footprint={footprint / 1024 / 1024:.1f}MiB peak={peak / 1024 / 1024:.1f}MiB'
+        )
+        for name, summary in (('lookup', lookups), ('update', updates)):
+            self.stdout.write(
+                f'{name:<7} p50={summary["p50"]:.3f}ms p95={summary["p95"]:.3f}ms '
+                f'p99={summary["p99"]:.3f}ms'
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump({
+                    'meta': {
+                        'recipes': options['recipes'],
+                        'database': connection.vendor,
+                    },
+                    'suggestions': len(index),
+                    'keys': len(index.keys),
+                    'build_ms': build_ms,
+                    'footprint': footprint,
+                    'peak': peak,
+                    'lookup': lookups,
+                    'update': updates,
+                }, file, indent=2)
@@ -0,0 +1,166 @@
+import json
+import os
+import platform
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Q
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from django.urls import reverse
+
+from recipes.models import Category, Recipe
+from tag.models import Tag
+from utils.benchmark import (capture_render_time, find_regressions, summarize,
+                             temporary_database)
+
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds a temporary database and measures latency, SQL and template '
+        'time of every recipes/authors route, optionally failing on '
+        'regressions against a baseline JSON file.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipes', type=int, default=10_000)
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--routes', nargs='+')
+        parser.add_argument('--output', help='Write the results to this JSON file.')
+        parser.add_argument('--baseline', help='JSON file of a previous run.')
+        parser.add_argument('--threshold', type=float, default=0.2)
+        parser.add_argument(
+            '--no-cache', action='store_true',
+            help='Measure with a dummy cache backend, i.e. every request cold.',
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+
+        with temporary_database():
+            call_command(
+                'seed_recipes', recipes=options['recipes'], seed=options['seed'],
+                stdout=StringIO(),
+            )
+
+            routes = self.get_routes()
+            if options['routes']:
+                routes = {name: routes[name] for name in options['routes'] if name in routes}
+
+            if options['no_cache']:
+                with override_settings(CACHES=NO_CACHE):
+                    results = self.run_routes(routes, options)
+            else:
+                results = self.run_routes(routes, options)
+
+        report = {
+            'meta': {
+                'recipes': options['recipes'],
+                'repeat': options['repeat'],
+                'cache': not options['no_cache'],
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'commit': os.environ.get('GIT_COMMIT', ''),
+            },
+            'routes': results,
+        }
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump(report, file, indent=2)
+
+        if options['baseline']:
+            with open(options['baseline']) as file:
+                baseline = json.load(file)['routes']
+
+            regressions = find_regressions(baseline, results, options['threshold'])
+            if regressions:
+                raise CommandError(
+                    'Performance regressions:\n' + '\n'.join(regressions)
+                )
+            self.stdout.write(self.style.SUCCESS('No regressions over the baseline.'))
+
+    def get_routes(self):
+        published = Recipe.objects.filter(is_published=True)
+        recipe = published.order_by('-id').first()
+        category = Category.objects.annotate(
+            total=Count('recipe', filter=Q(recipe__is_published=True))
+        ).order_by('-total').first()
+        tag = Tag.objects.annotate(total=Count('recipe')).order_by('-total').first()
+        draft = Recipe.objects.filter(
+            is_published=False, author__isnull=False
+        ).select_related('author').order_by('-id').first()
+
+        if not (recipe and category and tag and draft):
+            raise CommandError('The seeded dataset is too small, use more --recipes.')
+
+        search_term = recipe.title.split()[0]
+        deep_page = max(published.count() // 9 // 2, 1)
+
+        return {
+            'home': (None, reverse('recipes:home')),
+            'home_deep_page': (None, f'{reverse("recipes:home")}?page={deep_page}'),
+            'category': (None, reverse('recipes:category', args=(category.slug,))),
+            'tag': (None, reverse('recipes:tag', args=(tag.slug,))),
+            'search': (None, f'{reverse("recipes:search")}?q={search_term}'),
+            'detail': (None, reverse('recipes:recipe', args=(recipe.slug,))),
+            'dashboard': (draft.author, reverse('authors:dashboard')),
+            'dashboard_edit': (
+                draft.author,
+                reverse('authors:dashboard_recipe_edit', args=(draft.slug,)),
+            ),
+        }
+
+    def run_routes(self, routes, options):
+        results = {}
+
+        for name, (user, url) in routes.items():
+            client = Client()
+            if user is not None:
+                client.force_login(user)
+
+            for _ in range(options['warmup']):
+                client.get(url)
+
+            durations, queries, sql_ms, render_ms = [], 0, 0.0, 0.0
+            status_code = None
+
+            for _ in range(options['repeat']):
+                with CaptureQueriesContext(connection) as captured, \
+                        capture_render_time() as rendered:
+                    start = time.perf_counter()
+                    response = client.get(url)
+                    durations.append((time.perf_counter() - start) * 1000)
+
+                status_code = response.status_code
+                queries += len(captured)
+                sql_ms += sum(float(query['time']) for query in captured) * 1000
+                render_ms += rendered['ms']
+
+            repeat = options['repeat']
+            results[name] = {
+                'url': url,
+                'status': status_code,
+                **summarize(durations),
+                'queries': queries / repeat,
+                'sql_ms': sql_ms / repeat,
+                'render_ms': render_ms / repeat,
+            }
+            result = results[name]
+            self.stdout.write(
+                f'{name:<16} {status_code} '
+                f'p50={result["p50"]:.2f}ms p95={result["p95"]:.2f}ms '
+                f'p99={result["p99"]:.2f}ms rps={result["rps"]:.0f} '
+                f'queries={result["queries"]:.1f} sql={result["sql_ms"]:.2f}ms '
+                f'render={result["render_ms"]:.2f}ms'
+            )
+
+        return results
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from recipes.related import build_related
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the related recipes of every published recipe.'
+
+    def handle(self, *args, **options):
+        total = build_related()
+        self.stdout.write(self.style.SUCCESS(f'Related recipes built for {total} recipes.'))
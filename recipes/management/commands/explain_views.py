@@ -0,0 +1,91 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+
+from utils.benchmark import temporary_database
+from utils.query_budget import explain, find_seq_scans
+
+from .benchmark_views import NO_CACHE
+from .benchmark_views import Command as BenchmarkViewsCommand
+
+RECIPE_TABLE = 'recipes_recipe'
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds a temporary database, requests every recipes/authors route '
+        'and prints the query plan of each SELECT they run, flagging full '
+        'scans of the recipe table.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipes', type=int, default=10_000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--routes', nargs='+')
+        parser.add_argument(
+            '--fail-on-scan', action='store_true',
+            help='Exit with an error when a query scans the whole recipe table.',
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        scans = []
+
+        with temporary_database():
+            call_command(
+                'seed_recipes', recipes=options['recipes'], seed=options['seed'],
+                stdout=StringIO(),
+            )
+            # planners only pick partial indexes with fresh statistics
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+            routes = BenchmarkViewsCommand().get_routes()
+            if options['routes']:
+                routes = {name: routes[name] for name in options['routes'] if name in routes}
+
+            with override_settings(CACHES=NO_CACHE):
+                for name, (user, url) in routes.items():
+                    scans += self.explain_route(name, user, url)
+
+        if scans and options['fail_on_scan']:
+            raise CommandError(
+                f'Full scans of {RECIPE_TABLE} in: {", ".join(scans)}'
+            )
+
+    def explain_route(self, name, user, url):
+        client = Client()
+        if user is not None:
+            client.force_login(user)
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(url)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'{name} {url} ({response.status_code}, {len(captured)} queries)'
+        ))
+        scans = []
+
+        for number, query in enumerate(captured.captured_queries, start=1):
+            sql = query['sql']
+            if not sql.lstrip().upper().startswith('SELECT'):
+                continue
+
+            plan = explain(connection, sql)
+            scanned = find_seq_scans(plan, (RECIPE_TABLE,), connection.vendor)
+
+            self.stdout.write(f'  {number}. {sql}')
+            for line in plan:
+                self.stdout.write(f'       {line}')
+
+            if scanned:
+                scans.append(f'{name} query {number}')
+                self.stdout.write(self.style.WARNING(
+                    f'       full scan of {RECIPE_TABLE}'
+                ))
+
+        return scans
@@ -0,0 +1,100 @@
+import os
+import time
+from multiprocessing import Pool
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from recipes.covers import generate_derivatives
+from recipes.models import Recipe
+from recipes.page_cache import invalidate_pages
+
+
+def generate_cover(arguments):
+    # module level so worker processes can pickle it
+    name, force = arguments
+    try:
+        return name, len(generate_derivatives(name, force=force)), None
+    except (OSError, ValueError) as error:
+        return name, 0, str(error)
+
+
+class Command(BaseCommand):
+    help = (
+        'Fills in the missing cover dimensions and generates the resized '
+        'cover derivatives of every recipe, skipping the ones on disk.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Generate the derivatives again even when they exist.',
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        recipes = Recipe.objects.exclude(cover='').only(
+            'id', 'cover', 'cover_width', 'cover_height'
+        ).order_by('id')
+
+        names = []
+        batch = []
+        for recipe in recipes.iterator(chunk_size=options['batch_size']):
+            names.append(recipe.cover.name)
+
+            if recipe.cover_width is None:
+                recipe.update_cover_dimensions()
+                batch.append(recipe)
+
+            if len(batch) >= options['batch_size']:
+                self.save_dimensions(batch)
+                batch = []
+
+        self.save_dimensions(batch)
+
+        arguments = [(name, options['force']) for name in names]
+        if options['workers'] > 1 and len(arguments) > 1:
+            with Pool(options['workers']) as pool:
+                results = list(pool.imap_unordered(generate_cover, arguments))
+        else:
+            results = [generate_cover(argument) for argument in arguments]
+
+        written = 0
+        failed = 0
+        changed = []
+        for name, count, error in results:
+            written += count
+            if count:
+                changed.append(name)
+            if error:
+                failed += 1
+                self.stderr.write(f'{name}: {error}')
+
+        self.refresh_cards(changed, options['batch_size'])
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'{written} derivatives of {len(names)} covers written, '
+            f'{failed} covers failed in {elapsed:.1f}s.'
+        ))
+
+    def save_dimensions(self, recipes):
+        if recipes:
+            with transaction.atomic():
+                Recipe.objects.bulk_update(recipes, ['cover_width', 'cover_height'])
+
+    def refresh_cards(self, names, batch_size):
+        """A new updated_at drops the cached cards that show the original cover."""
+        if not names:
+            return
+
+        now = timezone.now()
+        for start in range(0, len(names), batch_size):
+            Recipe.objects.filter(
+                cover__in=names[start:start + batch_size]
+            ).update(updated_at=now)
+
+        invalidate_pages()
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from recipes.sitemaps import generate_sitemaps
+
+
+class Command(BaseCommand):
+    help = (
+        'Writes the sitemap index and the missing sitemap chunks of a site '
+        'to SITEMAP_ROOT, so crawlers never wait for them to be generated.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'site_url', help='Scheme and host the site is served from, e.g. https://example.com',
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Write every chunk again, even the ones on disk.',
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        written = generate_sitemaps(options['site_url'].rstrip('/'), force=options['force'])
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(written)} sitemap files written in {elapsed:.1f}s.'
+        ))
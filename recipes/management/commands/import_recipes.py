@@ -0,0 +1,293 @@
+import csv
+import json
+import time
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+
+from recipes import search, suggest
+from recipes.counters import reconcile_counts
+from recipes.models import Category, Recipe
+from recipes.page_cache import invalidate_pages
+from recipes.related import refresh_related
+from recipes.signals import invalidate_catalog_files
+from tag.models import Tag
+from utils.counting import invalidate_counts
+from utils.slugs import allocate_slugs
+
+RECIPE_FIELDS = (
+    'title',
+    'description',
+    'preparation_time',
+    'preparation_time_unit',
+    'servings',
+    'servings_unit',
+    'preparation_steps',
+)
+TRUE_VALUES = ('1', 'true', 'yes', 'sim')
+# more published recipes than this and build_related_recipes is cheaper
+MAX_REFRESHED_RELATED = 500
+
+
+class RowError(Exception):
+    pass
+
+
+def parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value or '').strip().lower() in TRUE_VALUES
+
+
+def parse_tags(value):
+    if isinstance(value, list):
+        names = value
+    else:
+        names = str(value or '').split('|')
+    return list(dict.fromkeys(name.strip() for name in names if name and name.strip()))
+
+
+class Command(BaseCommand):
+    help = (
+        'Imports recipes from a JSONL or CSV file in batches, creating the '
+        'missing categories, authors and tags. CSV tags are separated by |.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=('jsonl', 'csv'))
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        file_format = options['format'] or path.suffix.lstrip('.').lower()
+
+        if file_format not in ('jsonl', 'csv'):
+            raise CommandError('Use a .jsonl or .csv file or pass --format.')
+
+        self.categories = {}
+        self.authors = {}
+        self.tags = {}
+        self.tag_content_type = ContentType.objects.get_for_model(Recipe)
+        self.imported = 0
+        self.published_ids = []
+        self.failed = 0
+
+        start = time.perf_counter()
+        batch = []
+
+        with path.open(newline='', encoding='utf-8') as file:
+            for line_number, row in self.read_rows(file, file_format):
+                try:
+                    batch.append((line_number, self.make_recipe(row), row))
+                except RowError as error:
+                    self.report_error(line_number, error)
+
+                if len(batch) >= options['batch_size']:
+                    self.import_batch(batch)
+                    batch = []
+                    self.report_progress(start)
+
+        self.import_batch(batch)
+
+        if self.imported:
+            # bulk_create skips the signals that keep the counters
+            reconcile_counts()
+            self.refresh_related()
+            invalidate_counts(Recipe)
+            invalidate_pages()
+            invalidate_catalog_files(whole_sections=('recipes', 'categories', 'tags'))
+            suggest.invalidate()
+
+        elapsed = time.perf_counter() - start
+        rate = self.imported / elapsed if elapsed else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            f'{self.imported} recipes imported, {self.failed} lines failed '
+            f'in {elapsed:.1f}s ({rate:.0f} rows/s).'
+        ))
+
+    def read_rows(self, file, file_format):
+        if file_format == 'csv':
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as error:
+                self.report_error(line_number, f'invalid JSON ({error.msg})')
+                continue
+
+            if not isinstance(row, dict):
+                self.report_error(line_number, 'expected a JSON object')
+                continue
+
+            yield line_number, row
+
+    def make_recipe(self, row):
+        missing = [field for field in RECIPE_FIELDS if row.get(field) in (None, '')]
+        if missing:
+            raise RowError(f'missing {", ".join(missing)}')
+
+        # bulk_create of a name too long fails the whole batch on PostgreSQL
+        for field, model, name_field in (
+            ('category', Category, 'name'), ('author', User, 'username'),
+        ):
+            max_length = model._meta.get_field(name_field).max_length
+            if len(str(row.get(field) or '')) > max_length:
+                raise RowError(f'{field}: at most {max_length} characters')
+
+        max_length = Tag._meta.get_field('name').max_length
+        if any(len(name) > max_length for name in parse_tags(row.get('tags'))):
+            raise RowError(f'tags: at most {max_length} characters each')
+
+        recipe = Recipe(
+            **{field: row[field] for field in RECIPE_FIELDS},
+            preparation_steps_is_html=parse_bool(row.get('preparation_steps_is_html')),
+            is_published=parse_bool(row.get('is_published')),
+        )
+
+        # bulk_create skips save(), which renders them
+        recipe.render_preparation_steps()
+
+        try:
+            recipe.clean_fields(exclude=['slug', 'cover', 'category', 'author'])
+        except ValidationError as error:
+            raise RowError('; '.join(
+                f'{field}: {" ".join(messages)}'
+                for field, messages in error.message_dict.items()
+            ))
+
+        return recipe
+
+    def resolve_categories(self, names):
+        missing = [name for name in names if name not in self.categories]
+        if not missing:
+            return
+
+        for category in Category.objects.filter(name__in=missing):
+            self.categories.setdefault(category.name, category)
+
+        missing = [name for name in missing if name not in self.categories]
+        if missing:
+            slugs = allocate_slugs(Category, missing)
+            created = Category.objects.bulk_create([
+                Category(name=name, slug=slug) for name, slug in zip(missing, slugs)
+            ])
+            self.categories.update((category.name, category) for category in created)
+
+    def resolve_authors(self, usernames):
+        missing = [username for username in usernames if username not in self.authors]
+        if not missing:
+            return
+
+        for author in User.objects.filter(username__in=missing):
+            self.authors[author.username] = author
+
+        missing = [username for username in missing if username not in self.authors]
+        if missing:
+            authors = [User(username=username) for username in missing]
+            for author in authors:
+                author.set_unusable_password()
+            created = User.objects.bulk_create(authors)
+            self.authors.update((author.username, author) for author in created)
+
+    def resolve_tags(self, names):
+        missing = [name for name in names if name not in self.tags]
+        if not missing:
+            return
+
+        for tag in Tag.objects.filter(name__in=missing):
+            self.tags.setdefault(tag.name, tag)
+
+        missing = [name for name in missing if name not in self.tags]
+        if missing:
+            slugs = allocate_slugs(Tag, missing)
+            created = Tag.objects.bulk_create([
+                Tag(
+                    name=name,
+                    slug=slug,
+                    content_type=self.tag_content_type,
+                    object_id=0,
+                )
+                for name, slug in zip(missing, slugs)
+            ])
+            self.tags.update((tag.name, tag) for tag in created)
+
+    def import_batch(self, batch):
+        if not batch:
+            return
+
+        rows = [row for _, _, row in batch]
+        category_names = {row['category'] for row in rows if row.get('category')}
+        usernames = {row['author'] for row in rows if row.get('author')}
+        tag_names = {name for row in rows for name in parse_tags(row.get('tags'))}
+
+        with transaction.atomic():
+            self.resolve_categories(sorted(category_names))
+            self.resolve_authors(sorted(usernames))
+            self.resolve_tags(sorted(tag_names))
+
+        slugs = allocate_slugs(
+            Recipe, [row.get('slug') or row['title'] for row in rows]
+        )
+
+        for (_, recipe, row), slug in zip(batch, slugs):
+            recipe.slug = slug
+            recipe.category = self.categories.get(row.get('category'))
+            recipe.author = self.authors.get(row.get('author'))
+
+        try:
+            with transaction.atomic():
+                self.save_recipes(batch)
+        except IntegrityError:
+            # find the offending lines without losing the rest of the batch
+            for item in batch:
+                try:
+                    with transaction.atomic():
+                        self.save_recipes([item])
+                except IntegrityError as error:
+                    self.report_error(item[0], error)
+
+    def save_recipes(self, batch):
+        recipes = Recipe.objects.bulk_create([recipe for _, recipe, _ in batch])
+        Through = Recipe.tags.through
+
+        Through.objects.bulk_create([
+            Through(recipe_id=recipe.id, tag_id=self.tags[name].id)
+            for recipe, (_, _, row) in zip(recipes, batch)
+            for name in parse_tags(row.get('tags'))
+        ])
+        search.index_recipes(recipes)
+        self.imported += len(recipes)
+        self.published_ids += [recipe.id for recipe in recipes if recipe.is_published]
+
+    def refresh_related(self):
+        # a full build rewrites the related recipes of the whole corpus
+        if len(self.published_ids) > MAX_REFRESHED_RELATED:
+            self.stdout.write(
+                f'{len(self.published_ids)} published recipes imported, run '
+                'build_related_recipes to give them related recipes.'
+            )
+            return
+
+        for recipe_id in self.published_ids:
+            refresh_related(recipe_id)
+
+    def report_error(self, line_number, error):
+        self.failed += 1
+        self.stderr.write(f'line {line_number}: {error}')
+
+    def report_progress(self, start):
+        elapsed = time.perf_counter() - start
+        rate = self.imported / elapsed if elapsed else 0.0
+        self.stdout.write(f'{self.imported} recipes imported ({rate:.0f} rows/s)')
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from recipes.page_cache import get_page_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Shows the hit and miss counters of the anonymous page cache.'
+
+    def handle(self, *args, **options):
+        stats = get_page_cache_stats()
+        self.stdout.write(
+            f'hits={stats["hits"]} misses={stats["misses"]} '
+            f'hit_ratio={stats["hit_ratio"]:.2%}'
+        )
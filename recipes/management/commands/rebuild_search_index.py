@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from recipes import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search index of every recipe.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if not search.is_supported():
+            self.stdout.write('This database has no search index, nothing to do.')
+            return
+
+        total = search.rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{total} recipes indexed.'))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from recipes.counters import reconcile_counts
+
+
+class Command(BaseCommand):
+    help = (
+        'Recounts the published recipes of every category and tag, reports '
+        'the counters that drifted and fixes them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only report the drift, do not write the counters.',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        drift = reconcile_counts(
+            fix=not options['dry_run'], batch_size=options['batch_size']
+        )
+
+        for model, rows in drift.items():
+            name = model._meta.verbose_name
+            for pk, stored, actual in rows:
+                self.stdout.write(f'{name} {pk}: {stored} -> {actual}')
+
+            if rows:
+                self.stdout.write(self.style.WARNING(f'{len(rows)} {name} counters drifted.'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'No {name} counters drifted.'))
+
+        if options['dry_run']:
+            self.stdout.write('Dry run, nothing was written.')
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from recipes.models import Recipe
+
+
+class Command(BaseCommand):
+    help = (
+        'Renders the sanitized preparation steps HTML of the recipes that '
+        'have none yet, in batched updates.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Render every recipe again, e.g. after the sanitizer changed.',
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        recipes = Recipe.objects.only(
+            'id', 'preparation_steps', 'preparation_steps_is_html',
+        ).order_by('id')
+
+        if not options['all']:
+            recipes = recipes.filter(preparation_steps_html='')
+
+        total = 0
+        batch = []
+
+        for recipe in recipes.iterator(chunk_size=options['batch_size']):
+            recipe.render_preparation_steps()
+            batch.append(recipe)
+
+            if len(batch) >= options['batch_size']:
+                total += self.save_batch(batch)
+                batch = []
+
+        total += self.save_batch(batch)
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} recipes rendered in {elapsed:.1f}s.'
+        ))
+
+    def save_batch(self, recipes):
+        if recipes:
+            with transaction.atomic():
+                Recipe.objects.bulk_update(recipes, ['preparation_steps_html'])
+        return len(recipes)
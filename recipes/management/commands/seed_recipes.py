@@ -0,0 +1,224 @@
+import csv
+import io
+import os
+import time
+from multiprocessing import Pool
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from recipes import search, suggest
+from recipes.counters import reconcile_counts
+from recipes.models import Category, Recipe
+from recipes.page_cache import invalidate_pages
+from recipes.related import build_related
+from recipes.signals import invalidate_catalog_files
+from tag.models import Tag
+from utils.counting import invalidate_counts
+from utils.recipes.factory import get_faker, make_recipe_rows
+from utils.slugs import allocate_slugs, make_slug_base
+
+COPY_FIELDS = (
+    'id', 'title', 'description', 'slug', 'preparation_time',
+    'preparation_time_unit', 'servings', 'servings_unit', 'preparation_steps',
+    'preparation_steps_is_html', 'preparation_steps_html', 'created_at', 'updated_at', 'is_published',
+    'cover', 'category_id', 'author_id',
+)
+
+
+def generate_chunk(arguments):
+    # module level so worker processes can pickle it
+    return make_recipe_rows(**arguments)
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds a deterministic synthetic dataset of recipes, categories, tags '
+        'and authors for load testing. Use a fresh database or a new --seed '
+        'to seed again.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipes', type=int, default=10_000)
+        parser.add_argument('--categories', type=int, default=30)
+        parser.add_argument('--tags', type=int, default=300)
+        parser.add_argument('--authors', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--published-ratio', type=float, default=0.8)
+        parser.add_argument('--category-skew', type=float, default=1.1)
+        parser.add_argument('--tag-skew', type=float, default=1.2)
+        parser.add_argument('--tags-per-recipe', type=int, default=3)
+        parser.add_argument(
+            '--no-copy', action='store_true',
+            help='Use bulk_create on PostgreSQL instead of COPY.',
+        )
+
+    def handle(self, *args, **options):
+        if min(options['categories'], options['authors'], options['chunk_size']) < 1:
+            raise CommandError('--categories, --authors and --chunk-size must be positive.')
+
+        self.seed = options['seed']
+        self.use_copy = connection.vendor == 'postgresql' and not options['no_copy']
+        start = time.perf_counter()
+
+        with transaction.atomic():
+            self.categories = self.seed_categories(options['categories'])
+            self.tags = self.seed_tags(options['tags'])
+            self.authors = self.seed_authors(options['authors'])
+
+        chunks = [
+            {
+                'seed': self.seed,
+                'start': chunk_start,
+                'count': min(options['chunk_size'], options['recipes'] - chunk_start),
+                'categories': len(self.categories),
+                'tags': len(self.tags),
+                'authors': len(self.authors),
+                'published_ratio': options['published_ratio'],
+                'category_skew': options['category_skew'],
+                'tag_skew': options['tag_skew'],
+                'tags_per_recipe': options['tags_per_recipe'],
+            }
+            for chunk_start in range(0, options['recipes'], options['chunk_size'])
+        ]
+
+        created = 0
+        if options['workers'] > 1 and len(chunks) > 1:
+            with Pool(options['workers']) as pool:
+                for rows in pool.imap(generate_chunk, chunks):
+                    created += self.write_chunk(rows)
+                    self.report_progress(created, start)
+        else:
+            for chunk in chunks:
+                created += self.write_chunk(generate_chunk(chunk))
+                self.report_progress(created, start)
+
+        # bulk_create skips the signals that keep the counters
+        reconcile_counts()
+        build_related()
+        invalidate_counts(Recipe)
+        invalidate_pages()
+        invalidate_catalog_files(whole_sections=('recipes', 'categories', 'tags'))
+        suggest.invalidate()
+
+        elapsed = time.perf_counter() - start
+        rate = created / elapsed if elapsed else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            f'{created} recipes, {len(self.categories)} categories, '
+            f'{len(self.tags)} tags and {len(self.authors)} authors seeded '
+            f'in {elapsed:.1f}s ({rate:.0f} recipes/s).'
+        ))
+
+    def seed_categories(self, count):
+        fake = get_faker(self.seed)
+        names = [f'{fake.word().capitalize()} {number}' for number in range(count)]
+        slugs = allocate_slugs(Category, names)
+        return Category.objects.bulk_create([
+            Category(name=name, slug=slug) for name, slug in zip(names, slugs)
+        ])
+
+    def seed_tags(self, count):
+        fake = get_faker(self.seed + 1)
+        names = [f'{fake.word()} {number}' for number in range(count)]
+        slugs = allocate_slugs(Tag, names)
+        content_type = ContentType.objects.get_for_model(Recipe)
+        return Tag.objects.bulk_create([
+            Tag(name=name, slug=slug, content_type=content_type, object_id=0)
+            for name, slug in zip(names, slugs)
+        ])
+
+    def seed_authors(self, count):
+        fake = get_faker(self.seed + 2)
+        authors = []
+
+        for number in range(count):
+            author = User(
+                username=f'seed{self.seed}_author{number}',
+                first_name=fake.first_name(),
+                last_name=fake.last_name(),
+            )
+            author.set_unusable_password()
+            authors.append(author)
+
+        return User.objects.bulk_create(authors)
+
+    def make_recipes(self, rows):
+        recipes = []
+
+        for row in rows:
+            base = make_slug_base(row['title'], 30)
+            recipe = Recipe(
+                title=row['title'],
+                description=row['description'],
+                slug=f'{base}-{self.seed}-{row["number"]}',
+                preparation_time=row['preparation_time'],
+                preparation_time_unit=row['preparation_time_unit'],
+                servings=row['servings'],
+                servings_unit=row['servings_unit'],
+                preparation_steps=row['preparation_steps'],
+                is_published=row['is_published'],
+                category=self.categories[row['category']],
+                author=self.authors[row['author']],
+            )
+            recipe.render_preparation_steps()
+            recipes.append(recipe)
+
+        return recipes
+
+    def write_chunk(self, rows):
+        recipes = self.make_recipes(rows)
+        Through = Recipe.tags.through
+
+        with transaction.atomic():
+            if self.use_copy:
+                self.copy_recipes(recipes)
+            else:
+                recipes = Recipe.objects.bulk_create(recipes)
+
+            links = [
+                Through(recipe_id=recipe.id, tag_id=self.tags[tag].id)
+                for recipe, row in zip(recipes, rows)
+                for tag in row['tags']
+            ]
+            Through.objects.bulk_create(links)
+            search.index_recipes(recipes)
+
+        return len(recipes)
+
+    def copy_recipes(self, recipes):
+        """Reserves ids from the sequence and loads the rows with COPY."""
+        table = Recipe._meta.db_table
+        now = timezone.now()
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT nextval(pg_get_serial_sequence(%s, %s)) '
+                'FROM generate_series(1, %s)',
+                [table, 'id', len(recipes)]
+            )
+            for recipe, (recipe_id,) in zip(recipes, cursor.fetchall()):
+                recipe.id = recipe_id
+                recipe.created_at = recipe.updated_at = now
+
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for recipe in recipes:
+                writer.writerow([getattr(recipe, column) for column in COPY_FIELDS])
+            buffer.seek(0)
+
+            # COPY is only on the raw psycopg2 cursor
+            cursor.cursor.copy_expert(
+                f'COPY {table} ({", ".join(COPY_FIELDS)}) '
+                f'FROM STDIN WITH (FORMAT csv)',
+                buffer
+            )
+
+    def report_progress(self, created, start):
+        elapsed = time.perf_counter() - start
+        rate = created / elapsed if elapsed else 0.0
+        self.stdout.write(f'{created} recipes seeded ({rate:.0f} recipes/s)')
@@ -0,0 +1,54 @@
+from django.db import migrations
+
+FTS_TABLE = 'recipes_recipe_fts'
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5('
+            'title, description, preparation_steps, '
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} '
+            '(rowid, title, description, preparation_steps) '
+            'SELECT id, title, description, preparation_steps '
+            'FROM recipes_recipe'
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE TABLE {FTS_TABLE} ('
+            'recipe_id bigint PRIMARY KEY '
+            'REFERENCES recipes_recipe (id) ON DELETE CASCADE, '
+            'document tsvector NOT NULL)'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX {FTS_TABLE}_document_idx '
+            f'ON {FTS_TABLE} USING GIN (document)'
+        )
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (recipe_id, document) '
+            "SELECT id, setweight(to_tsvector('simple', title), 'A') || "
+            "setweight(to_tsvector('simple', description), 'B') || "
+            "setweight(to_tsvector('simple', preparation_steps), 'C') "
+            'FROM recipes_recipe'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0003_recipe_tags'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
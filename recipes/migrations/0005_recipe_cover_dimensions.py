@@ -0,0 +1,23 @@
+# Generated by Django 4.1.3 on 2026-10-18 20:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0004_recipe_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='cover_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='cover_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.1.3 on 2026-10-18 20:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0005_recipe_cover_dimensions'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-id'], name='recipe_published_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['category', '-id'], name='recipe_category_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['author', 'is_published', '-id'], name='recipe_author_published_idx'),
+        ),
+    ]
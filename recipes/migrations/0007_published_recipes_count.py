@@ -0,0 +1,40 @@
+# Generated by Django 4.1.3 on 2026-10-18 20:18
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_published_recipes(apps, schema_editor):
+    Category = apps.get_model('recipes', 'Category')
+    Recipe = apps.get_model('recipes', 'Recipe')
+    Tag = apps.get_model('tag', 'Tag')
+    Through = Recipe.tags.through
+
+    Category.objects.update(published_recipes_count=Coalesce(Subquery(
+        Recipe.objects.filter(
+            category=OuterRef('pk'), is_published=True,
+        ).values('category').annotate(total=Count('id')).values('total')
+    ), Value(0)))
+    Tag.objects.update(published_recipes_count=Coalesce(Subquery(
+        Through.objects.filter(
+            tag=OuterRef('pk'), recipe__is_published=True,
+        ).values('tag').annotate(total=Count('id')).values('total')
+    ), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0006_recipe_list_indexes'),
+        ('tag', '0002_published_recipes_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='published_recipes_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_published_recipes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.3 on 2026-10-18 20:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0007_published_recipes_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='preparation_steps_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+    ]
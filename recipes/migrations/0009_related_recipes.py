@@ -0,0 +1,28 @@
+# Generated by Django 4.1.3 on 2026-10-18 20:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0008_recipe_preparation_steps_html'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedRecipe',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('recipe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_recipes', to='recipes.recipe')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbor_of', to='recipes.recipe')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='relatedrecipe',
+            constraint=models.UniqueConstraint(fields=('recipe', 'rank'), name='related_recipe_rank_unique'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.1.3 on 2026-10-18 21:40
+
+from django.db import migrations
+
+from utils.sanitizer import render_text
+
+BATCH_SIZE = 1000
+
+
+def render_preparation_steps(apps, schema_editor):
+    Recipe = apps.get_model('recipes', 'Recipe')
+    recipes = Recipe.objects.filter(preparation_steps_html='').only(
+        'id', 'preparation_steps', 'preparation_steps_is_html',
+    ).order_by('id')
+
+    batch = []
+    for recipe in recipes.iterator(chunk_size=BATCH_SIZE):
+        recipe.preparation_steps_html = render_text(
+            recipe.preparation_steps, recipe.preparation_steps_is_html,
+        )
+        batch.append(recipe)
+
+        if len(batch) >= BATCH_SIZE:
+            Recipe.objects.bulk_update(batch, ['preparation_steps_html'])
+            batch = []
+
+    Recipe.objects.bulk_update(batch, ['preparation_steps_html'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0009_related_recipes'),
+    ]
+
+    operations = [
+        migrations.RunPython(render_preparation_steps, migrations.RunPython.noop),
+    ]
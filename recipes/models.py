@@ -1,19 +1,59 @@
+from collections import namedtuple
+from functools import partial
+
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
+from django.db.models.query import ValuesIterable
 from django.urls import reverse
-from django.utils.text import slugify
 
 from tag.models import Tag
+from utils.sanitizer import render_text
+from utils.slugs import allocate_slug, save_with_unique_slug
+
+from .covers import cover_dimensions
+from .search import search_queryset
+
+PREPARATION_STEPS_FIELDS = ('preparation_steps', 'preparation_steps_is_html')
 
 
 class Category(models.Model):
     name = models.CharField(max_length=65)
     slug = models.SlugField(unique=True)
+    # kept up to date by recipes.counters
+    published_recipes_count = models.IntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.name
 
 
+class RecipeQuerySet(models.QuerySet):
+    # the filters of the public lists, shared by the pages and the API
+    def published(self):
+        return self.filter(is_published=True)
+
+    def in_category(self, slug):
+        return self.filter(category__slug=slug)
+
+    def with_tag(self, slug):
+        return self.filter(tags__slug=slug)
+
+    def search(self, search_term):
+        return search_queryset(self, search_term)
+
+    def related_to(self, recipe):
+        # one indexed read of the precomputed neighbors, recipes.related
+        return self.filter(neighbor_of__recipe=recipe).order_by('neighbor_of__rank')
+
+    def cards(self):
+        """
+        Only the columns a list card shows, joined in one query and yielded
+        as RecipeCard instead of Recipe.
+        """
+        queryset = self.values(*RECIPE_CARD_FIELDS)
+        queryset._iterable_class = RecipeCardIterable
+        return queryset
+
+
 class Recipe(models.Model):
     title = models.CharField(max_length=65)
     description = models.CharField(max_length=165)
@@ -24,32 +64,227 @@ class Recipe(models.Model):
     servings_unit = models.CharField(max_length=65)
     preparation_steps = models.TextField()
     preparation_steps_is_html = models.BooleanField(default=False)
+    # rendered and sanitized on save, the detail page serves it as is
+    preparation_steps_html = models.TextField(blank=True, default='', editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_published = models.BooleanField(default=False)
     cover = models.ImageField(upload_to='recipes/covers/%Y/%m/%d/', blank=True, default='')
+    cover_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    cover_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, default=None)
     author = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, default=None)
     tags = models.ManyToManyField(Tag)
 
+    objects = RecipeQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # public lists: published, newest first
+            models.Index(
+                fields=['-id'],
+                condition=models.Q(is_published=True),
+                name='recipe_published_id_idx',
+            ),
+            models.Index(
+                fields=['category', '-id'],
+                condition=models.Q(is_published=True),
+                name='recipe_category_published_idx',
+            ),
+            # dashboard: the drafts of an author
+            models.Index(
+                fields=['author', 'is_published', '-id'],
+                name='recipe_author_published_idx',
+            ),
+        ]
+
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def get_loaded_value(self, attname, default=None):
+        """The value the field had in the database when it was last loaded or saved."""
+        return getattr(self, '_loaded_values', {}).get(attname, default)
+
     def get_absolute_url(self):
         return reverse('recipes:recipe', kwargs={'recipe_slug': self.slug})
 
-    def get_slug(self):
-        slug = slugify(self.title)
-        unique_slug = slug
+    def get_loaded_cover_name(self):
+        # from_db loads the name, save() keeps the FieldFile
+        return str(self.get_loaded_value('cover') or '')
+
+    def cover_changed(self):
+        return self.cover.name != self.get_loaded_cover_name()
+
+    def update_cover_dimensions(self):
+        self.cover_width = self.cover_height = None
 
-        number = 1
-        while Recipe.objects.filter(slug=unique_slug).exists():
-            unique_slug = f'{slug}-{number}'
-            number += 1
+        if self.cover:
+            try:
+                self.cover_width, self.cover_height = cover_dimensions(self.cover)
+            except (OSError, ValueError):
+                pass
 
-        return unique_slug
+    def preparation_steps_changed(self):
+        return not self.preparation_steps_html or any(
+            getattr(self, field) != self.get_loaded_value(field)
+            for field in PREPARATION_STEPS_FIELDS
+        )
+
+    def render_preparation_steps(self):
+        self.preparation_steps_html = render_text(
+            self.preparation_steps, self.preparation_steps_is_html
+        )
+
+    def get_slug(self):
+        return allocate_slug(Recipe, self.title)
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = self.get_slug()
-        return super().save(*args, **kwargs)
+        deferred_fields = self.get_deferred_fields()
+
+        if 'cover' not in deferred_fields and self.cover_changed():
+            self.update_cover_dimensions()
+
+        if not set(PREPARATION_STEPS_FIELDS) & deferred_fields and self.preparation_steps_changed():
+            self.render_preparation_steps()
+
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and set(PREPARATION_STEPS_FIELDS) & set(update_fields):
+                kwargs['update_fields'] = {*update_fields, 'preparation_steps_html'}
+
+        # the post_save receivers update counters, keep them in the same transaction
+        with transaction.atomic():
+            if self.slug:
+                saved = super().save(*args, **kwargs)
+            else:
+                saved = save_with_unique_slug(
+                    self, partial(super().save, *args, **kwargs), self.title
+                )
+
+        deferred_fields = self.get_deferred_fields()
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname not in deferred_fields
+        }
+        return saved
+
+
+class RelatedRecipe(models.Model):
+    """
+    The top neighbors of a recipe by shared tags, category and title words,
+    written by recipes.related, best first by rank.
+    """
+    recipe = models.ForeignKey(
+        Recipe, on_delete=models.CASCADE, related_name='related_recipes',
+    )
+    related = models.ForeignKey(
+        Recipe, on_delete=models.CASCADE, related_name='neighbor_of',
+    )
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['recipe', 'rank'], name='related_recipe_rank_unique',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipe_id} -> {self.related_id}'
+
+
+CardAuthor = namedtuple('CardAuthor', 'username first_name last_name')
+CardCategory = namedtuple('CardCategory', 'name slug')
+
+RECIPE_CARD_FIELDS = (
+    'id', 'title', 'slug', 'description',
+    'preparation_time', 'preparation_time_unit', 'servings', 'servings_unit',
+    'created_at', 'updated_at', 'cover', 'cover_width', 'cover_height',
+    'author_id', 'category_id', 'author__username', 'author__first_name', 'author__last_name',
+    'category__name', 'category__slug',
+)
+
+
+class RecipeCard:
+    """
+    Read model of a recipe in the lists: the fields of the card template
+    and nothing else, no preparation steps, tags or full author row.
+    """
+
+    __slots__ = (
+        'id', 'title', 'slug', 'description',
+        'preparation_time', 'preparation_time_unit', 'servings', 'servings_unit',
+        'created_at', 'updated_at', 'cover_name', 'cover_width', 'cover_height',
+        'author_id', 'category_id', 'author', 'category',
+    )
+
+    def __init__(self, row):
+        self.id = row['id']
+        self.title = row['title']
+        self.slug = row['slug']
+        self.description = row['description']
+        self.preparation_time = row['preparation_time']
+        self.preparation_time_unit = row['preparation_time_unit']
+        self.servings = row['servings']
+        self.servings_unit = row['servings_unit']
+        self.created_at = row['created_at']
+        self.updated_at = row['updated_at']
+        self.cover_name = row['cover']
+        self.cover_width = row['cover_width']
+        self.cover_height = row['cover_height']
+        # the card cache key carries their versions
+        self.author_id = row['author_id']
+        self.category_id = row['category_id']
+
+        # the joins are outer, a missing author or category is all NULL
+        self.author = None
+        if row['author__username'] is not None:
+            self.author = CardAuthor(
+                row['author__username'], row['author__first_name'],
+                row['author__last_name'],
+            )
+
+        self.category = None
+        if row['category__slug'] is not None:
+            self.category = CardCategory(row['category__name'], row['category__slug'])
+
+    def __str__(self):
+        return self.title
+
+    def __repr__(self):
+        return f'<RecipeCard: {self.id}>'
+
+    def __eq__(self, other):
+        # the card of a recipe stands for the same row as the recipe
+        if isinstance(other, (RecipeCard, Recipe)):
+            return self.id == other.pk
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.id)
+
+    @property
+    def pk(self):
+        return self.id
+
+    @property
+    def cover(self):
+        # built on demand, cached cards never touch it
+        field = Recipe._meta.get_field('cover')
+        return field.attr_class(None, field, self.cover_name)
+
+    def get_absolute_url(self):
+        return reverse('recipes:recipe', kwargs={'recipe_slug': self.slug})
+
+
+class RecipeCardIterable(ValuesIterable):
+    def __iter__(self):
+        for row in super().__iter__():
+            yield RecipeCard(row)
@@ -0,0 +1,124 @@
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+
+from utils.cache import bump_generation, get_generation
+
+PAGE_CACHE_GENERATION = 'recipe-pages'
+PAGE_CACHE_HEADER = 'X-Page-Cache'
+STATS_KEYS = {
+    'hits': 'page-cache:hits',
+    'misses': 'page-cache:misses',
+}
+
+
+def page_cache_key(request):
+    generation = get_generation(PAGE_CACHE_GENERATION)
+    digest = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f'page-cache:{generation}:{digest}'
+
+
+def invalidate_pages():
+    bump_generation(PAGE_CACHE_GENERATION)
+
+
+def is_cacheable_request(request):
+    # len() does not consume the messages, iterating them would
+    return (
+        request.method == 'GET' and
+        not request.user.is_authenticated and
+        not len(messages.get_messages(request))
+    )
+
+
+def record(stat):
+    key = STATS_KEYS[stat]
+    cache.add(key, 0, timeout=None)
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def get_page_cache_stats():
+    stats = cache.get_many(STATS_KEYS.values())
+    hits = stats.get(STATS_KEYS['hits'], 0)
+    misses = stats.get(STATS_KEYS['misses'], 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / total if total else 0.0,
+    }
+
+
+def get_cached_page(request):
+    """Returns the cache key of the request and its cached response, if any."""
+    key = page_cache_key(request)
+    response = cache.get(key)
+
+    if response is not None:
+        record('hits')
+        response[PAGE_CACHE_HEADER] = 'HIT'
+    else:
+        record('misses')
+
+    return key, response
+
+
+def cache_page(key, response, timeout=None):
+    if response.status_code != 200 or response.streaming:
+        return response
+
+    timeout = timeout or settings.PAGE_CACHE_TIMEOUT
+    response[PAGE_CACHE_HEADER] = 'MISS'
+
+    def store(rendered_response):
+        cache.set(key, rendered_response, timeout)
+
+    if hasattr(response, 'render') and not response.is_rendered:
+        response.add_post_render_callback(store)
+    else:
+        store(response)
+
+    return response
+
+
+class AnonymousPageCacheMixin:
+    """
+    Serves the whole response from the cache to anonymous visitors. Keys
+    carry the page generation, which every content change moves forward.
+    """
+    page_cache_timeout = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if not is_cacheable_request(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        key, response = get_cached_page(request)
+        if response is not None:
+            return response
+
+        response = super().dispatch(request, *args, **kwargs)
+        return cache_page(key, response, self.page_cache_timeout)
+
+
+class AsyncAnonymousPageCacheMixin:
+    """AnonymousPageCacheMixin for views with async handlers."""
+    page_cache_timeout = None
+
+    async def dispatch(self, request, *args, **kwargs):
+        # the session and cache backends are sync
+        if not await sync_to_async(is_cacheable_request)(request):
+            return await super().dispatch(request, *args, **kwargs)
+
+        key, response = await sync_to_async(get_cached_page)(request)
+        if response is not None:
+            return response
+
+        response = await super().dispatch(request, *args, **kwargs)
+        return await sync_to_async(cache_page)(key, response, self.page_cache_timeout)
@@ -0,0 +1,281 @@
+import heapq
+import itertools
+import math
+from collections import defaultdict
+
+from django.db import transaction
+
+from tag.models import Tag
+from utils.cache import bump_generation
+
+from .models import Recipe, RelatedRecipe
+from .search import get_tokens, search_queryset
+
+# Every published recipe is a sparse vector of weighted features, its tags
+# (rarer tags weigh more), its category and the words of its title, scaled
+# to length 1 so the dot product of two recipes is their cosine. The
+# neighbors of a recipe are the candidates with the highest cosine, the
+# candidates being the newest CANDIDATES recipes of each of its features.
+
+RELATED_RECIPES = 4
+CANDIDATES = 200
+RESCORED = RELATED_RECIPES * 5
+TAG_WEIGHT = 1.0
+CATEGORY_WEIGHT = 0.5
+WORD_WEIGHT = 0.5
+MIN_WORD_LENGTH = 3
+BATCH_SIZE = 2000
+# bumped by a full build, the detail pages validate against it
+RELATED_GENERATION = 'related-recipes'
+
+
+def related_version(recipe_id):
+    """The related block of one recipe, bumped by refresh_related."""
+    return f'related:{recipe_id}'
+
+
+def title_words(title):
+    return {token for token in get_tokens(title) if len(token) >= MIN_WORD_LENGTH}
+
+
+def tag_weight(recipes_with_tag, total):
+    return TAG_WEIGHT * math.log(1 + total / (1 + recipes_with_tag))
+
+
+def make_vector(category_id, tag_ids, title, tag_counts, total):
+    vector = {('word', word): WORD_WEIGHT for word in title_words(title)}
+    for tag_id in tag_ids:
+        vector[('tag', tag_id)] = tag_weight(tag_counts.get(tag_id, 0), total)
+    if category_id is not None:
+        vector[('category', category_id)] = CATEGORY_WEIGHT
+
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    if not norm:
+        return {}
+    return {feature: weight / norm for feature, weight in vector.items()}
+
+
+def similarity(vector, other):
+    if len(other) < len(vector):
+        vector, other = other, vector
+    return sum(weight * other.get(feature, 0.0) for feature, weight in vector.items())
+
+
+def top_neighbors(scores):
+    """The best (related_id, score) pairs, the newer recipe first on ties."""
+    return heapq.nlargest(
+        RELATED_RECIPES,
+        ((related_id, score) for related_id, score in scores if score > 0),
+        key=lambda item: (item[1], item[0]),
+    )
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def recipe_batches(recipe_ids=None):
+    """(id, category_id, title) of the published recipes, newest first, in batches."""
+    recipes = Recipe.objects.published().order_by('-id').values_list(
+        'id', 'category_id', 'title',
+    )
+    if recipe_ids is not None:
+        # a bounded IN list per query
+        for ids in batched(sorted(recipe_ids, reverse=True), BATCH_SIZE):
+            yield list(recipes.filter(pk__in=ids))
+        return
+
+    last_id = None
+    while True:
+        batch = recipes if last_id is None else recipes.filter(id__lt=last_id)
+        batch = list(batch[:BATCH_SIZE])
+        if not batch:
+            return
+        last_id = batch[-1][0]
+        yield batch
+
+
+def iter_vectors(recipe_ids=None):
+    """
+    Yields (recipe_id, vector) of the published recipes, only of recipe_ids
+    when given, newest first, reading BATCH_SIZE recipes and their tags at
+    a time.
+    """
+    total = Recipe.objects.published().count()
+
+    for batch in recipe_batches(recipe_ids):
+        tags_by_recipe = defaultdict(list)
+        for recipe_id, tag_id in Recipe.tags.through.objects.filter(
+            recipe_id__in=[recipe_id for recipe_id, _, _ in batch],
+        ).values_list('recipe_id', 'tag_id'):
+            tags_by_recipe[recipe_id].append(tag_id)
+
+        # the counters, not a COUNT per tag
+        tag_counts = dict(Tag.objects.filter(
+            pk__in={tag_id for tag_ids in tags_by_recipe.values() for tag_id in tag_ids},
+        ).values_list('pk', 'published_recipes_count'))
+
+        for recipe_id, category_id, title in batch:
+            yield recipe_id, make_vector(
+                category_id, tags_by_recipe[recipe_id], title, tag_counts, total,
+            )
+
+
+def load_vectors(recipe_ids):
+    return dict(iter_vectors(recipe_ids))
+
+
+def make_rows(recipe_id, neighbors):
+    return [
+        RelatedRecipe(recipe_id=recipe_id, related_id=related_id, score=score, rank=rank)
+        for rank, (related_id, score) in enumerate(neighbors)
+    ]
+
+
+def build_related():
+    """
+    Rewrites the neighbors of every published recipe, from an inverted
+    index of the features. Returns the number of recipes with neighbors.
+
+    The recipes are read twice, in batches. The first pass keeps only the
+    postings, at most CANDIDATES recipes a feature, the second scores
+    BATCH_SIZE recipes at a time against them and loads the vectors of
+    their shortlists to score these again. The vectors are never all in
+    memory, the postings are, which on a corpus of rare title words comes
+    near one (recipe_id, weight) pair per feature of every recipe.
+    """
+    postings = defaultdict(list)
+    for recipe_id, vector in iter_vectors():
+        for feature, weight in vector.items():
+            if len(postings[feature]) < CANDIDATES:
+                postings[feature].append((recipe_id, weight))
+
+    built = 0
+    with transaction.atomic():
+        RelatedRecipe.objects.all().delete()
+
+        for batch in batched(iter_vectors(), BATCH_SIZE):
+            shortlists = {}
+            for recipe_id, vector in batch:
+                scores = defaultdict(float)
+                for feature, weight in vector.items():
+                    for candidate, candidate_weight in postings[feature]:
+                        scores[candidate] += weight * candidate_weight
+                scores.pop(recipe_id, None)
+
+                # the postings are cut, so these scores can miss a feature,
+                # the best of them are scored again in full
+                shortlists[recipe_id] = heapq.nlargest(
+                    RESCORED, scores, key=scores.__getitem__,
+                )
+
+            vectors = load_vectors({
+                candidate for shortlist in shortlists.values() for candidate in shortlist
+            })
+            rows = []
+            for recipe_id, vector in batch:
+                neighbors = top_neighbors(
+                    (candidate, similarity(vector, vectors[candidate]))
+                    # published or unpublished since the first pass
+                    for candidate in shortlists[recipe_id] if candidate in vectors
+                )
+                built += bool(neighbors)
+                rows += make_rows(recipe_id, neighbors)
+
+            RelatedRecipe.objects.bulk_create(rows)
+
+    bump_generation(RELATED_GENERATION)
+    return built
+
+
+def candidate_ids(recipe_id, category_id, tag_ids, title):
+    """The recipes sharing a tag, the category or a title word with the recipe."""
+    published = Recipe.objects.published().exclude(pk=recipe_id)
+    ids = set()
+
+    if tag_ids:
+        ids.update(
+            Recipe.tags.through.objects.filter(
+                tag_id__in=tag_ids, recipe__is_published=True,
+            ).exclude(recipe_id=recipe_id).order_by('-recipe_id').values_list(
+                'recipe_id', flat=True,
+            )[:CANDIDATES * len(tag_ids)]
+        )
+
+    if category_id is not None:
+        ids.update(
+            published.filter(category_id=category_id).order_by('-id').values_list(
+                'id', flat=True,
+            )[:CANDIDATES]
+        )
+
+    words = title_words(title)
+    if words:
+        ids.update(
+            search_queryset(published, ' '.join(sorted(words)), match_any=True).values_list(
+                'id', flat=True,
+            )[:CANDIDATES]
+        )
+
+    return ids
+
+
+def refresh_related(recipe_id):
+    """
+    Rewrites the neighbors of the recipe, and adds it to or removes it from
+    the neighbors of the recipes around it, after a change of the recipe or
+    its tags. A recipe that loses a neighbor here is not given another one,
+    the next build_related fills it again. Returns the recipes rewritten.
+    """
+    recipe = Recipe.objects.published().filter(pk=recipe_id).values_list(
+        'category_id', 'title',
+    ).first()
+    had = set(
+        RelatedRecipe.objects.filter(related_id=recipe_id).values_list('recipe_id', flat=True)
+    )
+
+    scores = {}
+    if recipe is not None:
+        category_id, title = recipe
+        tag_ids = Recipe.tags.through.objects.filter(recipe_id=recipe_id).values_list(
+            'tag_id', flat=True,
+        )
+        candidates = candidate_ids(recipe_id, category_id, list(tag_ids), title)
+        vectors = load_vectors(candidates | {recipe_id})
+        vector = vectors.get(recipe_id, {})
+        scores = {
+            candidate: similarity(vector, vectors[candidate])
+            for candidate in candidates if candidate in vectors
+        }
+
+    affected = had | {candidate for candidate, score in scores.items() if score > 0}
+
+    current = defaultdict(list)
+    for owner_id, related_id, score in RelatedRecipe.objects.filter(
+        recipe_id__in=affected | {recipe_id},
+    ).order_by('recipe_id', 'rank').values_list('recipe_id', 'related_id', 'score'):
+        current[owner_id].append((related_id, score))
+
+    neighbors = {recipe_id: top_neighbors(scores.items())}
+    for owner_id in affected:
+        entries = [entry for entry in current[owner_id] if entry[0] != recipe_id]
+        entries.append((recipe_id, scores.get(owner_id, 0.0)))
+        neighbors[owner_id] = top_neighbors(entries)
+
+    changed = [
+        owner_id for owner_id, entries in neighbors.items() if entries != current[owner_id]
+    ]
+
+    with transaction.atomic():
+        RelatedRecipe.objects.filter(recipe_id__in=changed).delete()
+        RelatedRecipe.objects.bulk_create([
+            row for owner_id in changed for row in make_rows(owner_id, neighbors[owner_id])
+        ])
+
+    # the detail pages that show the recipe or a new neighbor changed
+    for owner_id in had | set(changed):
+        bump_generation(related_version(owner_id))
+
+    return changed
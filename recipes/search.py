@@ -0,0 +1,173 @@
+import operator
+import re
+from functools import reduce
+
+from django.db import connection
+from django.db.models import Q
+
+FTS_TABLE = 'recipes_recipe_fts'
+POSTGRES_CONFIG = 'simple'
+SEARCH_FIELDS = ('title', 'description', 'preparation_steps')
+
+# Relevance weights, same order as SEARCH_FIELDS.
+SQLITE_WEIGHTS = (10.0, 4.0, 1.0)
+POSTGRES_WEIGHTS = ('A', 'B', 'C')
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def is_supported():
+    return connection.vendor in ('sqlite', 'postgresql')
+
+
+def get_tokens(search_term):
+    return TOKEN_RE.findall(search_term.lower())
+
+
+def make_match_query(tokens, match_any=False):
+    # Every token is used as a prefix so "cenou" still finds "cenoura".
+    if connection.vendor == 'postgresql':
+        return (' | ' if match_any else ' & ').join(f'{token}:*' for token in tokens)
+    return (' OR ' if match_any else ' ').join(f'"{token}"*' for token in tokens)
+
+
+def icontains_filter(queryset, search_term):
+    return queryset.filter(
+        Q(
+            Q(title__icontains=search_term) |
+            Q(description__icontains=search_term),
+        ),
+    )
+
+
+def search_queryset(queryset, search_term, match_any=False):
+    """
+    Filters the queryset by the search term and orders it by relevance,
+    falling back to icontains on databases without a search index. With
+    match_any a recipe needs one of the words instead of all of them.
+    """
+    tokens = get_tokens(search_term)
+
+    if not tokens or not is_supported():
+        if match_any and tokens:
+            return queryset.filter(reduce(operator.or_, (
+                Q(title__icontains=token) | Q(description__icontains=token)
+                for token in tokens
+            )))
+        return icontains_filter(queryset, search_term)
+
+    match = make_match_query(tokens, match_any)
+    recipe_table = queryset.model._meta.db_table
+
+    if connection.vendor == 'postgresql':
+        rank_sql = f'ts_rank_cd({FTS_TABLE}.document, to_tsquery(%s, %s))'
+        where = [
+            f'{FTS_TABLE}.recipe_id = {recipe_table}.id',
+            f'{FTS_TABLE}.document @@ to_tsquery(%s, %s)',
+        ]
+        params = [POSTGRES_CONFIG, match]
+    else:
+        weights = ', '.join(str(weight) for weight in SQLITE_WEIGHTS)
+        # bm25() is lower for better matches, negate it to sort descending
+        rank_sql = f'-bm25({FTS_TABLE}, {weights})'
+        where = [
+            f'{FTS_TABLE}.rowid = {recipe_table}.id',
+            f'{FTS_TABLE} MATCH %s',
+        ]
+        params = [match]
+
+    # A join keeps the ranking to a single pass over the index matches.
+    queryset = queryset.extra(
+        select={'search_rank': rank_sql},
+        select_params=params,
+        tables=[FTS_TABLE],
+        where=where,
+        params=params,
+    )
+    return queryset.order_by('-search_rank', '-id')
+
+
+def _document_values(recipe):
+    return [getattr(recipe, field) or '' for field in SEARCH_FIELDS]
+
+
+def index_recipes(recipes):
+    """Adds or refreshes the search documents of the given recipes."""
+    recipes = [recipe for recipe in recipes if recipe.pk is not None]
+
+    if not recipes or not is_supported():
+        return
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            document_sql = ' || '.join(
+                f"setweight(to_tsvector(%s, %s), '{weight}')"
+                for weight in POSTGRES_WEIGHTS
+            )
+            rows = []
+            for recipe in recipes:
+                row = [recipe.pk]
+                for value in _document_values(recipe):
+                    row += [POSTGRES_CONFIG, value]
+                rows.append(row)
+
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (recipe_id, document) '
+                f'VALUES (%s, {document_sql}) '
+                f'ON CONFLICT (recipe_id) '
+                f'DO UPDATE SET document = EXCLUDED.document',
+                rows
+            )
+            return
+
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [[recipe.pk] for recipe in recipes]
+        )
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, {", ".join(SEARCH_FIELDS)}) '
+            f'VALUES (%s, %s, %s, %s)',
+            [[recipe.pk, *_document_values(recipe)] for recipe in recipes]
+        )
+
+
+def index_recipe(recipe):
+    index_recipes([recipe])
+
+
+def unindex_recipe(recipe_id):
+    if not is_supported():
+        return
+
+    key = 'recipe_id' if connection.vendor == 'postgresql' else 'rowid'
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE {key} = %s', [recipe_id]
+        )
+
+
+def rebuild_index(batch_size=2000):
+    """Recreates every search document, returns the number indexed."""
+    from .models import Recipe
+
+    if not is_supported():
+        return 0
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+
+    total = 0
+    batch = []
+    recipes = Recipe.objects.only('id', *SEARCH_FIELDS).order_by('id')
+
+    for recipe in recipes.iterator(chunk_size=batch_size):
+        batch.append(recipe)
+
+        if len(batch) >= batch_size:
+            index_recipes(batch)
+            total += len(batch)
+            batch = []
+
+    index_recipes(batch)
+    return total + len(batch)
@@ -0,0 +1,324 @@
+from functools import partial
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from tag.models import Tag
+from utils.cache import bump_generations_on_commit
+from utils.counting import invalidate_counts
+
+from . import counters, related, search, sitemaps, suggest
+from .cards import author_version, category_version, delete_recipe_cards
+from .conditional import RECIPE_TAGS_GENERATION, recipe_version
+from .covers import delete_derivatives, schedule_derivatives
+from .models import Category, Recipe, RelatedRecipe
+from .page_cache import invalidate_pages
+
+
+@receiver(post_save, sender=Recipe)
+def recipe_saved_update_search_index(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not set(update_fields) & set(search.SEARCH_FIELDS):
+        return
+    search.index_recipe(instance)
+
+
+@receiver(post_delete, sender=Recipe)
+def recipe_deleted_update_search_index(sender, instance, **kwargs):
+    search.unindex_recipe(instance.pk)
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def recipes_changed_invalidate_counts(sender, **kwargs):
+    invalidate_counts(Recipe)
+
+
+# Cards and detail pages carry the version of the category and author they
+# show, a change bumps it instead of touching the rows of their recipes.
+CARD_AUTHOR_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def category_changed_invalidate_cards(sender, instance, **kwargs):
+    bump_generations_on_commit(category_version(instance.pk))
+
+
+@receiver(post_save, sender=User)
+@receiver(pre_delete, sender=User)
+def author_changed_invalidate_cards(sender, instance, update_fields=None, **kwargs):
+    # logins save last_login only, that is not on the cards
+    if update_fields and not set(update_fields) & CARD_AUTHOR_FIELDS:
+        return
+    bump_generations_on_commit(author_version(instance.pk))
+    invalidate_pages()
+
+
+# The detail page shows the tags, its validator carries their versions.
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def tag_changed_refresh_recipes(sender, instance, created=False, **kwargs):
+    if not created:
+        bump_generations_on_commit(RECIPE_TAGS_GENERATION)
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def recipe_tags_changed_refresh_recipes(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        bump_generations_on_commit(recipe_version(instance.pk))
+    elif action == 'post_clear':
+        # the recipes of a cleared tag are not in pk_set
+        bump_generations_on_commit(RECIPE_TAGS_GENERATION)
+    else:
+        bump_generations_on_commit(*map(recipe_version, pk_set))
+
+
+@receiver(post_delete, sender=Recipe)
+def recipe_deleted_invalidate_card(sender, instance, **kwargs):
+    delete_recipe_cards(instance)
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+def recipe_changed_invalidate_pages(sender, instance, created=False, **kwargs):
+    # editing a draft that stays unpublished does not change public pages
+    was_published = not created and instance.get_loaded_value('is_published', True)
+
+    if instance.is_published or was_published:
+        invalidate_pages()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def catalog_changed_invalidate_pages(sender, action='post_save', **kwargs):
+    if action.startswith('post_'):
+        invalidate_pages()
+
+
+@receiver(post_save, sender=Recipe)
+def recipe_saved_generate_cover_derivatives(sender, instance, update_fields=None, **kwargs):
+    if update_fields and 'cover' not in update_fields:
+        return
+    if 'cover' in instance.get_deferred_fields() or not instance.cover_changed():
+        return
+
+    previous_cover = instance.get_loaded_cover_name()
+    if previous_cover:
+        delete_derivatives(previous_cover, instance.get_loaded_value('cover_width'))
+
+    transaction.on_commit(partial(schedule_derivatives, instance))
+
+
+@receiver(post_delete, sender=Recipe)
+def recipe_deleted_delete_cover_derivatives(sender, instance, **kwargs):
+    if instance.cover:
+        delete_derivatives(instance.cover.name, instance.cover_width)
+
+
+# Published recipe counters of categories and tags. Bulk paths that skip
+# the signals (queryset.update(), bulk_create) run reconcile_counts instead.
+@receiver(post_save, sender=Recipe)
+def recipe_saved_update_counters(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields and not {'is_published', 'category', 'category_id'} & set(update_fields):
+        return
+
+    # unknown previous values count as unchanged
+    if created:
+        was_published, old_category_id = False, None
+    else:
+        was_published = instance.get_loaded_value('is_published', instance.is_published)
+        old_category_id = instance.get_loaded_value('category_id', instance.category_id)
+
+    if (was_published, old_category_id) != (instance.is_published, instance.category_id):
+        if was_published:
+            counters.adjust_counts(Category, [old_category_id], -1)
+        if instance.is_published:
+            counters.adjust_counts(Category, [instance.category_id], 1)
+
+    if not created and was_published != instance.is_published:
+        delta = 1 if instance.is_published else -1
+        counters.adjust_counts(Tag, counters.recipe_tag_ids(instance.pk), delta)
+
+
+@receiver(pre_delete, sender=Recipe)
+def recipe_deleted_update_counters(sender, instance, **kwargs):
+    # before the delete, while the tag links still exist
+    if instance.get_loaded_value('is_published', instance.is_published):
+        counters.adjust_counts(
+            Category, [instance.get_loaded_value('category_id', instance.category_id)], -1
+        )
+        counters.adjust_counts(Tag, counters.recipe_tag_ids(instance.pk), -1)
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def recipe_tags_changed_update_counters(sender, instance, action, reverse, pk_set, **kwargs):
+    # removals are counted in pre_*, from the links that really exist
+    if action not in ('post_add', 'pre_remove', 'pre_clear'):
+        return
+
+    delta = 1 if action == 'post_add' else -1
+
+    if not reverse:
+        if not instance.is_published:
+            return
+        tag_ids = pk_set if action == 'post_add' else counters.recipe_tag_ids(
+            instance.pk, pk_set
+        )
+        counters.adjust_counts(Tag, tag_ids, delta)
+        return
+
+    recipe_ids = counters.published_recipe_ids(instance.pk, pk_set)
+    counters.adjust_counts(Tag, [instance.pk], delta * len(recipe_ids))
+
+
+# Sitemap and feed files are deleted once the change is committed, the
+# next request writes them again from the committed rows.
+def invalidate_catalog_files(sitemap_pks=None, whole_sections=()):
+    for section, pks in (sitemap_pks or {}).items():
+        sitemaps.invalidate_sitemap(section, pks)
+    for section in whole_sections:
+        sitemaps.invalidate_sitemap(section, whole_section=True)
+    sitemaps.invalidate_feeds()
+
+
+@receiver(post_save, sender=Recipe)
+def recipe_saved_invalidate_sitemaps(sender, instance, created, **kwargs):
+    was_published = not created and instance.get_loaded_value('is_published', True)
+    if not (instance.is_published or was_published):
+        return
+
+    # categories and tags without published recipes are left out
+    whole_sections = ()
+    if was_published != instance.is_published:
+        whole_sections = ('categories', 'tags')
+
+    transaction.on_commit(partial(
+        invalidate_catalog_files, {'recipes': [instance.pk]}, whole_sections,
+    ))
+
+
+@receiver(post_delete, sender=Recipe)
+def recipe_deleted_invalidate_sitemaps(sender, instance, **kwargs):
+    if instance.get_loaded_value('is_published', instance.is_published):
+        transaction.on_commit(partial(
+            invalidate_catalog_files, {'recipes': [instance.pk]}, ('categories', 'tags'),
+        ))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed_invalidate_sitemaps(sender, instance, **kwargs):
+    transaction.on_commit(partial(invalidate_catalog_files, {'categories': [instance.pk]}))
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def tag_changed_invalidate_sitemaps(sender, instance, **kwargs):
+    transaction.on_commit(partial(invalidate_catalog_files, {'tags': [instance.pk]}))
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def recipe_tags_changed_invalidate_sitemaps(sender, action, **kwargs):
+    if action.startswith('post_'):
+        transaction.on_commit(partial(invalidate_catalog_files, whole_sections=('tags',)))
+
+
+# Related recipes are refreshed once the change is committed, from the
+# committed tags. Bulk paths that skip the signals refresh the recipes they
+# change themselves, as set_published does, or run build_related.
+@receiver(post_save, sender=Recipe)
+def recipe_saved_refresh_related(sender, instance, **kwargs):
+    transaction.on_commit(partial(related.refresh_related, instance.pk))
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def recipe_tags_changed_refresh_related(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ('post_add', 'post_remove'):
+        recipe_ids = pk_set if reverse else [instance.pk]
+    elif action == 'post_clear' and not reverse:
+        recipe_ids = [instance.pk]
+    elif action == 'pre_clear' and reverse:
+        # the links of a cleared tag are gone by post_clear
+        recipe_ids = counters.published_recipe_ids(instance.pk)
+    else:
+        return
+
+    for recipe_id in recipe_ids:
+        transaction.on_commit(partial(related.refresh_related, recipe_id))
+
+
+@receiver(pre_delete, sender=Recipe)
+def recipe_deleted_refresh_related(sender, instance, **kwargs):
+    # the rows go with the recipe, the pages that showed it change
+    recipe_ids = RelatedRecipe.objects.filter(related=instance).values_list(
+        'recipe_id', flat=True,
+    )
+    bump_generations_on_commit(*map(related.related_version, recipe_ids))
+
+
+# Search suggestions, every process reads the changed rows again on its
+# next lookup. A recipe also changes the counters of its category and tags.
+@receiver(post_save, sender=Recipe)
+def recipe_saved_update_suggestions(sender, instance, created, **kwargs):
+    was_published = not created and instance.get_loaded_value('is_published', True)
+    if not (instance.is_published or was_published):
+        return
+
+    transaction.on_commit(partial(
+        suggest.record_changes,
+        ('recipe', instance.pk),
+        ('category', instance.get_loaded_value('category_id', instance.category_id)),
+    ))
+
+
+@receiver(pre_delete, sender=Recipe)
+def recipe_deleted_update_suggestions(sender, instance, **kwargs):
+    # before the delete, while the tag links still exist
+    refs = [('recipe', instance.pk), ('category', instance.category_id)]
+    refs += [('tag', tag_id) for tag_id in counters.recipe_tag_ids(instance.pk)]
+    transaction.on_commit(partial(suggest.record_changes, *refs))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed_update_suggestions(sender, instance, **kwargs):
+    transaction.on_commit(partial(suggest.record_changes, ('category', instance.pk)))
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def tag_changed_update_suggestions(sender, instance, **kwargs):
+    transaction.on_commit(partial(suggest.record_changes, ('tag', instance.pk)))
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def recipe_tags_changed_update_suggestions(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        if not action.startswith('post_'):
+            return
+        refs = [('tag', instance.pk)]
+    else:
+        if action in ('post_add', 'post_remove'):
+            tag_ids = pk_set
+        elif action == 'pre_clear':
+            # the links of a cleared recipe are gone by post_clear
+            tag_ids = counters.recipe_tag_ids(instance.pk)
+        else:
+            return
+        refs = [('recipe', instance.pk)] + [('tag', pk) for pk in tag_ids]
+
+    transaction.on_commit(partial(suggest.record_changes, *refs))
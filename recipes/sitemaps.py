@@ -0,0 +1,228 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import F, Max
+from django.http import FileResponse, Http404
+from django.urls import reverse
+from django.views.decorators.http import require_safe
+
+from tag.models import Tag
+
+from .models import Category, Recipe
+
+# Files are generated on the first request, or by generate_sitemaps, and
+# served from SITEMAP_ROOT until a change deletes them. Every section is
+# split in chunks of SITEMAP_CHUNK_SIZE ids, so a change only rewrites
+# the chunk of the changed row and the index.
+
+SITEMAP_NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+ITERATOR_CHUNK_SIZE = 2000
+INDEX_NAME = 'sitemap.xml'
+FEEDS_DIR = 'feeds'
+
+
+def recipes_section():
+    return Recipe.objects.published().only('id', 'slug', 'updated_at')
+
+
+def categories_section():
+    return Category.objects.filter(published_recipes_count__gt=0).only('id', 'slug')
+
+
+def tags_section():
+    return Tag.objects.filter(published_recipes_count__gt=0).only('id', 'slug')
+
+
+# section: (queryset, url name, url kwarg, has lastmod)
+SECTIONS = {
+    'recipes': (recipes_section, 'recipes:recipe', 'recipe_slug', True),
+    'categories': (categories_section, 'recipes:category', 'category_slug', False),
+    'tags': (tags_section, 'recipes:tag', 'slug', False),
+}
+
+
+def get_site_url(request):
+    return f'{request.scheme}://{request.get_host()}'
+
+
+def get_site_root(site_url):
+    # one directory per site url, files never mix up the hosts
+    digest = hashlib.md5(site_url.encode()).hexdigest()[:12]
+    return Path(settings.SITEMAP_ROOT) / digest
+
+
+def chunk_name(section, chunk):
+    return f'sitemap-{section}-{chunk}.xml'
+
+
+def chunk_of(pk):
+    return pk // settings.SITEMAP_CHUNK_SIZE
+
+
+def chunk_queryset(section, chunk):
+    size = settings.SITEMAP_CHUNK_SIZE
+    return SECTIONS[section][0]().filter(id__gte=chunk * size, id__lt=(chunk + 1) * size)
+
+
+def write_atomically(path, lines):
+    """
+    Writes the lines to a temporary file next to path and moves it into
+    place, so a request never reads a file that is half written.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+            file.writelines(lines)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+    return path
+
+
+def url_prefix(site_url, url_name, kwarg):
+    # reverse() once, not once per row
+    placeholder = 'slug-placeholder'
+    url = reverse(url_name, kwargs={kwarg: placeholder})
+    before, after = url.split(placeholder)
+    return site_url + before, after
+
+
+def chunk_lines(site_url, section, chunk):
+    _, url_name, kwarg, has_lastmod = SECTIONS[section]
+    before, after = url_prefix(site_url, url_name, kwarg)
+
+    rows = chunk_queryset(section, chunk).order_by('id').iterator(
+        chunk_size=ITERATOR_CHUNK_SIZE,
+    )
+
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<urlset xmlns="{SITEMAP_NAMESPACE}">\n'
+
+    for row in rows:
+        yield f'<url><loc>{escape(before + row.slug + after)}</loc>'
+        if has_lastmod:
+            yield f'<lastmod>{row.updated_at.date().isoformat()}</lastmod>'
+        yield '</url>\n'
+
+    yield '</urlset>\n'
+
+
+def get_chunks(section):
+    """The non empty chunks of the section and the last change in each."""
+    make_queryset, _, _, has_lastmod = SECTIONS[section]
+    chunks = make_queryset().annotate(
+        chunk=F('id') / settings.SITEMAP_CHUNK_SIZE,
+    ).values('chunk').order_by('chunk')
+
+    if has_lastmod:
+        return list(chunks.annotate(lastmod=Max('updated_at')).values_list('chunk', 'lastmod'))
+    return [(chunk, None) for chunk in chunks.distinct().values_list('chunk', flat=True)]
+
+
+def index_lines(site_url):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">\n'
+
+    for section in SECTIONS:
+        for chunk, lastmod in get_chunks(section):
+            location = site_url + reverse('recipes:sitemap', args=(section, chunk))
+            yield f'<sitemap><loc>{escape(location)}</loc>'
+            if lastmod is not None:
+                yield f'<lastmod>{lastmod.date().isoformat()}</lastmod>'
+            yield '</sitemap>\n'
+
+    yield '</sitemapindex>\n'
+
+
+def generate_index(site_url):
+    return write_atomically(get_site_root(site_url) / INDEX_NAME, index_lines(site_url))
+
+
+def generate_chunk(site_url, section, chunk):
+    return write_atomically(
+        get_site_root(site_url) / chunk_name(section, chunk),
+        chunk_lines(site_url, section, chunk),
+    )
+
+
+def generate_sitemaps(site_url, force=False):
+    """Writes the missing files, or every file when forced. Returns the paths written."""
+    written = []
+
+    for section in SECTIONS:
+        for chunk, _ in get_chunks(section):
+            path = get_site_root(site_url) / chunk_name(section, chunk)
+            if force or not path.exists():
+                written.append(generate_chunk(site_url, section, chunk))
+
+    written.append(generate_index(site_url))
+    return written
+
+
+def remove(pattern):
+    root = Path(settings.SITEMAP_ROOT)
+    for path in root.glob(f'*/{pattern}'):
+        path.unlink(missing_ok=True)
+
+
+def invalidate_sitemap(section, pks=(), whole_section=False):
+    """Deletes the chunks of the rows and the index, of every site."""
+    if whole_section:
+        remove(chunk_name(section, '*'))
+    for chunk in {chunk_of(pk) for pk in pks if pk is not None}:
+        remove(chunk_name(section, chunk))
+    remove(INDEX_NAME)
+
+
+def invalidate_feeds(name='*'):
+    remove(f'{FEEDS_DIR}/{name}.*')
+
+
+def serve(path, generate, content_type):
+    """Streams the file from disk, generating it first when it is missing."""
+    try:
+        file = path.open('rb')
+    except FileNotFoundError:
+        generate()
+        file = path.open('rb')
+
+    response = FileResponse(file, content_type=content_type)
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+@require_safe
+def sitemap_index(request):
+    site_url = get_site_url(request)
+    return serve(
+        get_site_root(site_url) / INDEX_NAME,
+        lambda: generate_index(site_url),
+        'application/xml',
+    )
+
+
+@require_safe
+def sitemap_chunk(request, section, chunk):
+    if section not in SECTIONS:
+        raise Http404()
+
+    site_url = get_site_url(request)
+
+    def generate():
+        if not chunk_queryset(section, chunk).exists():
+            raise Http404()
+        generate_chunk(site_url, section, chunk)
+
+    return serve(
+        get_site_root(site_url) / chunk_name(section, chunk),
+        generate,
+        'application/xml',
+    )
@@ -0,0 +1,256 @@
+import bisect
+import threading
+import unicodedata
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.urls import reverse
+
+from tag.models import Tag
+from utils.cache import bump_generation, get_generation
+
+from .models import Category, Recipe
+
+# Search suggestions are served from a prefix index kept in the memory of
+# every process, the database is only read when it is built. A change
+# bumps SUGGEST_GENERATION and stores what changed under the new
+# generation, each process replays the changes it has not seen on its next
+# lookup and rebuilds the whole index when one of them is missing.
+
+SUGGEST_GENERATION = 'suggest-index'
+CHANGES_TIMEOUT = 60 * 60
+# more changes than this at once and a rebuild is cheaper
+MAX_REPLAYED = 500
+MIN_QUERY_LENGTH = 2
+SUGGESTIONS = 8
+# the matches looked at for a short prefix, the best of them are returned
+MAX_SCANNED = 500
+BATCH_SIZE = 5000
+
+# catalog entries first, they lead to a list of recipes
+KINDS = {'category': 0, 'tag': 1, 'recipe': 2}
+URL_NAMES = {
+    'category': 'recipes:category',
+    'tag': 'recipes:tag',
+    'recipe': 'recipes:recipe',
+}
+
+Suggestion = namedtuple('Suggestion', 'kind pk label slug folded')
+
+
+def fold(text):
+    """Lower case and without accents, "Pão de Açúcar" is "pao de acucar"."""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ' '.join(
+        ''.join(char for char in decomposed if not unicodedata.combining(char)).split()
+    )
+
+
+def make_suggestion(kind, pk, label, slug):
+    return Suggestion(kind, pk, label, slug, fold(label))
+
+
+def index_keys(suggestion):
+    """The folded label from each of its words on, "choc" finds "Bolo de chocolate"."""
+    words = suggestion.folded.split()
+    return {' '.join(words[start:]) for start in range(len(words))}
+
+
+def suggestion_url(suggestion):
+    return reverse(URL_NAMES[suggestion.kind], args=(suggestion.slug,))
+
+
+class PrefixIndex:
+    """
+    Sorted keys and, at the same positions, the suggestions they belong to,
+    searched with bisect. Not thread safe, the module functions lock it.
+    """
+
+    def __init__(self, generation=None):
+        self.generation = generation
+        self.keys = []
+        self.suggestions = []
+        self.by_ref = {}
+
+    def __len__(self):
+        return len(self.by_ref)
+
+    @classmethod
+    def build(cls, suggestions, generation=None):
+        index = cls(generation)
+        pairs = []
+
+        for suggestion in suggestions:
+            index.by_ref[suggestion.kind, suggestion.pk] = suggestion
+            pairs += [(key, suggestion) for key in index_keys(suggestion)]
+
+        pairs.sort(key=lambda pair: pair[0])
+        index.keys = [key for key, _ in pairs]
+        index.suggestions = [suggestion for _, suggestion in pairs]
+        return index
+
+    def add(self, suggestion):
+        self.remove(suggestion.kind, suggestion.pk)
+        self.by_ref[suggestion.kind, suggestion.pk] = suggestion
+
+        for key in index_keys(suggestion):
+            position = bisect.bisect_right(self.keys, key)
+            self.keys.insert(position, key)
+            self.suggestions.insert(position, suggestion)
+
+    def remove(self, kind, pk):
+        suggestion = self.by_ref.pop((kind, pk), None)
+        if suggestion is None:
+            return
+
+        for key in index_keys(suggestion):
+            start = bisect.bisect_left(self.keys, key)
+            stop = bisect.bisect_right(self.keys, key, start)
+            for position in range(start, stop):
+                if self.suggestions[position] is suggestion:
+                    del self.keys[position]
+                    del self.suggestions[position]
+                    break
+
+    def lookup(self, query, limit=SUGGESTIONS):
+        prefix = fold(query)
+        if len(prefix) < MIN_QUERY_LENGTH:
+            return []
+
+        start = bisect.bisect_left(self.keys, prefix)
+        stop = min(start + MAX_SCANNED, len(self.keys))
+        found = {}
+
+        for position in range(start, stop):
+            if not self.keys[position].startswith(prefix):
+                break
+            suggestion = self.suggestions[position]
+            found[suggestion.kind, suggestion.pk] = suggestion
+
+        # a label that starts with the query beats a word inside a label
+        return sorted(found.values(), key=lambda suggestion: (
+            not suggestion.folded.startswith(prefix),
+            KINDS[suggestion.kind],
+            len(suggestion.label),
+            suggestion.label,
+        ))[:limit]
+
+
+def recipe_suggestions(recipes):
+    for pk, title, slug in recipes.values_list('id', 'title', 'slug').iterator(
+        chunk_size=BATCH_SIZE,
+    ):
+        yield make_suggestion('recipe', pk, title, slug)
+
+
+def catalog_suggestions(kind, queryset):
+    # an empty category or tag page is not worth suggesting
+    for pk, name, slug in queryset.filter(published_recipes_count__gt=0).values_list(
+        'id', 'name', 'slug',
+    ):
+        yield make_suggestion(kind, pk, name, slug)
+
+
+def load_suggestions():
+    yield from catalog_suggestions('category', Category.objects.all())
+    yield from catalog_suggestions('tag', Tag.objects.all())
+    yield from recipe_suggestions(Recipe.objects.published())
+
+
+def apply_changes(index, refs):
+    """Reads the changed rows again, adding or removing their suggestions."""
+    pks = {kind: set() for kind in KINDS}
+    for kind, pk in refs:
+        if pk is not None:
+            pks[kind].add(pk)
+
+    # a recipe changes the counters of its category and tags
+    if pks['recipe']:
+        pks['category'].update(
+            Recipe.objects.filter(pk__in=pks['recipe'], category__isnull=False).values_list(
+                'category_id', flat=True,
+            )
+        )
+        pks['tag'].update(
+            Recipe.tags.through.objects.filter(recipe_id__in=pks['recipe']).values_list(
+                'tag_id', flat=True,
+            )
+        )
+
+    loaders = {
+        'recipe': lambda ids: recipe_suggestions(
+            Recipe.objects.published().filter(pk__in=ids),
+        ),
+        'category': lambda ids: catalog_suggestions(
+            'category', Category.objects.filter(pk__in=ids),
+        ),
+        'tag': lambda ids: catalog_suggestions('tag', Tag.objects.filter(pk__in=ids)),
+    }
+
+    for kind, ids in pks.items():
+        if not ids:
+            continue
+        found = {suggestion.pk: suggestion for suggestion in loaders[kind](ids)}
+        for pk in ids:
+            if pk in found:
+                index.add(found[pk])
+            else:
+                index.remove(kind, pk)
+
+
+def change_key(generation):
+    return f'suggest-changes:{generation}'
+
+
+def record_changes(*refs):
+    """Tells every process which (kind, pk) to read again."""
+    generation = bump_generation(SUGGEST_GENERATION)
+    cache.set(change_key(generation), list(refs), CHANGES_TIMEOUT)
+
+
+def invalidate():
+    """Makes every process rebuild its index, for bulk changes."""
+    bump_generation(SUGGEST_GENERATION)
+
+
+_index = PrefixIndex()
+_lock = threading.Lock()
+
+
+def get_pending_changes(index, generation):
+    """The changes since the index was built, None when it has to be rebuilt."""
+    if index.generation is None or not 0 < generation - index.generation <= MAX_REPLAYED:
+        return None
+
+    keys = [change_key(number) for number in range(index.generation + 1, generation + 1)]
+    changes = cache.get_many(keys)
+    if len(changes) != len(keys):
+        return None
+    return [ref for key in keys for ref in changes[key]]
+
+
+def get_index():
+    global _index
+    generation = get_generation(SUGGEST_GENERATION)
+
+    with _lock:
+        if _index.generation == generation:
+            return _index
+
+        changes = get_pending_changes(_index, generation)
+        if changes is not None:
+            apply_changes(_index, changes)
+            _index.generation = generation
+            return _index
+
+    # built outside the lock, the old index keeps answering meanwhile
+    index = PrefixIndex.build(load_suggestions(), generation)
+    with _lock:
+        _index = index
+    return index
+
+
+def suggest(query, limit=SUGGESTIONS):
+    index = get_index()
+    with _lock:
+        return index.lookup(query, limit)
@@ -0,0 +1,17 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from recipes.cards import get_recipe_cards
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def recipe_card(context, recipe):
+    cards = context.get('recipe_cards') or {}
+    card = cards.get(recipe.id)
+
+    if card is None:
+        card = get_recipe_cards([recipe])[recipe.id]
+
+    return mark_safe(card)
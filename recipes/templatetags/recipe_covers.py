@@ -0,0 +1,10 @@
+from django import template
+
+from recipes.covers import get_cover_context
+
+register = template.Library()
+
+
+@register.inclusion_tag('recipes/partials/recipe_cover.html')
+def recipe_cover(recipe, variant='card'):
+    return get_cover_context(recipe, variant)
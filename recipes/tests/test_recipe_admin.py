@@ -0,0 +1,126 @@
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from recipes import counters
+from recipes.models import Category, Recipe
+from recipes.publishing import set_published
+from tag.models import Tag
+
+from .test_recipe_base import RecipeTestBase
+
+CHANGELIST_URL = reverse('admin:recipes_recipe_changelist')
+
+
+class RecipeAdminTest(RecipeTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.admin = User.objects.create_superuser('admin', 'admin@email.com', 'admin')
+        self.client.force_login(self.admin)
+
+        self.category = self.make_category()
+        self.recipes = [
+            self.make_recipe_with_category(
+                self.category, title=f'Bolo {i}', slug=f'bolo-{i}',
+                author_data={'username': f'u{i}'}, is_published=i % 2 == 0,
+            )
+            for i in range(4)
+        ]
+        self.tag = Tag.objects.create(
+            name='Doces', content_type=ContentType.objects.get_for_model(Recipe),
+            object_id=0,
+        )
+        for recipe in self.recipes:
+            recipe.tags.add(self.tag)
+
+    def get_results(self, **params):
+        response = self.client.get(CHANGELIST_URL, params)
+        self.assertEqual(response.status_code, 200)
+        return list(response.context['cl'].result_list)
+
+    def test_input_filters_match_the_typed_value(self):
+        results = self.get_results(author='u1')
+        self.assertEqual(results, [self.recipes[1]])
+
+        other = self.make_recipe(
+            slug='other', author_data={'username': 'u9'},
+            category_data={'name': 'Other', 'slug': 'other'},
+        )
+        self.assertEqual(self.get_results(category='other'), [other])
+
+    def test_input_filter_keeps_the_other_params(self):
+        response = self.client.get(CHANGELIST_URL, {'is_published__exact': '1', 'author': 'u0'})
+        self.assertContains(response, 'name="is_published__exact" value="1"')
+        self.assertContains(response, 'name="author" value="u0"')
+
+    def test_search_uses_the_search_index_and_ids(self):
+        self.assertEqual(set(self.get_results(q='bolo')), set(self.recipes))
+        self.assertEqual(self.get_results(q=str(self.recipes[2].pk)), [self.recipes[2]])
+
+    def test_bulk_actions_update_the_rows_and_the_counters(self):
+        response = self.client.post(CHANGELIST_URL, {
+            'action': 'publish',
+            '_selected_action': [recipe.pk for recipe in self.recipes],
+        })
+        self.assertEqual(response.status_code, 302)
+
+        self.assertEqual(Recipe.objects.published().count(), 4)
+        self.category.refresh_from_db()
+        self.tag.refresh_from_db()
+        self.assertEqual(self.category.published_recipes_count, 4)
+        self.assertEqual(self.tag.published_recipes_count, 4)
+
+        self.client.post(CHANGELIST_URL, {
+            'action': 'unpublish', '_selected_action': [self.recipes[0].pk],
+        })
+        self.category.refresh_from_db()
+        self.assertEqual(self.category.published_recipes_count, 3)
+        self.assertEqual(counters.reconcile_counts(fix=False), {Category: [], Tag: []})
+
+
+class SetPublishedTest(RecipeTestBase):
+    def test_one_update_for_every_row_and_new_updated_at(self):
+        category = self.make_category()
+        recipes = [
+            self.make_recipe_with_category(
+                category, slug=f'recipe-{i}', author_data={'username': f'u{i}'},
+                is_published=False,
+            )
+            for i in range(3)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            changed = set_published(Recipe.objects.all(), True)
+
+        self.assertEqual(changed, 3)
+        recipe_updates = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE "recipes_recipe"')
+        ]
+        self.assertEqual(len(recipe_updates), 1)
+        for recipe in recipes:
+            old_updated_at = recipe.updated_at
+            recipe.refresh_from_db()
+            self.assertGreater(recipe.updated_at, old_updated_at)
+
+        self.assertEqual(set_published(Recipe.objects.all(), True), 0)
+
+    def test_related_recipes_follow_the_published_rows(self):
+        category = self.make_category()
+        first, second = [
+            self.make_recipe_with_category(
+                category, title=f'Bolo de cenoura {i}', slug=f'recipe-{i}',
+                author_data={'username': f'u{i}'}, is_published=False,
+            )
+            for i in range(2)
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            set_published(Recipe.objects.all(), True)
+        self.assertEqual(list(Recipe.objects.related_to(first)), [second])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            set_published(Recipe.objects.filter(pk=second.pk), False)
+        self.assertEqual(list(Recipe.objects.related_to(first)), [])
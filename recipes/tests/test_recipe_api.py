@@ -0,0 +1,158 @@
+import json
+from unittest.mock import patch
+
+from django.contrib.contenttypes.models import ContentType
+from django.urls import reverse
+
+from recipes.models import Recipe
+from tag.models import Tag
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeApiTest(RecipeTestBase):
+    def make_recipes(self, count, **kwargs):
+        return [
+            self.make_recipe(
+                title=f'Recipe {i}', slug=f'recipe-{i}',
+                author_data={'username': f'u{i}'},
+                category_data={'slug': f'category-{i}'},
+                **kwargs,
+            )
+            for i in range(count)
+        ]
+
+    def make_tag(self, name, recipes):
+        tag = Tag.objects.create(
+            name=name,
+            content_type=ContentType.objects.get_for_model(Recipe),
+            object_id=0,
+        )
+        tag.recipe_set.add(*recipes)
+        return tag
+
+    def get_json(self, url, **extra):
+        response = self.client.get(url, **extra)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        return response, json.loads(response.content)
+
+    def test_recipe_list_returns_published_recipes_newest_first(self):
+        recipes = self.make_recipes(3)
+        self.make_recipe(slug='draft', is_published=False, author_data={'username': 'd'})
+
+        _, data = self.get_json(reverse('recipes_api:recipes'))
+
+        self.assertEqual(
+            [recipe['slug'] for recipe in data['results']],
+            [recipe.slug for recipe in reversed(recipes)],
+        )
+        first = data['results'][0]
+        self.assertEqual(first['author']['username'], 'u2')
+        self.assertEqual(first['category']['slug'], 'category-2')
+        self.assertEqual(first['url'], reverse('recipes_api:recipe', args=('recipe-2',)))
+        self.assertNotIn('preparation_steps', first)
+
+    def test_recipe_list_follows_the_cursors(self):
+        recipes = self.make_recipes(5)
+        url = reverse('recipes_api:recipes') + '?limit=2'
+
+        slugs = []
+        while url:
+            _, data = self.get_json(url)
+            slugs += [recipe['slug'] for recipe in data['results']]
+            url = data['next']
+
+        self.assertEqual(slugs, [recipe.slug for recipe in reversed(recipes)])
+
+        _, data = self.get_json(data['previous'])
+        self.assertEqual(len(data['results']), 2)
+
+    def test_recipe_list_filters_like_the_pages(self):
+        recipes = self.make_recipes(3)
+        self.make_tag('Doces', recipes[:2])
+        url = reverse('recipes_api:recipes')
+
+        _, data = self.get_json(f'{url}?category=category-1')
+        self.assertEqual([r['slug'] for r in data['results']], ['recipe-1'])
+
+        _, data = self.get_json(f'{url}?tag=doces')
+        self.assertEqual([r['slug'] for r in data['results']], ['recipe-1', 'recipe-0'])
+
+        recipes[2].title = 'Bolo de cenoura'
+        recipes[2].save()
+        _, data = self.get_json(f'{url}?q=cenoura')
+        self.assertEqual([r['slug'] for r in data['results']], ['recipe-2'])
+
+    def test_sparse_fieldsets_select_only_their_columns(self):
+        self.make_recipes(1)
+
+        with self.assertNumQueries(1) as captured:
+            _, data = self.get_json(reverse('recipes_api:recipes') + '?fields=title,slug')
+
+        self.assertEqual(data['results'], [{'title': 'Recipe 0', 'slug': 'recipe-0'}])
+        self.assertNotIn('auth_user', captured.captured_queries[0]['sql'])
+
+    def test_unknown_fields_are_rejected(self):
+        response, data = self.get_json(reverse('recipes_api:recipes') + '?fields=title,password')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(data['detail'], 'Unknown fields: password.')
+
+    def test_etag_answers_not_modified(self):
+        self.make_recipes(2)
+        url = reverse('recipes_api:recipes')
+
+        response = self.client.get(url)
+        etag = response['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        Recipe.objects.update(title='Changed')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_recipe_detail_has_steps_and_tags(self):
+        recipe = self.make_recipe(preparation_steps='Mix\nBake')
+        self.make_tag('Doces', [recipe])
+
+        _, data = self.get_json(reverse('recipes_api:recipe', args=(recipe.slug,)))
+
+        self.assertEqual(data['preparation_steps'], 'Mix<br>Bake')
+        self.assertEqual(data['tags'], [{'name': 'Doces', 'slug': 'doces'}])
+
+    def test_recipe_detail_of_a_draft_is_not_found(self):
+        recipe = self.make_recipe(is_published=False)
+        response, data = self.get_json(reverse('recipes_api:recipe', args=(recipe.slug,)))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(data, {'detail': 'Not found.'})
+
+    def test_categories_and_tags_list_their_counters(self):
+        recipes = self.make_recipes(2)
+        self.make_tag('Doces', recipes)
+
+        _, data = self.get_json(reverse('recipes_api:categories'))
+        self.assertEqual(
+            [(c['slug'], c['published_recipes_count']) for c in data['results']],
+            [('category-1', 1), ('category-0', 1)],
+        )
+
+        _, data = self.get_json(reverse('recipes_api:tags'))
+        self.assertEqual(data['results'][0]['published_recipes_count'], 2)
+
+    def test_export_streams_json_lines_in_chunks(self):
+        self.make_recipes(5)
+
+        with patch('recipes.api.EXPORT_CHUNK_SIZE', new=2):
+            response = self.client.get(reverse('recipes_api:export') + '?fields=slug')
+            self.assertTrue(response.streaming)
+            lines = b''.join(response.streaming_content).decode().splitlines()
+
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [{'slug': f'recipe-{i}'} for i in reversed(range(5))],
+        )
+
+    def test_api_is_read_only(self):
+        response = self.client.post(reverse('recipes_api:recipes'))
+        self.assertEqual(response.status_code, 405)
@@ -0,0 +1,122 @@
+from types import ModuleType
+
+from asgiref.sync import sync_to_async
+from django.contrib.contenttypes.models import ContentType
+from django.test import RequestFactory, override_settings
+from django.urls import include, path, reverse
+
+from recipes import async_views
+from recipes.models import Recipe
+from recipes.urls import get_urlpatterns
+from tag.models import Tag
+from utils.pagination import amake_pagination
+
+from .test_recipe_base import RecipeTestBase
+
+async_urls = ModuleType('async_urls')
+async_urls.urlpatterns = [
+    path('', include((get_urlpatterns(async_views), 'recipes'))),
+    path('authors/', include('authors.urls')),
+    path('api/', include('recipes.api_urls')),
+]
+
+
+@override_settings(ROOT_URLCONF=async_urls)
+class RecipeAsyncViewsTest(RecipeTestBase):
+    async def get(self, url):
+        return await self.async_client.get(url)
+
+    async def amake_recipe(self, **kwargs):
+        return await sync_to_async(self.make_recipe)(**kwargs)
+
+    @sync_to_async
+    def amake_tag(self, recipe, name='Vegano'):
+        tag = Tag.objects.create(
+            name=name,
+            content_type=ContentType.objects.get_for_model(Recipe),
+            object_id=recipe.pk,
+        )
+        recipe.tags.add(tag)
+        return tag
+
+    async def test_home_lists_published_recipes(self):
+        await self.amake_recipe(title='Published recipe')
+        await self.amake_recipe(
+            title='Draft recipe', slug='draft', is_published=False,
+            author_data={'username': 'other'}, category_data={'slug': 'other'},
+        )
+
+        response = await self.get(reverse('recipes:home'))
+        content = response.content.decode('utf-8')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Published recipe', content)
+        self.assertNotIn('Draft recipe', content)
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+
+        response = await self.get(reverse('recipes:home'))
+        self.assertEqual(response['X-Page-Cache'], 'HIT')
+
+    async def test_category_without_recipes_is_404(self):
+        response = await self.get(reverse('recipes:category', args=('nothing',)))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_category_title_comes_from_the_page(self):
+        recipe = await self.amake_recipe(category_data={'name': 'Soups'})
+        response = await self.get(
+            reverse('recipes:category', args=(recipe.category.slug,))
+        )
+        self.assertContains(response, 'Soups - Category Recipes')
+
+    async def test_tag_page_loads_the_tag_and_the_recipes(self):
+        recipe = await self.amake_recipe(title='Tagged recipe')
+        tag = await self.amake_tag(recipe)
+
+        response = await self.get(reverse('recipes:tag', args=(tag.slug,)))
+
+        self.assertContains(response, f'{tag.name} - Tag')
+        self.assertContains(response, 'Tagged recipe')
+
+    async def test_search_without_term_is_404_and_finds_by_title(self):
+        await self.amake_recipe(title='Carrot cake')
+
+        response = await self.get(reverse('recipes:search'))
+        self.assertEqual(response.status_code, 404)
+
+        response = await self.get(reverse('recipes:search') + '?q=carrot')
+        self.assertContains(response, 'Carrot cake')
+
+    async def test_detail_shows_published_recipes_only(self):
+        recipe = await self.amake_recipe(title='Detail recipe')
+        response = await self.get(reverse('recipes:recipe', args=(recipe.slug,)))
+        self.assertContains(response, 'Detail recipe')
+
+        await Recipe.objects.filter(pk=recipe.pk).aupdate(is_published=False)
+        response = await self.get(reverse('recipes:recipe', args=(recipe.slug,)))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_amake_pagination_falls_back_to_the_last_page(self):
+        for i in range(3):
+            await self.amake_recipe(
+                slug=f'recipe-{i}', title=f'Recipe {i}',
+                author_data={'username': f'user{i}'},
+                category_data={'slug': f'category-{i}'},
+            )
+
+        request = RequestFactory().get('/', {'page': 5})
+        page_obj, pagination_range = await amake_pagination(
+            request, Recipe.objects.order_by('id'), 2
+        )
+
+        self.assertEqual(page_obj.number, 2)
+        self.assertEqual([recipe.title for recipe in page_obj], ['Recipe 2'])
+        self.assertEqual(pagination_range['total_pages'], 2)
+
+    async def test_unchanged_home_is_not_modified(self):
+        await self.amake_recipe()
+        url = reverse('recipes:home')
+
+        response = await self.get(url)
+        # the async client takes the raw header names
+        response = await self.async_client.get(url, **{'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
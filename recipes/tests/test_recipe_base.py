@@ -1,10 +1,15 @@
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
 
 from recipes.models import Category, Recipe
 
 
 class RecipeTestBase(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        return super().setUp()
+
     def make_category(self, name='Category', slug='category-slug'):
         return Category.objects.create(name=name, slug=slug)
 
@@ -0,0 +1,81 @@
+from django.urls import reverse
+
+from recipes.cards import card_cache_key, get_recipe_cards
+from recipes.models import Recipe
+
+from .test_recipe_base import RecipeTestBase
+
+CARD_TEMPLATE = 'recipes/partials/recipe.html'
+
+
+class RecipeCardCacheTest(RecipeTestBase):
+    def setUp(self) -> None:
+        self.recipe = self.make_recipe(
+            title='Bolo de cenoura',
+            category_data={'name': 'Bolos', 'slug': 'bolos'},
+            author_data={'first_name': 'Ana', 'last_name': 'Maria'},
+        )
+        return super().setUp()
+
+    def get_home_content(self):
+        return self.client.get(reverse('recipes:home')).content.decode('utf-8')
+
+    def test_recipe_card_is_rendered_once_and_then_read_from_cache(self):
+        response = self.client.get(reverse('recipes:home'))
+        self.assertTemplateUsed(response, CARD_TEMPLATE)
+
+        response = self.client.get(reverse('recipes:home'))
+        self.assertTemplateNotUsed(response, CARD_TEMPLATE)
+        self.assertIn('Bolo de cenoura', response.content.decode('utf-8'))
+
+    def test_recipe_card_key_changes_when_recipe_is_saved(self):
+        old_key = card_cache_key(self.recipe)
+        self.recipe.title = 'Bolo de laranja'
+        self.recipe.save()
+
+        self.assertNotEqual(old_key, card_cache_key(self.recipe))
+        self.assertIn('Bolo de laranja', self.get_home_content())
+
+    def test_recipe_card_follows_category_changes(self):
+        self.get_home_content()
+        category = self.recipe.category
+        category.name = 'Tortas'
+        with self.captureOnCommitCallbacks(execute=True):
+            category.save()
+
+        self.assertIn('Tortas', self.get_home_content())
+
+    def test_recipe_card_follows_category_delete(self):
+        self.get_home_content()
+        self.recipe.category.delete()
+
+        self.assertNotIn('Bolos', self.get_home_content())
+
+    def test_recipe_card_follows_author_changes(self):
+        self.get_home_content()
+        author = self.recipe.author
+        author.first_name = 'Joana'
+        with self.captureOnCommitCallbacks(execute=True):
+            author.save()
+
+        self.assertIn('Joana', self.get_home_content())
+
+    def test_category_and_author_changes_keep_the_recipe_updated_at(self):
+        updated_at = self.recipe.updated_at
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.recipe.category.save()
+            self.recipe.author.save()
+
+        self.recipe.refresh_from_db()
+        self.assertEqual(updated_at, self.recipe.updated_at)
+
+    def test_author_login_does_not_invalidate_cards(self):
+        updated_at = self.recipe.updated_at
+        self.client.login(username='username', password='123456')
+        self.recipe.refresh_from_db()
+        self.assertEqual(updated_at, self.recipe.updated_at)
+
+    def test_get_recipe_cards_returns_cards_by_recipe_id(self):
+        cards = get_recipe_cards(Recipe.objects.all())
+        self.assertIn('Bolo de cenoura', cards[self.recipe.id])
@@ -0,0 +1,50 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from recipes.cards import render_card
+from recipes.models import Recipe, RecipeCard
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeCardProjectionTest(RecipeTestBase):
+    def setUp(self) -> None:
+        self.recipe = self.make_recipe(
+            title='Bolo de cenoura',
+            preparation_steps='Long preparation steps',
+            category_data={'name': 'Bolos', 'slug': 'bolos'},
+            author_data={'first_name': 'Ana', 'last_name': 'Maria'},
+        )
+        return super().setUp()
+
+    def test_cards_yield_recipe_cards_equal_to_their_recipes(self):
+        card = Recipe.objects.cards().get()
+
+        self.assertIsInstance(card, RecipeCard)
+        self.assertEqual(card, self.recipe)
+        self.assertEqual(card.author.first_name, 'Ana')
+        self.assertEqual(card.category.slug, 'bolos')
+        self.assertEqual(card.get_absolute_url(), self.recipe.get_absolute_url())
+
+    def test_card_renders_like_the_recipe(self):
+        recipe = Recipe.objects.select_related('author', 'category').get()
+        self.assertEqual(render_card(Recipe.objects.cards().get()), render_card(recipe))
+
+    def test_card_without_author_or_category(self):
+        Recipe.objects.update(author=None, category=None)
+        card = Recipe.objects.cards().get()
+
+        self.assertIsNone(card.author)
+        self.assertIsNone(card.category)
+        self.assertIn('Desconhecido', render_card(card))
+
+    def test_list_pages_select_only_the_card_columns(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse('recipes:home'))
+
+        sql = ' '.join(query['sql'] for query in captured)
+        self.assertNotIn('preparation_steps', sql)
+        self.assertNotIn('"recipes_recipe_tags"', sql)
+        self.assertNotIn('"auth_user"."password"', sql)
+        self.assertEqual(list(response.context['recipes']), [self.recipe])
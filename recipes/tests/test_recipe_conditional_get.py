@@ -0,0 +1,126 @@
+from django.contrib.contenttypes.models import ContentType
+from django.urls import reverse
+
+from recipes.conditional import get_list_stats
+from recipes.models import Recipe
+from tag.models import Tag
+
+from .test_recipe_base import RecipeTestBase
+
+DETAIL_TEMPLATE = 'recipes/pages/details.html'
+HOME_TEMPLATE = 'recipes/pages/home.html'
+
+
+class RecipeConditionalGetTest(RecipeTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.recipe = self.make_recipe(title='Bolo de cenoura')
+
+    def get_etag(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def test_detail_is_validated_by_updated_at(self):
+        url = self.recipe.get_absolute_url()
+        response = self.client.get(url)
+
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertTemplateNotUsed(response, DETAIL_TEMPLATE)
+
+    def test_detail_changes_with_the_recipe_and_its_tags(self):
+        url = self.recipe.get_absolute_url()
+        etag = self.get_etag(url)
+
+        self.recipe.title = 'Bolo de laranja'
+        self.recipe.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        etag = response['ETag']
+        tag = Tag.objects.create(
+            name='Doces', content_type=ContentType.objects.get_for_model(Recipe),
+            object_id=self.recipe.pk,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.recipe.tags.add(tag)
+        self.assertNotEqual(self.get_etag(url), etag)
+
+        etag = self.get_etag(url)
+        tag.name = 'Sobremesas'
+        with self.captureOnCommitCallbacks(execute=True):
+            tag.save()
+        self.assertNotEqual(self.get_etag(url), etag)
+
+        updated_at = self.recipe.updated_at
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.updated_at, updated_at)
+
+    def test_detail_answers_if_modified_since(self):
+        url = self.recipe.get_absolute_url()
+        last_modified = self.client.get(url)['Last-Modified']
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_unchanged_list_is_answered_from_the_cached_stats(self):
+        url = reverse('recipes:home')
+        etag = self.get_etag(url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertTemplateNotUsed(response, HOME_TEMPLATE)
+
+    def test_list_etag_changes_with_its_recipes(self):
+        url = reverse('recipes:home')
+        etag = self.get_etag(url)
+
+        self.make_recipe(
+            title='Bolo de milho', slug='milho',
+            author_data={'username': 'other'}, category_data={'slug': 'other'},
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        etag = response['ETag']
+        Recipe.objects.get(slug='milho').delete()
+        self.assertNotEqual(self.get_etag(url), etag)
+
+    def test_etags_follow_category_changes(self):
+        urls = [reverse('recipes:home'), self.recipe.get_absolute_url()]
+        etags = [self.get_etag(url) for url in urls]
+
+        category = self.recipe.category
+        category.name = 'Tortas'
+        with self.captureOnCommitCallbacks(execute=True):
+            category.save()
+
+        for url, etag in zip(urls, etags):
+            self.assertNotEqual(self.get_etag(url), etag)
+
+    def test_list_etag_depends_on_the_page_and_filters(self):
+        home = reverse('recipes:home')
+        search = reverse('recipes:search')
+
+        etags = {
+            self.get_etag(home),
+            self.get_etag(f'{home}?page=2'),
+            self.get_etag(f'{search}?q=bolo'),
+            self.get_etag(f'{search}?q=cenoura'),
+        }
+        self.assertEqual(len(etags), 4)
+
+    def test_list_stats_of_a_queryset_that_matches_nothing(self):
+        with self.assertNumQueries(0):
+            stats = get_list_stats(Recipe.objects.filter(pk__in=[]))
+        self.assertEqual(stats, (0, None))
+
+    def test_empty_category_is_still_404(self):
+        response = self.client.get(reverse('recipes:category', args=('nothing',)))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,114 @@
+from io import StringIO
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+
+from recipes.models import Category, Recipe
+from tag.models import Tag
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeCountersTest(RecipeTestBase):
+    def make_tag(self, name):
+        return Tag.objects.create(
+            name=name,
+            content_type=ContentType.objects.get_for_model(Recipe),
+            object_id=0,
+        )
+
+    def assertCount(self, instance, expected):
+        instance.refresh_from_db()
+        self.assertEqual(instance.published_recipes_count, expected)
+
+    def test_publishing_and_unpublishing_updates_the_category(self):
+        recipe = self.make_recipe(is_published=False)
+        self.assertCount(recipe.category, 0)
+
+        recipe.is_published = True
+        recipe.save()
+        self.assertCount(recipe.category, 1)
+
+        recipe.save()
+        self.assertCount(recipe.category, 1)
+
+        recipe.is_published = False
+        recipe.save()
+        self.assertCount(recipe.category, 0)
+
+    def test_moving_a_published_recipe_moves_the_count(self):
+        recipe = self.make_recipe()
+        old_category = recipe.category
+        new_category = self.make_category(name='Other', slug='other')
+
+        recipe.category = new_category
+        recipe.save()
+
+        self.assertCount(old_category, 0)
+        self.assertCount(new_category, 1)
+
+    def test_tags_count_published_recipes_only(self):
+        recipe = self.make_recipe(is_published=False)
+        vegan, quick = self.make_tag('Vegan'), self.make_tag('Quick')
+
+        recipe.tags.add(vegan, quick)
+        self.assertCount(vegan, 0)
+
+        recipe.is_published = True
+        recipe.save()
+        self.assertCount(vegan, 1)
+        self.assertCount(quick, 1)
+
+        recipe.tags.remove(quick)
+        recipe.tags.remove(quick)
+        self.assertCount(quick, 0)
+
+        recipe.tags.set([quick])
+        self.assertCount(vegan, 0)
+        self.assertCount(quick, 1)
+
+        recipe.tags.clear()
+        self.assertCount(quick, 0)
+
+    def test_reverse_tag_changes_count_published_recipes(self):
+        published = self.make_recipe()
+        draft = self.make_recipe(
+            slug='draft', is_published=False,
+            author_data={'username': 'other'}, category_data={'slug': 'other'},
+        )
+        tag = self.make_tag('Vegan')
+
+        tag.recipe_set.add(published, draft)
+        self.assertCount(tag, 1)
+
+        tag.recipe_set.clear()
+        self.assertCount(tag, 0)
+
+    def test_deleting_a_published_recipe_decrements_its_counters(self):
+        recipe = self.make_recipe()
+        tag = self.make_tag('Vegan')
+        recipe.tags.add(tag)
+        category = recipe.category
+
+        recipe.delete()
+
+        self.assertCount(category, 0)
+        self.assertCount(tag, 0)
+
+    def test_reconcile_command_reports_and_fixes_drift(self):
+        recipe = self.make_recipe()
+        Category.objects.filter(pk=recipe.category.pk).update(published_recipes_count=7)
+
+        stdout = StringIO()
+        call_command('reconcile_recipe_counts', '--dry-run', stdout=stdout)
+        self.assertIn(f'category {recipe.category.pk}: 7 -> 1', stdout.getvalue())
+        self.assertCount(recipe.category, 7)
+
+        stdout = StringIO()
+        call_command('reconcile_recipe_counts', stdout=stdout)
+        self.assertIn('1 category counters drifted.', stdout.getvalue())
+        self.assertCount(recipe.category, 1)
+
+        stdout = StringIO()
+        call_command('reconcile_recipe_counts', stdout=stdout)
+        self.assertIn('No category counters drifted.', stdout.getvalue())
@@ -0,0 +1,162 @@
+import shutil
+import tempfile
+from concurrent.futures import Future
+from io import BytesIO, StringIO
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+
+from recipes.covers import (FORMATS, _derivatives_done, derivative_name,
+                            derivative_names, derivative_widths)
+from recipes.models import Recipe
+
+from .test_recipe_base import RecipeTestBase
+
+
+def make_image_file(width=2000, height=1000, orientation=None, name='cover.jpg'):
+    image = Image.new('RGB', (width, height), 'orange')
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+
+    buffer = BytesIO()
+    image.save(buffer, format='JPEG', exif=exif)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+class RecipeCoverTest(RecipeTestBase):
+    def setUp(self) -> None:
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        overrides = override_settings(
+            MEDIA_ROOT=self.media_root, COVER_DERIVATIVE_WORKERS=0
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        return super().setUp()
+
+    def save_cover(self, recipe, file):
+        recipe.cover = file
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.save()
+        return recipe
+
+    def test_cover_dimensions_are_stored_on_save(self):
+        recipe = self.save_cover(self.make_recipe(), make_image_file(2000, 1000))
+        self.assertEqual((recipe.cover_width, recipe.cover_height), (2000, 1000))
+
+    def test_cover_dimensions_follow_the_exif_rotation(self):
+        recipe = self.save_cover(
+            self.make_recipe(), make_image_file(2000, 1000, orientation=6)
+        )
+        self.assertEqual((recipe.cover_width, recipe.cover_height), (1000, 2000))
+
+    def test_derivatives_are_generated_in_every_format_and_width(self):
+        recipe = self.save_cover(self.make_recipe(), make_image_file(2000, 1000))
+
+        names = derivative_names(recipe.cover.name, recipe.cover_width)
+        self.assertEqual(len(names), 3 * len(FORMATS))
+        for name in names:
+            self.assertTrue(default_storage.exists(name), name)
+
+        with default_storage.open(derivative_name(recipe.cover.name, 640, 'jpeg')) as file:
+            self.assertEqual(Image.open(file).size, (640, 320))
+
+    def test_small_covers_are_not_upscaled(self):
+        self.assertEqual(derivative_widths(300), [300])
+        self.assertEqual(derivative_widths(1000), [640, 840, 1000])
+        self.assertEqual(derivative_widths(4000), [640, 840, 1680])
+        self.assertEqual(derivative_widths(None), [])
+
+    def test_card_renders_srcset_and_dimensions(self):
+        self.save_cover(self.make_recipe(), make_image_file(2000, 1000))
+        content = self.client.get(reverse('recipes:home')).content.decode('utf-8')
+
+        self.assertIn('<picture>', content)
+        self.assertIn('srcset=', content)
+        self.assertIn('640w', content)
+        self.assertIn('width="2000" height="1000"', content)
+        self.assertIn('type="image/webp"', content)
+
+    def test_card_falls_back_to_the_original_until_derivatives_exist(self):
+        recipe = self.make_recipe()
+        recipe.cover = make_image_file(2000, 1000)
+        recipe.save()  # the commit callbacks never run
+
+        content = self.client.get(reverse('recipes:home')).content.decode('utf-8')
+        self.assertIn(f'src="{recipe.cover.url}"', content)
+        self.assertNotIn('srcset=', content)
+
+    def test_finished_derivatives_change_the_page_validators(self):
+        recipe = self.make_recipe()
+        recipe.cover = make_image_file(2000, 1000)
+        recipe.save()
+        urls = [reverse('recipes:home'), recipe.get_absolute_url()]
+        etags = [self.client.get(url)['ETag'] for url in urls]
+
+        future = Future()
+        future.set_result(None)
+        _derivatives_done(recipe, future)
+
+        for url, etag in zip(urls, etags):
+            self.assertNotEqual(self.client.get(url)['ETag'], etag)
+
+    def test_replacing_or_deleting_the_cover_removes_its_derivatives(self):
+        recipe = self.save_cover(self.make_recipe(), make_image_file(2000, 1000))
+        old_names = derivative_names(recipe.cover.name, recipe.cover_width)
+
+        self.save_cover(recipe, make_image_file(1000, 500, name='new.jpg'))
+        self.assertFalse(any(default_storage.exists(name) for name in old_names))
+
+        new_names = derivative_names(recipe.cover.name, recipe.cover_width)
+        recipe.delete()
+        self.assertFalse(any(default_storage.exists(name) for name in new_names))
+
+    def test_dashboard_upload_generates_derivatives(self):
+        author = self.make_author()
+        self.client.login(username='username', password='123456')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('authors:dashboard_recipe_new'), data={
+                'title': 'Recipe with cover',
+                'description': 'Description',
+                'preparation_time': 10,
+                'preparation_time_unit': 'Minutes',
+                'servings': 2,
+                'servings_unit': 'Portion',
+                'preparation_steps': 'Steps',
+                'cover': make_image_file(1200, 800),
+            })
+
+        recipe = Recipe.objects.get(author=author)
+        self.assertEqual(recipe.cover_width, 1200)
+        self.assertTrue(default_storage.exists(
+            derivative_name(recipe.cover.name, 640, 'jpeg')
+        ))
+
+    def test_backfill_command_fills_dimensions_and_derivatives(self):
+        recipe = self.save_cover(self.make_recipe(), make_image_file(1000, 500))
+        for name in derivative_names(recipe.cover.name, recipe.cover_width):
+            default_storage.delete(name)
+        Recipe.objects.filter(pk=recipe.pk).update(cover_width=None, cover_height=None)
+
+        stdout = StringIO()
+        call_command('generate_cover_derivatives', '--workers', '1', stdout=stdout)
+
+        recipe.refresh_from_db()
+        self.assertEqual((recipe.cover_width, recipe.cover_height), (1000, 500))
+        self.assertIn(f'{3 * len(FORMATS)} derivatives of 1 covers written', stdout.getvalue())
+
+    def test_backfill_command_reports_missing_files(self):
+        Recipe.objects.filter(pk=self.make_recipe().pk).update(cover='missing.jpg')
+
+        stderr = StringIO()
+        call_command(
+            'generate_cover_derivatives', '--workers', '1',
+            stdout=StringIO(), stderr=stderr,
+        )
+        self.assertIn('missing.jpg', stderr.getvalue())
@@ -76,3 +76,37 @@ class RecipeHomeViewTest(RecipeTestBase):
 
             response = self.client.get(reverse('recipes:home') + '?page=2')
             self.assertEqual(response.context['recipes'].number, 2)
+
+    def test_recipe_home_cursor_pagination_follows_next_and_previous(self):
+        recipes = []
+        for i in range(3):
+            kwargs = {
+                'author_data': {'username': f'u{i}'},
+                'category_data': {'slug': f'slug{i}'},
+                'slug': f'recipe-{i}'
+            }
+            recipes.append(self.make_recipe(**kwargs))
+
+        home_url = reverse('recipes:home')
+
+        with patch('recipes.views.PER_PAGE', new=2):
+            response = self.client.get(f'{home_url}?cursor=')
+            page = response.context['recipes']
+            self.assertEqual(list(page), [recipes[2], recipes[1]])
+            self.assertFalse(page.has_previous())
+            self.assertIn(page.next_cursor, response.content.decode('utf-8'))
+
+            response = self.client.get(f'{home_url}?cursor={page.next_cursor}')
+            page = response.context['recipes']
+            self.assertEqual(list(page), [recipes[0]])
+            self.assertFalse(page.has_next())
+
+            response = self.client.get(f'{home_url}?cursor={page.previous_cursor}')
+            page = response.context['recipes']
+            self.assertEqual(list(page), [recipes[2], recipes[1]])
+            self.assertFalse(page.has_previous())
+
+    def test_recipe_home_invalid_cursor_uses_first_page(self):
+        recipe = self.make_recipe()
+        response = self.client.get(reverse('recipes:home') + '?cursor=ABC')
+        self.assertEqual(list(response.context['recipes']), [recipe])
@@ -0,0 +1,152 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+
+from recipes.models import Category, Recipe
+from recipes.sitemaps import generate_sitemaps, get_site_root
+
+from .test_recipe_base import RecipeTestBase
+
+
+def make_row(**kwargs):
+    row = {
+        'title': 'Bolo de cenoura',
+        'description': 'Bolo fofinho',
+        'preparation_time': 40,
+        'preparation_time_unit': 'Minutes',
+        'servings': 8,
+        'servings_unit': 'Portion',
+        'preparation_steps': 'Bata tudo e asse.',
+        'is_published': True,
+        'category': 'Bolos',
+        'author': 'partner',
+        'tags': ['Doce', 'Forno'],
+    }
+    row.update(kwargs)
+    return row
+
+
+class RecipeImportCommandTest(RecipeTestBase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        return super().tearDown()
+
+    def write_file(self, name, content):
+        path = Path(self.directory.name) / name
+        path.write_text(content, encoding='utf-8')
+        return str(path)
+
+    def import_file(self, path, *args):
+        stdout, stderr = StringIO(), StringIO()
+        call_command('import_recipes', path, *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import_jsonl_creates_recipes_with_relations(self):
+        lines = [json.dumps(make_row()), json.dumps(make_row(tags=['Doce']))]
+        stdout, _ = self.import_file(self.write_file('recipes.jsonl', '\n'.join(lines)))
+
+        self.assertIn('2 recipes imported, 0 lines failed', stdout)
+        self.assertIn('rows/s', stdout)
+
+        recipes = Recipe.objects.order_by('id')
+        self.assertEqual(
+            [recipe.slug for recipe in recipes],
+            ['bolo-de-cenoura', 'bolo-de-cenoura-1'],
+        )
+        self.assertEqual(Category.objects.get().name, 'Bolos')
+        self.assertEqual(recipes[0].author.username, 'partner')
+        self.assertEqual(
+            sorted(recipes[0].tags.values_list('slug', flat=True)),
+            ['doce', 'forno'],
+        )
+
+    def test_import_reports_bad_lines_and_keeps_going(self):
+        lines = [
+            json.dumps(make_row()),
+            '{not json',
+            json.dumps(make_row(servings='')),
+            json.dumps(make_row(title='A' * 66)),
+            json.dumps(make_row(title='Pudim')),
+        ]
+        stdout, stderr = self.import_file(
+            self.write_file('recipes.jsonl', '\n'.join(lines)), '--batch-size', '2'
+        )
+
+        self.assertIn('2 recipes imported, 3 lines failed', stdout)
+        self.assertIn('line 2: invalid JSON', stderr)
+        self.assertIn('line 3: missing servings', stderr)
+        self.assertIn('line 4: title:', stderr)
+
+    def test_import_csv_reuses_existing_categories(self):
+        self.make_category(name='Bolos', slug='bolos')
+        content = (
+            'title,description,preparation_time,preparation_time_unit,'
+            'servings,servings_unit,preparation_steps,is_published,category,tags\n'
+            'Bolo,Fofinho,40,Minutes,8,Portion,Asse,1,Bolos,Doce|Forno\n'
+        )
+        stdout, _ = self.import_file(self.write_file('recipes.csv', content))
+
+        self.assertIn('1 recipes imported', stdout)
+        recipe = Recipe.objects.get()
+        self.assertEqual(recipe.category.slug, 'bolos')
+        self.assertEqual(recipe.tags.count(), 2)
+        self.assertIsNone(recipe.author)
+
+    def test_imported_recipes_are_searchable(self):
+        self.import_file(self.write_file('recipes.jsonl', json.dumps(make_row())))
+        response = self.client.get(reverse('recipes:search') + '?q=cenoura')
+        self.assertEqual(len(response.context['recipes']), 1)
+
+    def test_import_clears_the_sitemaps_and_feeds(self):
+        self.make_recipe()
+        with override_settings(SITEMAP_ROOT=self.directory.name):
+            generate_sitemaps('http://testserver')
+            site_root = get_site_root('http://testserver')
+            self.assertTrue((site_root / 'sitemap.xml').exists())
+
+            self.import_file(self.write_file('recipes.jsonl', json.dumps(make_row())))
+
+            self.assertFalse((site_root / 'sitemap.xml').exists())
+            self.assertEqual(list(site_root.glob('sitemap-recipes-*.xml')), [])
+            written = generate_sitemaps('http://testserver')
+            self.assertIn(
+                'bolo-de-cenoura', ''.join(path.read_text() for path in written)
+            )
+
+    def test_import_rejects_names_longer_than_their_columns(self):
+        lines = [
+            json.dumps(make_row(category='C' * 66)),
+            json.dumps(make_row(author='a' * 151)),
+            json.dumps(make_row(tags=['Doce', 'T' * 256])),
+            json.dumps(make_row(title='Pudim')),
+        ]
+        stdout, stderr = self.import_file(self.write_file('recipes.jsonl', '\n'.join(lines)))
+
+        self.assertIn('1 recipes imported, 3 lines failed', stdout)
+        self.assertIn('line 1: category: at most 65 characters', stderr)
+        self.assertIn('line 2: author: at most 150 characters', stderr)
+        self.assertIn('line 3: tags: at most 255 characters each', stderr)
+
+    def test_import_refreshes_the_related_recipes_of_the_imported_rows(self):
+        recipe = self.make_recipe(title='Bolo de chocolate', category_data={'name': 'Bolos'})
+        self.import_file(self.write_file('recipes.jsonl', json.dumps(make_row())))
+
+        imported = Recipe.objects.get(slug='bolo-de-cenoura')
+        self.assertIn(recipe, Recipe.objects.related_to(imported))
+
+    @patch('recipes.management.commands.import_recipes.MAX_REFRESHED_RELATED', 1)
+    def test_large_imports_leave_the_related_recipes_to_the_build_command(self):
+        lines = [json.dumps(make_row()), json.dumps(make_row())]
+        stdout, _ = self.import_file(self.write_file('recipes.jsonl', '\n'.join(lines)))
+
+        self.assertIn('run build_related_recipes', stdout)
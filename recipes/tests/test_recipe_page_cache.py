@@ -0,0 +1,89 @@
+from django.contrib import messages
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.test import RequestFactory
+from django.urls import reverse
+
+from recipes.page_cache import (PAGE_CACHE_HEADER, get_page_cache_stats,
+                                is_cacheable_request)
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipePageCacheTest(RecipeTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.recipe = self.make_recipe(title='Bolo de cenoura')
+
+    def get_home(self, query=''):
+        return self.client.get(reverse('recipes:home') + query)
+
+    def test_anonymous_home_is_served_from_cache_on_second_request(self):
+        self.assertEqual(self.get_home()[PAGE_CACHE_HEADER], 'MISS')
+
+        response = self.get_home()
+        self.assertEqual(response[PAGE_CACHE_HEADER], 'HIT')
+        self.assertIn('Bolo de cenoura', response.content.decode('utf-8'))
+
+    def test_page_cache_is_keyed_by_query_string(self):
+        self.get_home()
+        self.assertEqual(self.get_home('?page=2')[PAGE_CACHE_HEADER], 'MISS')
+
+    def test_page_cache_counts_hits_and_misses(self):
+        self.get_home()
+        self.get_home()
+        stats = get_page_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_ratio'], 0.5)
+
+    def test_authenticated_requests_are_not_cached(self):
+        self.client.login(username='username', password='123456')
+        self.get_home()
+        self.assertNotIn(PAGE_CACHE_HEADER, self.get_home())
+
+    def test_recipe_edit_invalidates_cached_pages(self):
+        self.get_home()
+        self.recipe.title = 'Bolo de laranja'
+        self.recipe.save()
+
+        response = self.get_home()
+        self.assertEqual(response[PAGE_CACHE_HEADER], 'MISS')
+        self.assertIn('Bolo de laranja', response.content.decode('utf-8'))
+
+    def test_unpublish_invalidates_cached_pages(self):
+        self.get_home()
+        self.recipe.is_published = False
+        self.recipe.save()
+
+        self.assertNotIn('Bolo de cenoura', self.get_home().content.decode('utf-8'))
+
+    def test_draft_edit_keeps_cached_pages(self):
+        draft = self.make_recipe(
+            slug='draft',
+            is_published=False,
+            author_data={'username': 'other'},
+            category_data={'slug': 'other'},
+        )
+        self.get_home()
+        draft.title = 'Still a draft'
+        draft.save()
+
+        self.assertEqual(self.get_home()[PAGE_CACHE_HEADER], 'HIT')
+
+    def test_category_change_invalidates_cached_pages(self):
+        self.client.get(reverse('recipes:category', args=('category-slug',)))
+        category = self.recipe.category
+        category.name = 'Tortas'
+        category.save()
+
+        response = self.client.get(reverse('recipes:category', args=('category-slug',)))
+        self.assertIn('Tortas', response.content.decode('utf-8'))
+
+    def test_pending_messages_skip_the_cache(self):
+        request = RequestFactory().get(reverse('recipes:home'))
+        request.user = AnonymousUser()
+        request._messages = CookieStorage(request)
+        self.assertTrue(is_cacheable_request(request))
+
+        messages.success(request, 'Your user is created, please log in.')
+        self.assertFalse(is_cacheable_request(request))
@@ -0,0 +1,65 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+
+from recipes.models import Recipe
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipePreparationStepsTest(RecipeTestBase):
+    def test_plain_steps_are_rendered_on_save(self):
+        recipe = self.make_recipe(preparation_steps='Mix\n<b>well</b>')
+        self.assertEqual(
+            recipe.preparation_steps_html, 'Mix<br>&lt;b&gt;well&lt;/b&gt;'
+        )
+
+    def test_html_steps_are_sanitized_on_save(self):
+        recipe = self.make_recipe(
+            preparation_steps='<p>Mix</p><script>alert(1)</script>',
+            preparation_steps_is_html=True,
+        )
+        self.assertEqual(recipe.preparation_steps_html, '<p>Mix</p>')
+
+    def test_update_fields_saves_the_rendered_steps(self):
+        recipe = self.make_recipe()
+        recipe.preparation_steps = 'New steps'
+        recipe.save(update_fields=['preparation_steps'])
+
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.preparation_steps_html, 'New steps')
+
+    def test_detail_page_serves_the_rendered_steps(self):
+        recipe = self.make_recipe(
+            preparation_steps='<p>Mix</p><img src=x onerror=alert(1)>',
+            preparation_steps_is_html=True,
+        )
+        response = self.client.get(reverse('recipes:recipe', args=(recipe.slug,)))
+
+        self.assertContains(response, '<p>Mix</p>')
+        self.assertNotContains(response, 'onerror')
+
+    def test_detail_page_renders_steps_not_rendered_yet(self):
+        recipe = self.make_recipe(
+            preparation_steps='<p>Mix</p><script>alert(1)</script>',
+            preparation_steps_is_html=True,
+        )
+        Recipe.objects.filter(pk=recipe.pk).update(preparation_steps_html='')
+
+        response = self.client.get(reverse('recipes:recipe', args=(recipe.slug,)))
+
+        self.assertContains(response, '<p>Mix</p>')
+        self.assertNotContains(response, '&lt;p&gt;')
+        self.assertNotContains(response, 'alert(1)')
+
+    def test_backfill_command_renders_missing_steps(self):
+        recipe = self.make_recipe(preparation_steps='Line 1\nLine 2')
+        Recipe.objects.filter(pk=recipe.pk).update(preparation_steps_html='')
+
+        stdout = StringIO()
+        call_command('render_preparation_steps', stdout=stdout)
+
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.preparation_steps_html, 'Line 1<br>Line 2')
+        self.assertIn('1 recipes rendered', stdout.getvalue())
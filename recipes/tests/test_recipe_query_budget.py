@@ -0,0 +1,74 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Count
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from recipes.models import Category, Recipe
+from tag.models import Tag
+from utils.query_budget import QueryBudgetMixin
+
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+@override_settings(CACHES=NO_CACHE)
+class RecipeQueryBudgetTest(QueryBudgetMixin, TestCase):
+    """
+    Query budgets of every recipes/authors view on a seeded dataset. Going
+    over a budget fails with the offending SQL, lower the budget when a
+    change saves queries.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            'seed_recipes', recipes=300, categories=5, tags=20, authors=10,
+            workers=1, stdout=StringIO(),
+        )
+        cls.recipe = Recipe.objects.filter(is_published=True).order_by('-id').first()
+        cls.category = Category.objects.filter(recipe__is_published=True).first()
+        cls.tag = Tag.objects.annotate(total=Count('recipe')).order_by('-total').first()
+        cls.draft = Recipe.objects.filter(is_published=False).order_by('-id').first()
+
+    def get_budgets(self):
+        # name: (url, author, max_queries, tables that must not be scanned)
+        return {
+            'home': (reverse('recipes:home'), None, 2, ()),
+            'category': (
+                reverse('recipes:category', args=(self.category.slug,)),
+                None, 2, ('recipes_recipe',),
+            ),
+            'tag': (
+                reverse('recipes:tag', args=(self.tag.slug,)),
+                None, 3, ('recipes_recipe',),
+            ),
+            'search': (
+                f'{reverse("recipes:search")}?q={self.recipe.title.split()[0]}',
+                None, 2, ('recipes_recipe',),
+            ),
+            'detail': (
+                reverse('recipes:recipe', args=(self.recipe.slug,)),
+                None, 4, ('recipes_recipe', 'recipes_relatedrecipe'),
+            ),
+            'dashboard': (
+                reverse('authors:dashboard'),
+                self.draft.author, 4, ('recipes_recipe', 'auth_user'),
+            ),
+            'dashboard_edit': (
+                reverse('authors:dashboard_recipe_edit', args=(self.draft.slug,)),
+                self.draft.author, 3, ('recipes_recipe', 'auth_user'),
+            ),
+        }
+
+    def test_views_stay_within_their_query_budget(self):
+        for name, (url, author, max_queries, tables) in self.get_budgets().items():
+            with self.subTest(view=name):
+                if author is not None:
+                    self.client.force_login(author)
+
+                with self.assertQueryBudget(max_queries, no_seq_scan_on=tables):
+                    response = self.client.get(url)
+
+                self.assertEqual(response.status_code, 200)
+                self.client.logout()
@@ -0,0 +1,162 @@
+from unittest.mock import patch
+
+from django.contrib.contenttypes.models import ContentType
+from django.urls import reverse
+
+from recipes.models import Recipe, RelatedRecipe
+from recipes.related import build_related, make_vector, similarity
+from tag.models import Tag
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RelatedRecipesTestBase(RecipeTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.added = 0
+        self.cakes = self.make_category(name='Cakes', slug='cakes')
+        self.soups = self.make_category(name='Soups', slug='soups')
+        self.chocolate = self.make_tag('Chocolate')
+        self.vegan = self.make_tag('Vegan')
+
+        self.base = self.add_recipe('Bolo de chocolate', self.cakes, [self.chocolate, self.vegan])
+        self.close = self.add_recipe('Bolo de chocolate vegano', self.cakes, [self.chocolate, self.vegan])
+        self.far = self.add_recipe('Sopa de legumes', self.soups, [self.vegan])
+        self.unrelated = self.add_recipe('Caldo verde', self.soups, [])
+
+    def make_tag(self, name):
+        return Tag.objects.create(
+            name=name, content_type=ContentType.objects.get_for_model(Recipe),
+            object_id=0,
+        )
+
+    def add_recipe(self, title, category, tags, is_published=True):
+        self.added += 1
+        recipe = self.make_recipe_with_category(
+            category, title=title, slug=f'recipe-{self.added}',
+            author_data={'username': f'author{self.added}'},
+            is_published=is_published,
+        )
+        recipe.tags.add(*tags)
+        return recipe
+
+    def get_etag(self, recipe):
+        return self.client.get(recipe.get_absolute_url())['ETag']
+
+    def related_ids(self, recipe):
+        return list(
+            RelatedRecipe.objects.filter(recipe=recipe).order_by('rank').values_list(
+                'related_id', flat=True,
+            )
+        )
+
+
+class RelatedRecipesBuildTest(RelatedRecipesTestBase):
+    def test_vectors_are_unit_length_and_the_recipe_is_its_best_match(self):
+        vector = make_vector(1, [1, 2], 'Bolo de chocolate', {1: 10, 2: 1}, 100)
+        self.assertAlmostEqual(similarity(vector, vector), 1.0)
+        self.assertEqual(make_vector(None, [], '', {}, 1), {})
+
+    def test_neighbors_are_ordered_by_shared_features(self):
+        build_related()
+
+        self.assertEqual(self.related_ids(self.base), [self.close.pk, self.far.pk])
+        self.assertEqual(self.related_ids(self.unrelated), [self.far.pk])
+
+    def test_batches_build_the_same_neighbors(self):
+        build_related()
+        expected = [self.related_ids(recipe) for recipe in Recipe.objects.order_by('id')]
+
+        with patch('recipes.related.BATCH_SIZE', 1):
+            build_related()
+
+        self.assertEqual(
+            [self.related_ids(recipe) for recipe in Recipe.objects.order_by('id')], expected,
+        )
+
+    def test_drafts_have_no_neighbors_and_are_no_neighbors(self):
+        draft = self.add_recipe(
+            'Bolo de chocolate e nozes', self.cakes, [self.chocolate], is_published=False,
+        )
+        build_related()
+
+        self.assertEqual(self.related_ids(draft), [])
+        self.assertNotIn(draft.pk, RelatedRecipe.objects.values_list('related_id', flat=True))
+
+    def test_detail_page_shows_the_neighbors_in_one_query(self):
+        build_related()
+
+        response = self.client.get(reverse('recipes:recipe', args=(self.base.slug,)))
+
+        self.assertEqual(response.context['related_recipes'], [self.close, self.far])
+        self.assertContains(response, 'Related recipes')
+        self.assertContains(response, self.close.get_absolute_url())
+
+        with self.assertNumQueries(1):
+            list(Recipe.objects.published().related_to(self.base).cards())
+
+    def test_a_rebuild_changes_the_detail_etag(self):
+        url = reverse('recipes:recipe', args=(self.base.slug,))
+        etag = self.client.get(url)['ETag']
+
+        build_related()
+
+        self.assertNotEqual(self.client.get(url)['ETag'], etag)
+
+
+class RelatedRecipesRefreshTest(RelatedRecipesTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        build_related()
+
+    def test_a_new_recipe_joins_the_neighbors_around_it(self):
+        self.base.refresh_from_db()
+        updated_at = self.base.updated_at
+        etag = self.get_etag(self.base)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            twin = self.add_recipe(
+                'Bolo de chocolate', self.cakes, [self.chocolate, self.vegan],
+            )
+
+        self.assertEqual(self.related_ids(twin)[0], self.base.pk)
+        self.assertEqual(self.related_ids(self.base)[0], twin.pk)
+
+        self.assertNotEqual(self.get_etag(self.base), etag)
+        self.base.refresh_from_db()
+        self.assertEqual(self.base.updated_at, updated_at)
+
+    def test_unpublishing_takes_the_recipe_out_of_every_list(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.close.is_published = False
+            self.close.save()
+
+        self.assertEqual(self.related_ids(self.close), [])
+        self.assertFalse(RelatedRecipe.objects.filter(related=self.close).exists())
+
+    def test_a_tag_change_refreshes_the_recipe(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.unrelated.tags.add(self.chocolate, self.vegan)
+
+        self.assertIn(self.base.pk, self.related_ids(self.unrelated))
+        self.assertIn(self.unrelated.pk, self.related_ids(self.base))
+
+    def test_clearing_a_tag_refreshes_its_recipes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.vegan.recipe_set.clear()
+
+        # the soups share only their category now
+        self.assertEqual(self.related_ids(self.far), [self.unrelated.pk])
+
+    def test_deleting_a_recipe_refreshes_the_pages_that_showed_it(self):
+        self.base.refresh_from_db()
+        updated_at = self.base.updated_at
+        etag = self.get_etag(self.base)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.close.delete()
+
+        self.assertNotEqual(self.get_etag(self.base), etag)
+        self.base.refresh_from_db()
+        self.assertEqual(self.base.updated_at, updated_at)
+        self.assertEqual(self.related_ids(self.base), [self.far.pk])
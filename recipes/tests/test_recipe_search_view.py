@@ -95,3 +95,47 @@ class RecipeSearchViewTest(RecipeTestBase):
             self.assertEqual(len(paginator.get_page(1)), 1)
             self.assertEqual(len(paginator.get_page(2)), 1)
             self.assertEqual(len(paginator.get_page(3)), 1)
+
+    def test_recipe_search_can_find_recipe_by_preparation_steps(self):
+        recipe = self.make_recipe(preparation_steps='Misture a farinha e asse')
+        response = self.client.get(reverse('recipes:search') + '?q=farinha')
+        self.assertIn(recipe, response.context['recipes'])
+
+    def test_recipe_search_ignores_accents(self):
+        recipe = self.make_recipe(title='Pão de queijo')
+        response = self.client.get(reverse('recipes:search') + '?q=pao')
+        self.assertIn(recipe, response.context['recipes'])
+
+    def test_recipe_search_ranks_title_matches_first(self):
+        description_match = self.make_recipe(
+            title='Torta de frango',
+            description='Sobremesa de chocolate',
+            slug='torta',
+            author_data={'username': 'one'},
+            category_data={'slug': 'a'},
+        )
+        title_match = self.make_recipe(
+            title='Bolo de chocolate',
+            slug='bolo',
+            author_data={'username': 'two'},
+            category_data={'slug': 'b'},
+        )
+        response = self.client.get(reverse('recipes:search') + '?q=chocolate')
+        recipes = list(response.context['recipes'])
+        self.assertEqual(recipes, [title_match, description_match])
+
+    def test_recipe_search_index_follows_recipe_changes(self):
+        recipe = self.make_recipe(title='Bolo de cenoura')
+        search_url = reverse('recipes:search')
+
+        recipe.title = 'Bolo de laranja'
+        recipe.save()
+        response = self.client.get(f'{search_url}?q=cenoura')
+        self.assertNotIn(recipe, response.context['recipes'])
+
+        response = self.client.get(f'{search_url}?q=laranja')
+        self.assertIn(recipe, response.context['recipes'])
+
+        recipe.delete()
+        response = self.client.get(f'{search_url}?q=laranja')
+        self.assertEqual(len(response.context['recipes']), 0)
@@ -0,0 +1,72 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+
+from recipes.models import Category, Recipe
+from tag.models import Tag
+from utils.recipes.factory import make_recipe_rows
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeSeedCommandTest(RecipeTestBase):
+    def seed(self, *args):
+        stdout = StringIO()
+        call_command(
+            'seed_recipes', '--recipes', '30', '--categories', '3', '--tags', '5',
+            '--authors', '4', '--chunk-size', '10', '--workers', '1', *args,
+            stdout=stdout,
+        )
+        return stdout.getvalue()
+
+    def test_seed_creates_the_requested_dataset(self):
+        stdout = self.seed()
+
+        self.assertIn('30 recipes, 3 categories, 5 tags and 4 authors seeded', stdout)
+        self.assertIn('recipes/s', stdout)
+        self.assertEqual(Recipe.objects.count(), 30)
+        self.assertEqual(Category.objects.count(), 3)
+        self.assertEqual(Tag.objects.count(), 5)
+        self.assertEqual(User.objects.count(), 4)
+        self.assertTrue(Recipe.tags.through.objects.exists())
+
+    def test_seed_reconciles_the_published_counters(self):
+        self.seed()
+        published = Recipe.objects.filter(is_published=True).count()
+        self.assertEqual(
+            sum(Category.objects.values_list('published_recipes_count', flat=True)),
+            published,
+        )
+
+    def test_seed_published_ratio(self):
+        self.seed('--published-ratio', '0')
+        self.assertFalse(Recipe.objects.filter(is_published=True).exists())
+
+    def test_seed_is_deterministic(self):
+        self.seed()
+        first = list(Recipe.objects.order_by('id').values_list('title', 'category__name'))
+        Recipe.objects.all().delete()
+        Category.objects.all().delete()
+        Tag.objects.all().delete()
+        User.objects.all().delete()
+
+        self.seed()
+        second = list(Recipe.objects.order_by('id').values_list('title', 'category__name'))
+        self.assertEqual(first, second)
+
+    def test_recipe_rows_depend_only_on_seed_and_start(self):
+        rows = make_recipe_rows(seed=1, start=2, count=2, categories=3, tags=5, authors=2)
+        self.assertEqual(
+            make_recipe_rows(seed=1, start=2, count=2, categories=3, tags=5, authors=2),
+            rows,
+        )
+        self.assertEqual([row['number'] for row in rows], [2, 3])
+
+    def test_skew_makes_first_category_the_most_popular(self):
+        rows = make_recipe_rows(
+            seed=1, start=0, count=500, categories=10, tags=5, authors=2,
+            category_skew=2,
+        )
+        counts = [sum(row['category'] == number for row in rows) for number in range(10)]
+        self.assertEqual(max(counts), counts[0])
@@ -0,0 +1,138 @@
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+
+from recipes.models import Recipe
+from recipes.sitemaps import chunk_name, get_site_root
+from tag.models import Tag
+
+from .test_recipe_base import RecipeTestBase
+
+SITE_URL = 'http://testserver'
+
+
+class CatalogFilesTestBase(RecipeTestBase):
+    def setUp(self) -> None:
+        self.sitemap_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.sitemap_root, ignore_errors=True)
+        overrides = override_settings(SITEMAP_ROOT=self.sitemap_root, SITEMAP_CHUNK_SIZE=2)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        super().setUp()
+
+        self.recipes = [
+            self.make_recipe(
+                title=f'Recipe {i}', slug=f'recipe-{i}',
+                author_data={'username': f'u{i}'},
+                category_data={'name': f'Category {i}', 'slug': f'category-{i}'},
+            )
+            for i in range(4)
+        ]
+
+    def get_content(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def chunk_path(self, section, chunk):
+        return get_site_root(SITE_URL) / chunk_name(section, chunk)
+
+
+class RecipeSitemapTest(CatalogFilesTestBase):
+    def test_index_lists_the_chunks_of_every_section(self):
+        content = self.get_content(reverse('recipes:sitemap_index'))
+        chunks = {recipe.pk // 2 for recipe in self.recipes}
+
+        for chunk in chunks:
+            self.assertIn(f'{SITE_URL}/sitemap-recipes-{chunk}.xml', content)
+        self.assertIn('<lastmod>', content)
+        self.assertIn('/sitemap-categories-', content)
+        self.assertNotIn('/sitemap-tags-', content)
+
+    def test_chunk_lists_published_recipes_of_its_id_range(self):
+        first, second = self.recipes[0], self.recipes[1]
+        Recipe.objects.filter(pk=second.pk).update(is_published=False)
+
+        content = self.get_content(
+            reverse('recipes:sitemap', args=('recipes', first.pk // 2))
+        )
+
+        self.assertIn(f'<loc>{SITE_URL}{first.get_absolute_url()}</loc>', content)
+        self.assertNotIn(second.get_absolute_url(), content)
+
+    def test_chunks_are_served_from_disk(self):
+        url = reverse('recipes:sitemap', args=('recipes', self.recipes[0].pk // 2))
+        self.get_content(url)
+
+        with self.assertNumQueries(0):
+            self.get_content(url)
+
+    def test_a_change_only_deletes_its_chunk_and_the_index(self):
+        first, last = self.recipes[0], self.recipes[-1]
+        for recipe in (first, last):
+            self.get_content(reverse('recipes:sitemap', args=('recipes', recipe.pk // 2)))
+        self.get_content(reverse('recipes:sitemap_index'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.title = 'Changed'
+            first.save()
+
+        self.assertFalse(self.chunk_path('recipes', first.pk // 2).exists())
+        self.assertTrue(self.chunk_path('recipes', last.pk // 2).exists())
+        self.assertFalse((get_site_root(SITE_URL) / 'sitemap.xml').exists())
+
+    def test_unknown_sections_and_empty_chunks_are_not_found(self):
+        for args in (('drafts', 0), ('recipes', 1000)):
+            response = self.client.get(reverse('recipes:sitemap', args=args))
+            self.assertEqual(response.status_code, 404)
+
+    def test_command_writes_every_missing_file(self):
+        stdout = StringIO()
+        call_command('generate_sitemaps', SITE_URL, stdout=stdout)
+
+        for recipe in self.recipes:
+            self.assertTrue(self.chunk_path('recipes', recipe.pk // 2).exists())
+        self.assertIn('sitemap files written', stdout.getvalue())
+
+
+class RecipeFeedTest(CatalogFilesTestBase):
+    def test_latest_feeds_list_the_newest_recipes(self):
+        content = self.get_content(reverse('recipes:feed'))
+        self.assertIn('<rss', content)
+        self.assertLess(content.index('Recipe 3'), content.index('Recipe 0'))
+
+        response = self.client.get(reverse('recipes:feed_atom'))
+        self.assertIn('application/atom+xml', response['Content-Type'])
+
+    def test_category_and_tag_feeds(self):
+        tag = Tag.objects.create(
+            name='Doces', content_type=ContentType.objects.get_for_model(Recipe),
+            object_id=0,
+        )
+        self.recipes[1].tags.add(tag)
+
+        content = self.get_content(reverse('recipes:category_feed', args=('category-2',)))
+        self.assertIn('Recipe 2', content)
+        self.assertNotIn('Recipe 1', content)
+
+        content = self.get_content(reverse('recipes:tag_feed_atom', args=('doces',)))
+        self.assertIn('Recipe 1', content)
+        self.assertNotIn('Recipe 2', content)
+
+        response = self.client.get(reverse('recipes:category_feed', args=('nothing',)))
+        self.assertEqual(response.status_code, 404)
+
+    def test_feeds_are_written_again_after_a_change(self):
+        url = reverse('recipes:feed')
+        self.get_content(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.recipes[0].title = 'Bolo de cenoura'
+            self.recipes[0].save()
+
+        self.assertIn('Bolo de cenoura', self.get_content(url))
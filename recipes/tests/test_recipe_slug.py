@@ -0,0 +1,86 @@
+from unittest.mock import patch
+
+from recipes.models import Recipe
+from utils.slugs import allocate_slug, allocate_slugs, next_free_slug
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeSlugTest(RecipeTestBase):
+    def make_unsaved_recipe(self, title='Bolo de cenoura'):
+        return Recipe(
+            title=title,
+            description='Recipe Description',
+            preparation_time=10,
+            preparation_time_unit='min',
+            servings=5,
+            servings_unit='portions',
+            preparation_steps='Recipe Preparation Steps',
+        )
+
+    def test_recipe_slug_is_made_from_title(self):
+        recipe = self.make_unsaved_recipe()
+        recipe.save()
+        self.assertEqual(recipe.slug, 'bolo-de-cenoura')
+
+    def test_recipe_slug_gets_the_first_free_suffix(self):
+        slugs = []
+        for _ in range(3):
+            recipe = self.make_unsaved_recipe()
+            recipe.save()
+            slugs.append(recipe.slug)
+
+        self.assertEqual(slugs, ['bolo-de-cenoura', 'bolo-de-cenoura-1', 'bolo-de-cenoura-2'])
+
+        Recipe.objects.filter(slug='bolo-de-cenoura-1').delete()
+        recipe = self.make_unsaved_recipe()
+        recipe.save()
+        self.assertEqual(recipe.slug, 'bolo-de-cenoura-1')
+
+    def test_allocate_slug_uses_one_query_for_any_number_of_collisions(self):
+        for number in range(20):
+            recipe = self.make_unsaved_recipe()
+            recipe.slug = 'bolo-de-cenoura' if number == 0 else f'bolo-de-cenoura-{number}'
+            recipe.save()
+
+        with self.assertNumQueries(1):
+            slug = allocate_slug(Recipe, 'Bolo de cenoura')
+
+        self.assertEqual(slug, 'bolo-de-cenoura-20')
+
+    def test_next_free_slug_ignores_other_slugs_with_the_same_prefix(self):
+        taken = {'bolo', 'bolo-de-cenoura', 'bolo-1x', 'bolo-2'}
+        self.assertEqual(next_free_slug('bolo', taken), 'bolo-1')
+
+    def test_long_titles_leave_room_for_the_suffix(self):
+        recipe = self.make_unsaved_recipe(title='Bolo ' * 13)
+        recipe.save()
+        other = self.make_unsaved_recipe(title='Bolo ' * 13)
+        other.save()
+
+        max_length = Recipe._meta.get_field('slug').max_length
+        self.assertLessEqual(len(other.slug), max_length)
+        self.assertEqual(other.slug, f'{recipe.slug}-1')
+
+    def test_allocate_slugs_assigns_unique_slugs_in_batch(self):
+        self.make_unsaved_recipe().save()
+
+        with self.assertNumQueries(1):
+            slugs = allocate_slugs(
+                Recipe, ['Bolo de cenoura'] * 3 + ['Pudim', 'Pudim']
+            )
+
+        self.assertEqual(slugs, [
+            'bolo-de-cenoura-1', 'bolo-de-cenoura-2', 'bolo-de-cenoura-3',
+            'pudim', 'pudim-1',
+        ])
+
+    def test_concurrent_slug_collision_is_retried(self):
+        self.make_unsaved_recipe().save()
+        stale_then_fresh = iter(['bolo-de-cenoura', 'bolo-de-cenoura-1'])
+
+        with patch('utils.slugs.allocate_slug', side_effect=lambda *args: next(stale_then_fresh)):
+            recipe = self.make_unsaved_recipe()
+            recipe.save()
+
+        self.assertEqual(recipe.slug, 'bolo-de-cenoura-1')
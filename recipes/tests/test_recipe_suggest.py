@@ -0,0 +1,120 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.urls import reverse
+
+from recipes import suggest
+from recipes.models import Recipe
+from recipes.suggest import PrefixIndex, fold, make_suggestion
+from tag.models import Tag
+
+from .test_recipe_base import RecipeTestBase
+
+SUGGEST_URL = reverse('recipes_api:suggest')
+
+
+class PrefixIndexTest(RecipeTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.index = PrefixIndex.build([
+            make_suggestion('recipe', 1, 'Pão de Açúcar', 'pao'),
+            make_suggestion('recipe', 2, 'Bolo de chocolate', 'bolo'),
+            make_suggestion('category', 1, 'Bolos', 'bolos'),
+        ])
+
+    def labels(self, query):
+        return [suggestion.label for suggestion in self.index.lookup(query)]
+
+    def test_fold_drops_accents_case_and_extra_spaces(self):
+        self.assertEqual(fold('  Pão  de AÇÚCAR '), 'pao de acucar')
+
+    def test_lookup_folds_the_query_and_matches_any_word(self):
+        self.assertEqual(self.labels('pão'), ['Pão de Açúcar'])
+        self.assertEqual(self.labels('acuc'), ['Pão de Açúcar'])
+        self.assertEqual(self.labels('CHOCO'), ['Bolo de chocolate'])
+        self.assertEqual(self.labels('de cho'), ['Bolo de chocolate'])
+
+    def test_label_prefixes_and_catalog_entries_come_first(self):
+        self.assertEqual(self.labels('bol'), ['Bolos', 'Bolo de chocolate'])
+        self.assertEqual(self.labels('b'), [])
+
+    def test_add_and_remove(self):
+        self.index.add(make_suggestion('recipe', 2, 'Torta de limão', 'torta'))
+        self.assertEqual(self.labels('choc'), [])
+        self.assertEqual(self.labels('lima'), ['Torta de limão'])
+
+        self.index.remove('recipe', 2)
+        self.assertEqual(self.labels('lima'), [])
+        self.assertEqual(len(self.index), 2)
+
+
+class SuggestionEndpointTest(RecipeTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.recipe = self.make_recipe(title='Pudim de leite condensado', slug='pudim')
+
+    def get_results(self, query):
+        response = self.client.get(SUGGEST_URL, {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def test_suggestions_are_answered_from_memory(self):
+        self.assertEqual(self.get_results('pudi'), [{
+            'kind': 'recipe',
+            'label': 'Pudim de leite condensado',
+            'url': self.recipe.get_absolute_url(),
+        }])
+
+        with self.assertNumQueries(0):
+            response = self.client.get(SUGGEST_URL, {'q': 'leite'})
+        self.assertIn('max-age=60', response['Cache-Control'])
+
+    def test_categories_without_published_recipes_are_left_out(self):
+        self.assertEqual(
+            [result['kind'] for result in self.get_results('categ')], ['category'],
+        )
+
+        self.recipe.is_published = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.recipe.save()
+
+        self.assertEqual(self.get_results('categ'), [])
+        self.assertEqual(self.get_results('pudi'), [])
+
+    def test_clearing_the_tags_of_a_recipe_drops_emptied_tags(self):
+        tag = Tag.objects.create(
+            name='Sobremesas', content_type=ContentType.objects.get_for_model(Recipe),
+            object_id=self.recipe.pk,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.recipe.tags.add(tag)
+        self.assertEqual(self.get_results('sobrem')[0]['kind'], 'tag')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.recipe.tags.clear()
+        self.assertEqual(self.get_results('sobrem'), [])
+
+    def test_changes_are_replayed_without_a_rebuild(self):
+        self.get_results('pudi')
+        index = suggest.get_index()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_recipe(
+                title='Pão de queijo', slug='pao-de-queijo',
+                author_data={'username': 'other'},
+                category_data={'name': 'Salgados', 'slug': 'salgados'},
+            )
+
+        self.assertEqual([result['label'] for result in self.get_results('pao')], ['Pão de queijo'])
+        self.assertIs(suggest.get_index(), index)
+
+    def test_a_missing_change_rebuilds_the_index(self):
+        self.get_results('pudi')
+        index = suggest.get_index()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.recipe.title = 'Quindim'
+            self.recipe.save()
+        cache.delete(suggest.change_key(suggest.get_generation(suggest.SUGGEST_GENERATION)))
+
+        self.assertEqual([result['label'] for result in self.get_results('quin')], ['Quindim'])
+        self.assertIsNot(suggest.get_index(), index)
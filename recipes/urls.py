@@ -1,15 +1,29 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import async_views, feeds, sitemaps, views
 
 # {% url 'recipes:home' %}
 app_name = 'recipes'
 
-urlpatterns = [
-    path('', views.RecipeListViewHome.as_view(), name='home'),
-    path('recipes/search/', views.RecipeListViewSearch.as_view(), name='search'),
-    path('recipes/tags/<slug:slug>', views.RecipeListViewTag.as_view(), name='tag'),
-    path('recipes/<slug:recipe_slug>/', views.RecipeDetail.as_view(), name='recipe'),
-    path('recipes/category/<slug:category_slug>/', views.RecipeListViewCategory.as_view(), name='category'),
 
-]
+def get_urlpatterns(views):
+    return [
+        path('', views.RecipeListViewHome.as_view(), name='home'),
+        path('recipes/search/', views.RecipeListViewSearch.as_view(), name='search'),
+        path('recipes/tags/<slug:slug>', views.RecipeListViewTag.as_view(), name='tag'),
+        path('recipes/<slug:recipe_slug>/', views.RecipeDetail.as_view(), name='recipe'),
+        path('recipes/category/<slug:category_slug>/', views.RecipeListViewCategory.as_view(), name='category'),
+        path('sitemap.xml', sitemaps.sitemap_index, name='sitemap_index'),
+        path('sitemap-<slug:section>-<int:chunk>.xml', sitemaps.sitemap_chunk, name='sitemap'),
+        path('feeds/latest/', feeds.latest_feed, name='feed'),
+        path('feeds/latest/atom/', feeds.latest_atom_feed, name='feed_atom'),
+        path('feeds/category/<slug:slug>/', feeds.category_feed, name='category_feed'),
+        path('feeds/category/<slug:slug>/atom/', feeds.category_atom_feed, name='category_feed_atom'),
+        path('feeds/tags/<slug:slug>/', feeds.tag_feed, name='tag_feed'),
+        path('feeds/tags/<slug:slug>/atom/', feeds.tag_atom_feed, name='tag_feed_atom'),
+    ]
+
+
+# the async views only pay off under ASGI, under WSGI they run in a loop each
+urlpatterns = get_urlpatterns(async_views if settings.ASYNC_VIEWS else views)
@@ -1,17 +1,25 @@
 import os
 
 from django.contrib import messages
-from django.db.models import Q
 from django.http.response import Http404
 from django.shortcuts import get_list_or_404, get_object_or_404, render
 from django.views.generic import DetailView, ListView
 
-from utils.pagination import make_pagination
+from utils.cache import get_generations
+from utils.counting import KnownCount
+from utils.pagination import (CURSOR_PARAM, make_keyset_pagination,
+                              make_pagination)
 
+from .cards import author_version, category_version, get_recipe_cards
+from .conditional import (RECIPE_TAGS_GENERATION, ConditionalGetMixin,
+                          ConditionalListMixin, make_etag, recipe_version)
 from .models import Recipe
+from .page_cache import AnonymousPageCacheMixin
+from .related import RELATED_GENERATION, related_version
 from tag.models import Tag
 
 PER_PAGE = os.environ.get('PER_PAGE', 9)
+PAGINATION_MODE = os.environ.get('PAGINATION_MODE', 'page')
 
 
 class RecipeListViewBase(ListView):
@@ -20,57 +28,78 @@ class RecipeListViewBase(ListView):
     context_object_name = 'recipes'
     ordering = ['-id']
     template_name = 'recipes/pages/home.html'
+    keyset_pagination = PAGINATION_MODE == 'keyset'
+
+    def use_keyset_pagination(self):
+        return self.keyset_pagination or CURSOR_PARAM in self.request.GET
+
+    def get_count_strategy(self):
+        # the conditional GET already counted the list
+        list_stats = getattr(self, 'list_stats', None)
+        if list_stats is not None:
+            return KnownCount(list_stats.count)
+        return None
 
     def get_queryset(self, *args, **kwargs):
         query_set = super().get_queryset(*args, **kwargs)
-        query_set = query_set.filter(
-            is_published=True,
-        )
-        query_set = query_set.select_related('author', 'category')
-        query_set = query_set.prefetch_related('tags')
+        query_set = query_set.published()
+        # the cards need a few columns of the recipe, author and category
+        query_set = query_set.cards()
         return query_set
 
     def get_context_data(self, *args, **kwargs):
         context = super().get_context_data(*args, **kwargs)
-        page_obj, pagination_range = make_pagination(self.request, context.get('recipes'), PER_PAGE)
+
+        if self.use_keyset_pagination():
+            page_obj, pagination_range = make_keyset_pagination(
+                self.request, context.get('recipes'), PER_PAGE
+            )
+        else:
+            page_obj, pagination_range = make_pagination(
+                self.request, context.get('recipes'), PER_PAGE,
+                count_strategy=self.get_count_strategy(),
+            )
 
         context.update({
             'recipes': page_obj,
+            'recipe_cards': get_recipe_cards(page_obj),
             'pagination_range': pagination_range,
         })
         return context
 
 
-class RecipeListViewHome(RecipeListViewBase):
+class RecipeListViewHome(ConditionalListMixin, AnonymousPageCacheMixin, RecipeListViewBase):
     template_name = 'recipes/pages/home.html'
 
 
-class RecipeListViewCategory(RecipeListViewBase):
+class RecipeListViewCategory(ConditionalListMixin, AnonymousPageCacheMixin, RecipeListViewBase):
     template_name = 'recipes/pages/category.html'
 
     def get_queryset(self, *args, **kwargs):
         query_set = super().get_queryset(*args, **kwargs)
-        query_set = query_set.filter(
-            category__slug=self.kwargs.get('category_slug'),
-        )
-
-        if not query_set:
-            raise Http404()
-
+        query_set = query_set.in_category(self.kwargs.get('category_slug'))
         return query_set
 
     def get_context_data(self, *args, **kwargs):
         context = super().get_context_data(*args, **kwargs)
 
+        # an empty page is the 404, no separate exists() round trip
+        if not context.get('recipes').object_list:
+            raise Http404()
+
         context.update({
             'title': f'{context.get("recipes")[0].category.name} - Category Recipes '
         })
         return context
 
 
-class RecipeListViewSearch(RecipeListViewBase):
+class RecipeListViewSearch(ConditionalListMixin, RecipeListViewBase):
     template_name = 'recipes/pages/search.html'
 
+    def use_keyset_pagination(self):
+        # results are ordered by relevance, there is no (-id) key to follow
+        return False
+
     def get_queryset(self, *args, **kwargs):
         search_term = self.request.GET.get('q', '')
 
@@ -78,12 +107,7 @@ class RecipeListViewSearch(RecipeListViewBase):
             raise Http404()
 
         query_set = super().get_queryset(*args, **kwargs)
-        query_set = query_set.filter(
-            Q(
-                Q(title__icontains=search_term) |
-                Q(description__icontains=search_term),
-            ),
-        )
+        query_set = query_set.search(search_term)
 
         return query_set
 
@@ -98,12 +122,12 @@ class RecipeListViewSearch(RecipeListViewBase):
         })
         return context
 
-class RecipeListViewTag(RecipeListViewBase):
+class RecipeListViewTag(ConditionalListMixin, AnonymousPageCacheMixin, RecipeListViewBase):
     template_name = 'recipes/pages/tag.html'
 
     def get_queryset(self, *args, **kwargs):
         query_set = super().get_queryset(*args, **kwargs)
-        query_set = query_set.filter(tags__slug=self.kwargs.get('slug', ''))
+        query_set = query_set.with_tag(self.kwargs.get('slug', ''))
 
         return query_set
 
@@ -122,20 +146,50 @@ class RecipeListViewTag(RecipeListViewBase):
         return context
 
 
-class RecipeDetail(DetailView):
+class RecipeDetail(ConditionalGetMixin, DetailView):
     model = Recipe
     context_object_name = 'recipe'
     template_name = 'recipes/pages/details.html'
 
+    def get_validators(self):
+        row = Recipe.objects.published().filter(
+            slug=self.kwargs.get('recipe_slug'),
+        ).values_list('id', 'updated_at', 'category_id', 'author_id')[:1]
+
+        if not row:
+            raise Http404()
+
+        recipe_id, updated_at, category_id, author_id = row[0]
+        # a rebuild of the related recipes changes every page at once
+        generations = get_generations([
+            RELATED_GENERATION, related_version(recipe_id),
+            RECIPE_TAGS_GENERATION, recipe_version(recipe_id),
+            category_version(category_id), author_version(author_id),
+        ])
+        etag = make_etag(self.request, updated_at.timestamp(), *generations.values())
+        return etag, updated_at
+
     def get_object(self):
         slug = self.kwargs.get('recipe_slug')
         return get_object_or_404(
-            Recipe,
+            Recipe.objects.select_related('author', 'category').prefetch_related('tags'),
             slug=slug,
             is_published=True
         )
 
+    def get_related_recipes(self):
+        return Recipe.objects.published().related_to(self.object).cards()
+
     def get_context_data(self, *args, **kwargs):
+        # the async view passes them in, already awaited
+        if 'related_recipes' not in kwargs:
+            kwargs['related_recipes'] = list(self.get_related_recipes())
+            kwargs['recipe_cards'] = get_recipe_cards(kwargs['related_recipes'])
+
+        # rows not rendered yet by render_preparation_steps, never the raw text
+        if not self.object.preparation_steps_html:
+            self.object.render_preparation_steps()
+
         context = super().get_context_data(*args, **kwargs)
         context.update({
             'is_detail_page': True,
@@ -3,7 +3,7 @@ from .models import Tag
 
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
-    list_display = 'id', 'name', 'slug',
+    list_display = 'id', 'name', 'slug', 'published_recipes_count',
     list_display_links = 'id', 'slug',
     search_fields = 'id', 'slug', 'name',
     list_per_page = 10
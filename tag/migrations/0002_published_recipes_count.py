@@ -0,0 +1,18 @@
+# Generated by Django 4.1.3 on 2026-10-18 20:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tag', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='published_recipes_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+    ]
@@ -1,8 +1,11 @@
+from functools import partial
+
 from django.db import models
-from django.utils.text import slugify
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
 
+from utils.slugs import allocate_slug, save_with_unique_slug
+
 class Tag(models.Model):
     name = models.CharField(max_length=255)
     slug = models.SlugField(unique=True)
@@ -14,20 +17,17 @@ class Tag(models.Model):
 
     content_object = GenericForeignKey('content_type', 'object_id')
 
-    def get_slug(self):
-        slug = slugify(self.name)
-        unique_slug = slug
+    # kept up to date by recipes.counters
+    published_recipes_count = models.IntegerField(default=0, editable=False)
 
-        number = 1
-        while Tag.objects.filter(slug=unique_slug).exists():
-            unique_slug = f'{slug}-{number}'
-            number += 1
-
-        return unique_slug
+    def get_slug(self):
+        return allocate_slug(Tag, self.name)
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = self.get_slug()
+            return save_with_unique_slug(
+                self, partial(super().save, *args, **kwargs), self.name
+            )
         return super().save(*args, **kwargs)
 
     def __str__(self):
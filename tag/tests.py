@@ -1,3 +1,20 @@
+from django.contrib.contenttypes.models import ContentType
 from django.test import TestCase
 
-# Create your tests here.
+from tag.models import Tag
+
+
+class TagSlugTest(TestCase):
+    def make_tag(self, name):
+        return Tag.objects.create(
+            name=name,
+            content_type=ContentType.objects.get_for_model(Tag),
+            object_id=1,
+        )
+
+    def test_tag_slug_is_made_from_name(self):
+        self.assertEqual(self.make_tag('Sem Glúten').slug, 'sem-gluten')
+
+    def test_tag_slug_is_unique(self):
+        self.make_tag('Vegano')
+        self.assertEqual(self.make_tag('Vegano').slug, 'vegano-1')
@@ -0,0 +1,107 @@
+import math
+import time
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from django.db import connections
+from django.template.backends.django import Template
+
+
+@contextmanager
+def temporary_database(alias='default', verbosity=0):
+    """
+    Runs the block against a freshly migrated test database, the same one
+    the test runner would create, and drops it afterwards.
+    """
+    connection = connections[alias]
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(
+        verbosity=verbosity,
+        autoclobber=True,
+        serialize=False,
+    )
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    index = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+def time_calls(func, repeat):
+    """Calls func repeat times and returns each duration in milliseconds."""
+    durations = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+
+    return durations
+
+
+def summarize(durations):
+    total_seconds = sum(durations) / 1000
+    return {
+        'p50': percentile(durations, 50),
+        'p95': percentile(durations, 95),
+        'p99': percentile(durations, 99),
+        'rps': len(durations) / total_seconds if total_seconds else 0.0,
+    }
+
+
+@contextmanager
+def capture_render_time():
+    """
+    Adds up the time spent rendering templates in the block. Only the
+    outermost render is timed, so includes are not counted twice.
+    """
+    timings = {'ms': 0.0}
+    depth = [0]
+    original_render = Template.render
+
+    def timed_render(self, *args, **kwargs):
+        depth[0] += 1
+        start = time.perf_counter()
+        try:
+            return original_render(self, *args, **kwargs)
+        finally:
+            depth[0] -= 1
+            if not depth[0]:
+                timings['ms'] += (time.perf_counter() - start) * 1000
+
+    with patch.object(Template, 'render', timed_render):
+        yield timings
+
+
+def find_regressions(baseline, results, threshold, metrics=('p95', 'queries')):
+    """
+    Compares two {name: {metric: value}} dicts and describes every metric
+    that grew more than threshold (0.1 = 10%) over the baseline.
+    """
+    regressions = []
+
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+
+        for metric in metrics:
+            old, new = before.get(metric), result.get(metric)
+            if old is None or new is None:
+                continue
+
+            if new > old * (1 + threshold) and new - old > 1e-9:
+                regressions.append(
+                    f'{name} {metric}: {old:.2f} -> {new:.2f} '
+                    f'(+{(new / old - 1) * 100 if old else float("inf"):.0f}%)'
+                )
+
+    return regressions
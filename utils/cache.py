@@ -0,0 +1,48 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def generation_key(name):
+    return f'generation:{name}'
+
+
+def get_generation(name):
+    # A fresh counter starts from the clock, so a counter evicted from the
+    # cache never comes back with a value that was already used.
+    return cache.get_or_set(generation_key(name), time.time_ns(), timeout=None)
+
+
+def get_generations(names):
+    """{name: generation} of several names with one cache round trip."""
+    keys = {generation_key(name): name for name in names}
+    found = cache.get_many(keys)
+    return {
+        name: found[key] if key in found else get_generation(name)
+        for key, name in keys.items()
+    }
+
+
+def bump_generation(name):
+    """Moves the generation forward, orphaning every key built from it."""
+    key = generation_key(name)
+
+    try:
+        return cache.incr(key)
+    except ValueError:
+        generation = time.time_ns()
+        cache.set(key, generation, timeout=None)
+        return generation
+
+
+def bump_generations_on_commit(*names):
+    """
+    Bumps the generations once the change is committed, a page rendered
+    before the commit must not be stored under the new generation.
+    """
+    def bump():
+        for name in names:
+            bump_generation(name)
+
+    transaction.on_commit(bump)
@@ -0,0 +1,163 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ImproperlyConfigured
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+
+from utils.cache import bump_generation, get_generation
+
+
+def count_generation_name(model):
+    return f'count:{model._meta.label_lower}'
+
+
+def invalidate_counts(model):
+    """Drops every cached count of the model, call it on writes."""
+    bump_generation(count_generation_name(model))
+
+
+class ExactCount:
+    def count(self, queryset):
+        return queryset.count()
+
+
+class CachedCount:
+    """
+    Keeps counts in the cache for a while, keyed by the SQL of the queryset
+    and the write generation of its model.
+    """
+
+    def __init__(self, timeout=None, counter=None):
+        self.timeout = settings.COUNT_CACHE_TIMEOUT if timeout is None else timeout
+        self.counter = counter or ExactCount()
+
+    def make_key(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        digest = hashlib.md5(f'{sql}{params}'.encode()).hexdigest()
+        generation = get_generation(count_generation_name(queryset.model))
+        return f'count:{queryset.db}:{generation}:{digest}'
+
+    def count(self, queryset):
+        try:
+            key = self.make_key(queryset)
+        except EmptyResultSet:
+            # nothing can match, e.g. .none() or an empty __in
+            return 0
+
+        count = cache.get(key)
+
+        if count is None:
+            count = self.counter.count(queryset)
+            cache.set(key, count, self.timeout)
+
+        return count
+
+
+class EstimatedCount:
+    """
+    Uses the planner statistics of PostgreSQL when they say the result is
+    above the threshold, counting exactly otherwise and on other databases.
+    """
+
+    def __init__(self, threshold=None):
+        if threshold is None:
+            threshold = settings.COUNT_ESTIMATE_THRESHOLD
+        self.threshold = threshold
+
+    def estimate(self, queryset):
+        connection = connections[queryset.db]
+
+        if connection.vendor != 'postgresql':
+            return None
+
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+
+        try:
+            with connection.cursor() as cursor:
+                if not queryset.query.where:
+                    cursor.execute(
+                        'SELECT reltuples::bigint FROM pg_class '
+                        'WHERE oid = %s::regclass',
+                        [queryset.model._meta.db_table]
+                    )
+                    return cursor.fetchone()[0]
+
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+        except DatabaseError:
+            return None
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        return plan[0]['Plan']['Plan Rows']
+
+    def count(self, queryset):
+        estimate = self.estimate(queryset)
+
+        if estimate is None or estimate < self.threshold:
+            return queryset.count()
+
+        return estimate
+
+
+class KnownCount:
+    """A total that was already counted, e.g. by an aggregate of the same rows."""
+
+    def __init__(self, total):
+        self.total = total
+
+    def count(self, queryset):
+        return self.total
+
+
+COUNT_STRATEGIES = {
+    'exact': ExactCount,
+    'cached': CachedCount,
+    'estimated': EstimatedCount,
+}
+
+
+def get_count_strategy(name=None):
+    name = name or settings.COUNT_STRATEGY
+
+    try:
+        return COUNT_STRATEGIES[name]()
+    except KeyError:
+        raise ImproperlyConfigured(
+            f'Unknown count strategy "{name}", use one of: '
+            f'{", ".join(COUNT_STRATEGIES)}'
+        )
+
+
+class CountStrategyPaginator(Paginator):
+    """
+    Paginator that asks a count strategy for the total instead of always
+    running COUNT(*). It also works as ModelAdmin.paginator.
+    """
+    count_strategy = None
+
+    def __init__(self, *args, count_strategy=None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        if count_strategy is not None:
+            self.count_strategy = count_strategy
+        elif isinstance(self.count_strategy, str) or self.count_strategy is None:
+            self.count_strategy = get_count_strategy(self.count_strategy)
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, 'query'):
+            return len(self.object_list)
+        return self.count_strategy.count(self.object_list)
+
+
+class EstimatedCountPaginator(CountStrategyPaginator):
+    count_strategy = 'estimated'
@@ -1,6 +1,13 @@
+import asyncio
+import base64
+import binascii
 import math
 
-from django.core.paginator import Paginator
+from asgiref.sync import sync_to_async
+
+from utils.counting import CountStrategyPaginator
+
+CURSOR_PARAM = 'cursor'
 
 
 def make_pagination_range(
@@ -34,13 +41,19 @@ def make_pagination_range(
     }
 
 
-def make_pagination(request, queryset, per_page, qty_pages=4):
+def get_page_number(request):
     try:
-        current_page = int(request.GET.get('page', 1))
+        return int(request.GET.get('page', 1))
     except ValueError:
-        current_page = 1
+        return 1
+
+
+def make_pagination(request, queryset, per_page, qty_pages=4, count_strategy=None):
+    current_page = get_page_number(request)
 
-    paginator = Paginator(queryset, per_page)
+    paginator = CountStrategyPaginator(
+        queryset, per_page, count_strategy=count_strategy
+    )
     page_obj = paginator.get_page(current_page)
 
     pagination_range = make_pagination_range(
@@ -50,3 +63,151 @@ def make_pagination(request, queryset, per_page, qty_pages=4):
     )
 
     return page_obj, pagination_range
+
+
+async def amake_pagination(request, queryset, per_page, qty_pages=4, count_strategy=None):
+    """
+    Async make_pagination. The count and the rows of the requested page are
+    fetched concurrently, the rows again only when the page is out of range.
+    """
+    current_page = get_page_number(request)
+
+    paginator = CountStrategyPaginator(
+        queryset, per_page, count_strategy=count_strategy
+    )
+    bottom = (max(current_page, 1) - 1) * paginator.per_page
+
+    # the count strategies may hit the cache as well, they stay sync
+    count, rows = await asyncio.gather(
+        sync_to_async(paginator.count_strategy.count)(queryset),
+        alist(queryset[bottom:bottom + paginator.per_page]),
+    )
+    paginator.count = count
+    page_obj = paginator.get_page(current_page)
+
+    if page_obj.number != current_page:
+        rows = await alist(page_obj.object_list)
+    page_obj.object_list = rows
+
+    pagination_range = make_pagination_range(
+        page_range=paginator.page_range,
+        qty_pages=qty_pages,
+        current_page=current_page
+    )
+
+    return page_obj, pagination_range
+
+
+async def alist(queryset):
+    return [item async for item in queryset]
+
+
+def encode_cursor(direction, value):
+    raw = f'{direction}:{value}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(cursor + padding).decode()
+        direction, value = raw.split(':', 1)
+        value = int(value)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None, None
+
+    if direction not in ('n', 'p'):
+        return None, None
+
+    return direction, value
+
+
+class KeysetPage:
+    """
+    The page of a cursor pagination. It behaves like the object_list of a
+    Paginator page, but has no page numbers or totals.
+    """
+
+    def __init__(self, object_list, has_next, has_previous,
+                 next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+
+def _keyset_queryset(queryset, direction, value, per_page):
+    if direction == 'p':
+        return queryset.filter(id__gt=value).order_by('id')[:per_page + 1]
+    if direction == 'n':
+        queryset = queryset.filter(id__lt=value)
+    return queryset.order_by('-id')[:per_page + 1]
+
+
+def _keyset_page(rows, direction, per_page):
+    if direction == 'p':
+        has_previous = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        has_next = True
+    else:
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+        has_previous = direction == 'n'
+
+    next_cursor = encode_cursor('n', rows[-1].id) if has_next and rows else None
+    previous_cursor = (
+        encode_cursor('p', rows[0].id) if has_previous and rows else None
+    )
+
+    page_obj = KeysetPage(
+        rows,
+        has_next=next_cursor is not None,
+        has_previous=previous_cursor is not None,
+        next_cursor=next_cursor,
+        previous_cursor=previous_cursor,
+    )
+    pagination_range = {
+        'keyset': True,
+        'next_cursor': next_cursor,
+        'previous_cursor': previous_cursor,
+    }
+
+    return page_obj, pagination_range
+
+
+def make_keyset_pagination(request, queryset, per_page):
+    """
+    Paginates newest first on (-id) using opaque cursors instead of page
+    numbers, so every page is a single indexed range query without COUNT or
+    OFFSET, no matter how deep it is.
+    """
+    per_page = int(per_page)
+    direction, value = decode_cursor(request.GET.get(CURSOR_PARAM, ''))
+    rows = list(_keyset_queryset(queryset, direction, value, per_page))
+    return _keyset_page(rows, direction, per_page)
+
+
+async def amake_keyset_pagination(request, queryset, per_page):
+    per_page = int(per_page)
+    direction, value = decode_cursor(request.GET.get(CURSOR_PARAM, ''))
+    rows = await alist(_keyset_queryset(queryset, direction, value, per_page))
+    return _keyset_page(rows, direction, per_page)
@@ -0,0 +1,83 @@
+import re
+from contextlib import contextmanager
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+
+def explain(connection, sql):
+    """Returns the plan of a captured query as a list of lines."""
+    if connection.vendor == 'sqlite':
+        statement = f'EXPLAIN QUERY PLAN {sql}'
+    elif connection.vendor == 'postgresql':
+        statement = f'EXPLAIN {sql}'
+    else:
+        return []
+
+    with connection.cursor() as cursor:
+        cursor.execute(statement)
+        return [str(row[-1]) for row in cursor.fetchall()]
+
+
+def find_seq_scans(plan, tables, vendor):
+    """Returns the tables of the plan that are read with a full table scan."""
+    scanned = []
+
+    for line in plan:
+        line = line.strip()
+
+        for table in tables:
+            if vendor == 'postgresql':
+                full_scan = re.search(rf'Seq Scan on {table}\b', line)
+            else:
+                # "SCAN t" is a table scan, "SCAN t USING [COVERING] INDEX i"
+                # walks an index and "SEARCH t ..." is an index lookup
+                full_scan = re.match(rf'SCAN {table}\b(?: AS \w+)?$', line)
+
+            if full_scan and table not in scanned:
+                scanned.append(table)
+
+    return scanned
+
+
+def format_queries(queries):
+    return '\n'.join(
+        f'{number}. {query["sql"]}' for number, query in enumerate(queries, start=1)
+    )
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin to hold a block of code to a query budget: at most
+    max_queries queries and no full scan of the tables in no_seq_scan_on,
+    checked with EXPLAIN on every captured SELECT.
+    """
+
+    @contextmanager
+    def assertQueryBudget(self, max_queries=None, no_seq_scan_on=(), using='default'):
+        connection = connections[using]
+
+        with CaptureQueriesContext(connection) as captured:
+            yield captured
+
+        queries = captured.captured_queries
+
+        if max_queries is not None and len(queries) > max_queries:
+            self.fail(
+                f'{len(queries)} queries executed, the budget is {max_queries}:\n'
+                f'{format_queries(queries)}'
+            )
+
+        for query in queries:
+            sql = query['sql']
+            if not sql.lstrip().upper().startswith('SELECT'):
+                continue
+
+            plan = explain(connection, sql)
+            scanned = find_seq_scans(plan, no_seq_scan_on, connection.vendor)
+
+            if scanned:
+                self.fail(
+                    f'Sequential scan on {", ".join(scanned)}:\n{sql}\n'
+                    f'Plan:\n' + '\n'.join(plan)
+                )
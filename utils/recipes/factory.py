@@ -1,4 +1,6 @@
 # from inspect import signature
+import random
+from itertools import accumulate
 from random import randint
 
 from faker import Faker
@@ -36,6 +38,72 @@ def make_recipe():
     }
 
 
+_fakers = {}
+
+
+def get_faker(seed):
+    if 'pt_BR' not in _fakers:
+        _fakers['pt_BR'] = Faker('pt_BR')
+    faker = _fakers['pt_BR']
+    faker.seed_instance(seed)
+    return faker
+
+
+def skewed_weights(size, skew):
+    """Zipf like cumulative weights, the first items are the most popular."""
+    return list(accumulate(1 / rank ** skew for rank in range(1, size + 1)))
+
+
+def make_recipe_rows(
+    seed,
+    start,
+    count,
+    categories,
+    tags,
+    authors,
+    published_ratio=0.8,
+    category_skew=1.1,
+    tag_skew=1.2,
+    tags_per_recipe=3,
+):
+    """
+    Makes count recipe dicts numbered from start. The rows only depend on
+    seed and start, so chunks can be made in any process and order.
+    Categories, tags and authors are given as indexes into their lists.
+    """
+    fake = get_faker(seed * 1_000_003 + start)
+    rand = random.Random(seed * 1_000_003 + start)
+    category_weights = skewed_weights(categories, category_skew)
+    tag_weights = skewed_weights(tags, tag_skew)
+    author_weights = skewed_weights(authors, 0.8)
+    # fake.text() is slow, long texts are built from a pool of sentences
+    sentences = fake.sentences(nb=300)
+    rows = []
+
+    for number in range(start, start + count):
+        rows.append({
+            'number': number,
+            'title': fake.sentence(nb_words=4).rstrip('.')[:65],
+            'description': fake.sentence(nb_words=12)[:165],
+            'preparation_time': rand.randint(5, 180),
+            'preparation_time_unit': 'Minutes',
+            'servings': rand.randint(1, 12),
+            'servings_unit': rand.choice(('Portion', 'Pieces', 'People')),
+            'preparation_steps': '\n'.join(
+                ' '.join(rand.choices(sentences, k=3))
+                for _ in range(rand.randint(3, 8))
+            ),
+            'is_published': rand.random() < published_ratio,
+            'category': rand.choices(range(categories), cum_weights=category_weights)[0],
+            'author': rand.choices(range(authors), cum_weights=author_weights)[0],
+            'tags': sorted(set(
+                rand.choices(range(tags), cum_weights=tag_weights, k=tags_per_recipe)
+            )) if tags else [],
+        })
+
+    return rows
+
+
 if __name__ == '__main__':
     from pprint import pprint
     pprint(make_recipe())
\ No newline at end of file
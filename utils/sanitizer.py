@@ -0,0 +1,96 @@
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from django.template.defaultfilters import linebreaksbr
+
+ALLOWED_TAGS = {
+    'a', 'b', 'blockquote', 'br', 'code', 'em', 'h2', 'h3', 'h4', 'i', 'li',
+    'ol', 'p', 'pre', 'strong', 'u', 'ul',
+}
+ALLOWED_ATTRIBUTES = {'a': {'href', 'title'}}
+ALLOWED_SCHEMES = {'', 'http', 'https', 'mailto'}
+# dropped together with everything inside them
+DROPPED_TAGS = {'iframe', 'noscript', 'object', 'script', 'style', 'template'}
+VOID_TAGS = {'br'}
+
+
+def is_safe_url(url):
+    return urlsplit(url.strip()).scheme.lower() in ALLOWED_SCHEMES
+
+
+class Sanitizer(HTMLParser):
+    """
+    Rebuilds HTML keeping only the allowed tags and attributes, escaping
+    all text and closing every tag it opened.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.open_tags = []
+        self.dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROPPED_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+
+        allowed = ALLOWED_ATTRIBUTES.get(tag, set())
+        attributes = [
+            (name, value) for name, value in attrs
+            if name in allowed and value is not None and
+            (name != 'href' or is_safe_url(value))
+        ]
+        if tag == 'a':
+            attributes.append(('rel', 'nofollow noopener'))
+
+        self.parts.append('<{}{}>'.format(tag, ''.join(
+            f' {name}="{escape(value)}"' for name, value in attributes
+        )))
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_TAGS:
+            self.dropping = max(self.dropping - 1, 0)
+            return
+        if self.dropping or tag not in self.open_tags:
+            return
+
+        # closes the tags left open inside it as well
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.parts.append(f'</{open_tag}>')
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.parts.append(escape(data, quote=False))
+
+    def get_html(self):
+        self.close()
+        return ''.join(self.parts) + ''.join(
+            f'</{tag}>' for tag in reversed(self.open_tags)
+        )
+
+
+def sanitize_html(value):
+    sanitizer = Sanitizer()
+    sanitizer.feed(value or '')
+    return sanitizer.get_html()
+
+
+def render_text(value, is_html=False):
+    """The HTML of user text: sanitized when it is HTML, escaped with <br> otherwise."""
+    if is_html:
+        return sanitize_html(value)
+    return str(linebreaksbr(value or '', autoescape=True))
@@ -0,0 +1,128 @@
+from functools import reduce
+from operator import or_
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+# room left in the slug field for a "-<number>" suffix
+SUFFIX_RESERVE = 6
+BATCH_LOOKUP_SIZE = 200
+
+
+def make_slug_base(value, max_length=50, fallback='item'):
+    base = slugify(value)[:max_length - SUFFIX_RESERVE].strip('-')
+    return base or fallback
+
+
+def _taken_filter(field_name, bases):
+    return reduce(or_, (
+        Q(**{field_name: base}) | Q(**{f'{field_name}__startswith': f'{base}-'})
+        for base in bases
+    ))
+
+
+def _used_numbers(bases, taken):
+    """
+    Maps each base to the suffix numbers already taken, 0 standing for the
+    bare base. Slugs that belong to no base are ignored.
+    """
+    used = {base: set() for base in bases}
+
+    def mark(slug):
+        if slug in used:
+            used[slug].add(0)
+
+        prefix, _, number = slug.rpartition('-')
+        if prefix in used and number.isdigit():
+            used[prefix].add(int(number))
+
+    for slug in taken:
+        mark(slug)
+
+    return used, mark
+
+
+def next_free_slug(base, taken):
+    """
+    Returns base, or base-N with the smallest N not taken. taken may hold
+    other slugs too, only base and its suffixed variants are looked at.
+    """
+    used, _ = _used_numbers([base], taken)
+    number = 0
+    while number in used[base]:
+        number += 1
+    return base if number == 0 else f'{base}-{number}'
+
+
+def allocate_slug(model, value, field_name='slug'):
+    """
+    Finds a free slug for value with a single prefix scan on the slug
+    column, instead of one exists() query per collision.
+    """
+    field = model._meta.get_field(field_name)
+    base = make_slug_base(value, field.max_length, model._meta.model_name)
+    taken = model._default_manager.filter(
+        _taken_filter(field_name, [base])
+    ).values_list(field_name, flat=True)
+    return next_free_slug(base, set(taken))
+
+
+def allocate_slugs(model, values, field_name='slug'):
+    """
+    Batch version of allocate_slug. Returns one slug per value, unique among
+    themselves and the table, looking the bases up in chunks.
+    """
+    field = model._meta.get_field(field_name)
+    bases = [
+        make_slug_base(value, field.max_length, model._meta.model_name)
+        for value in values
+    ]
+    unique_bases = list(dict.fromkeys(bases))
+    taken = set()
+
+    for start in range(0, len(unique_bases), BATCH_LOOKUP_SIZE):
+        chunk = unique_bases[start:start + BATCH_LOOKUP_SIZE]
+        taken.update(model._default_manager.filter(
+            _taken_filter(field_name, chunk)
+        ).values_list(field_name, flat=True))
+
+    used, mark = _used_numbers(unique_bases, taken)
+    next_numbers = dict.fromkeys(unique_bases, 0)
+    slugs = []
+
+    for base in bases:
+        number = next_numbers[base]
+        while number in used[base]:
+            number += 1
+
+        slug = base if number == 0 else f'{base}-{number}'
+        next_numbers[base] = number + 1
+        mark(slug)
+        slugs.append(slug)
+
+    return slugs
+
+
+def save_with_unique_slug(instance, save, value, field_name='slug', attempts=5):
+    """
+    Allocates a slug and saves. When a concurrent save took the same slug
+    first, the unique constraint fails and a new slug is allocated.
+    """
+    model = type(instance)
+
+    for attempt in range(attempts):
+        slug = allocate_slug(model, value, field_name)
+        setattr(instance, field_name, slug)
+
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            slug_taken = model._default_manager.filter(
+                **{field_name: slug}
+            ).exists()
+
+            if attempt == attempts - 1 or not slug_taken:
+                setattr(instance, field_name, '')
+                raise
@@ -0,0 +1,202 @@
+import gzip
+import mimetypes
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import (ManifestStaticFilesStorage,
+                                                staticfiles_storage)
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.functional import cached_property
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# content coding, file suffix, best first
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+CSS_TOKEN_RE = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*.*?\*/''', re.S)
+CSS_PUNCTUATION_RE = re.compile(r'\s*([{};,>])\s*')
+ACCEPT_ENCODING_RE = re.compile(r'([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?')
+
+
+def _squeeze_css(text):
+    text = re.sub(r'\s+', ' ', text)
+    text = CSS_PUNCTUATION_RE.sub(r'\1', text)
+    text = re.sub(r':\s+', ':', text)
+    return text.replace(';}', '}')
+
+
+def minify_css(css):
+    """Drops comments and the whitespace CSS does not need, keeping strings."""
+    parts = []
+    text = []
+    position = 0
+
+    for match in CSS_TOKEN_RE.finditer(css):
+        text.append(css[position:match.start()])
+        if match.group(1):
+            parts += [_squeeze_css(''.join(text)), match.group(1)]
+            text = []
+        else:
+            text.append(' ')
+        position = match.end()
+
+    text.append(css[position:])
+    parts.append(_squeeze_css(''.join(text)))
+    return ''.join(parts).strip()
+
+
+def minify_js(js):
+    """
+    Drops indentation, blank lines and whole line comments. Line breaks are
+    kept, automatic semicolon insertion depends on them, and sources with
+    template literals, whose lines are content, are left as they are.
+    """
+    if '`' in js:
+        return js
+
+    lines = (line.strip() for line in js.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//')) + '\n'
+
+
+def compressors():
+    yield '.gz', lambda content: gzip.compress(content, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield '.br', lambda content: brotli.compress(content, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ManifestStaticFilesStorage that minifies the CSS and JS before they are
+    hashed and writes .gz (and .br, with brotli installed) siblings of the
+    hashed files, for serve_static to pick from.
+    """
+    # a file that was not collected is served by its own name
+    manifest_strict = False
+    minifiers = {'.css': minify_css, '.js': minify_js}
+    compress_extensions = ('.css', '.js', '.svg', '.json', '.txt', '.xml', '.map')
+    min_compress_size = 256
+
+    @cached_property
+    def hashed_names(self):
+        """The names of the manifest, built once per loaded manifest."""
+        return frozenset(self.hashed_files.values())
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # not collected yet, e.g. in tests or a fresh checkout
+            return name
+
+    def minify(self, name):
+        minifier = self.minifiers.get(Path(name).suffix)
+        if minifier is None or Path(name).stem.endswith('.min'):
+            return
+
+        with self.open(name) as file:
+            content = file.read().decode('utf-8')
+
+        minified = minifier(content)
+        if minified != content:
+            self.delete(name)
+            self._save(name, ContentFile(minified.encode('utf-8')))
+
+    def compress(self, name):
+        if not name.endswith(self.compress_extensions):
+            return
+
+        with self.open(name) as file:
+            content = file.read()
+
+        if len(content) < self.min_compress_size:
+            return
+
+        for suffix, compress in compressors():
+            compressed = compress(content)
+            if len(compressed) < len(content):
+                if self.exists(name + suffix):
+                    self.delete(name + suffix)
+                self._save(name + suffix, ContentFile(compressed))
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            # the hashes are taken from the minified copies, not the sources
+            for name in paths:
+                self.minify(name)
+            paths = {name: (self, name) for name in paths}
+
+        yield from super().post_process(paths, dry_run, **options)
+        self.__dict__.pop('hashed_names', None)
+
+        if not dry_run:
+            for name in set(self.hashed_files.values()):
+                self.compress(name)
+
+
+def accepted_encodings(header):
+    """{content coding: q} of an Accept-Encoding header."""
+    accepted = {}
+    for coding, quality in ACCEPT_ENCODING_RE.findall(header or ''):
+        try:
+            accepted[coding.lower()] = float(quality) if quality else 1.0
+        except ValueError:
+            continue
+    return accepted
+
+
+def is_hashed(name):
+    return name in getattr(staticfiles_storage, 'hashed_names', ())
+
+
+@require_safe
+def serve_static(request, path):
+    """
+    Serves a collected file from STATIC_ROOT, its precompressed sibling when
+    the client accepts it. Hashed names never change, they are cached for
+    a year, the others are revalidated on every use.
+    """
+    try:
+        original = Path(safe_join(settings.STATIC_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404()
+
+    if not original.is_file():
+        raise Http404()
+
+    served, encoding = original, None
+    accepted = accepted_encodings(request.headers.get('Accept-Encoding'))
+    for coding, suffix in ENCODINGS:
+        candidate = original.with_name(original.name + suffix)
+        if accepted.get(coding, accepted.get('*', 0)) > 0 and candidate.is_file():
+            served, encoding = candidate, coding
+            break
+
+    stat = served.stat()
+    if not was_modified_since(request.headers.get('If-Modified-Since'), stat.st_mtime):
+        return HttpResponseNotModified()
+
+    content_type, _ = mimetypes.guess_type(original.name)
+    response = FileResponse(
+        served.open('rb'),
+        content_type=content_type or 'application/octet-stream',
+    )
+    # FileResponse names the file after the opened one, not wanted for assets
+    del response['Content-Disposition']
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ['Accept-Encoding'])
+    response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if is_hashed(path) else 'no-cache'
+    return response
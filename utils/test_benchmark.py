@@ -0,0 +1,34 @@
+from unittest import TestCase
+
+from utils.benchmark import find_regressions, percentile, summarize
+
+
+class BenchmarkTest(TestCase):
+
+    def test_percentile_uses_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 100), 100)
+
+    def test_percentile_of_empty_list_is_zero(self):
+        self.assertEqual(percentile([], 99), 0.0)
+
+    def test_summarize_reports_requests_per_second(self):
+        summary = summarize([500, 500])
+        self.assertEqual(summary['rps'], 2.0)
+        self.assertEqual(summary['p50'], 500)
+
+    def test_find_regressions_reports_metrics_over_threshold(self):
+        baseline = {'home': {'p95': 10.0, 'queries': 3}}
+        results = {'home': {'p95': 12.0, 'queries': 3}}
+
+        self.assertEqual(find_regressions(baseline, results, threshold=0.5), [])
+        self.assertEqual(
+            find_regressions(baseline, results, threshold=0.1),
+            ['home p95: 10.00 -> 12.00 (+20%)'],
+        )
+
+    def test_find_regressions_ignores_new_routes(self):
+        results = {'home': {'p95': 12.0}}
+        self.assertEqual(find_regressions({}, results, threshold=0.1), [])
@@ -0,0 +1,72 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+
+from utils.counting import (CachedCount, CountStrategyPaginator, EstimatedCount,
+                            ExactCount, get_count_strategy, invalidate_counts)
+
+
+class FixedCount:
+    def count(self, queryset):
+        return 100
+
+
+class CountStrategyTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        for i in range(3):
+            User.objects.create(username=f'user{i}')
+        return super().setUp()
+
+    def test_exact_count_counts_the_queryset(self):
+        self.assertEqual(ExactCount().count(User.objects.all()), 3)
+
+    def test_cached_count_is_reused_until_invalidated(self):
+        strategy = CachedCount(timeout=60)
+        self.assertEqual(strategy.count(User.objects.all()), 3)
+
+        User.objects.create(username='user3')
+        with self.assertNumQueries(0):
+            self.assertEqual(strategy.count(User.objects.all()), 3)
+
+        invalidate_counts(User)
+        self.assertEqual(strategy.count(User.objects.all()), 4)
+
+    def test_cached_count_with_timeout_zero_is_not_kept(self):
+        strategy = CachedCount(timeout=0)
+        self.assertEqual(strategy.count(User.objects.all()), 3)
+
+        User.objects.create(username='user3')
+        self.assertEqual(strategy.count(User.objects.all()), 4)
+
+    def test_cached_count_is_keyed_by_queryset(self):
+        strategy = CachedCount(timeout=60)
+        self.assertEqual(strategy.count(User.objects.all()), 3)
+        self.assertEqual(
+            strategy.count(User.objects.filter(username='user0')), 1
+        )
+
+    def test_querysets_that_match_nothing_count_zero(self):
+        for strategy in (CachedCount(timeout=60), EstimatedCount(threshold=0)):
+            with self.subTest(strategy=type(strategy).__name__):
+                self.assertEqual(strategy.count(User.objects.none()), 0)
+                self.assertEqual(strategy.count(User.objects.filter(pk__in=[])), 0)
+
+    def test_estimated_count_is_exact_without_planner_estimates(self):
+        self.assertEqual(EstimatedCount(threshold=0).count(User.objects.all()), 3)
+
+    def test_unknown_count_strategy_raises_improperly_configured(self):
+        with self.assertRaises(ImproperlyConfigured):
+            get_count_strategy('nope')
+
+    def test_paginator_uses_count_strategy(self):
+        paginator = CountStrategyPaginator(
+            User.objects.order_by('id'), 10, count_strategy=FixedCount()
+        )
+        self.assertEqual(paginator.count, 100)
+        self.assertEqual(paginator.num_pages, 10)
+
+    def test_paginator_counts_plain_lists_by_length(self):
+        paginator = CountStrategyPaginator([1, 2, 3], 2)
+        self.assertEqual(paginator.num_pages, 2)
@@ -1,6 +1,7 @@
 from unittest import TestCase
 
-from utils.pagination import make_pagination_range
+from utils.pagination import (decode_cursor, encode_cursor,
+                              make_pagination_range)
 
 
 class PaginationTest(TestCase):
@@ -64,3 +65,17 @@ class PaginationTest(TestCase):
             current_page=19
         )['pagination']
         self.assertEqual([17, 18, 19, 20], pagination)
+
+
+class KeysetCursorTest(TestCase):
+
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor('n', 5000)
+        self.assertEqual(decode_cursor(cursor), ('n', 5000))
+
+    def test_cursor_is_opaque(self):
+        self.assertNotIn('5000', encode_cursor('n', 5000))
+
+    def test_invalid_cursor_decodes_to_none(self):
+        for cursor in ('', 'ABC', encode_cursor('x', 1), encode_cursor('n', 'a')):
+            self.assertEqual(decode_cursor(cursor), (None, None))
@@ -0,0 +1,64 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+
+from utils.query_budget import QueryBudgetMixin, find_seq_scans
+
+
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    def setUp(self) -> None:
+        for i in range(3):
+            User.objects.create(username=f'user{i}')
+        return super().setUp()
+
+    def test_query_budget_passes_within_the_limits(self):
+        user = User.objects.first()
+
+        with self.assertQueryBudget(max_queries=1, no_seq_scan_on=('auth_user',)):
+            User.objects.get(pk=user.pk)
+
+    def test_query_budget_fails_with_the_sql_over_the_limit(self):
+        with self.assertRaises(AssertionError) as context:
+            with self.assertQueryBudget(max_queries=1):
+                list(User.objects.all())
+                list(User.objects.filter(username='user0'))
+
+        self.assertIn('2 queries executed, the budget is 1', str(context.exception))
+        self.assertIn('auth_user', str(context.exception))
+
+    def test_query_budget_fails_on_a_sequential_scan(self):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            self.skipTest('No query plans on this database')
+
+        with self.assertRaises(AssertionError) as context:
+            with self.assertQueryBudget(no_seq_scan_on=('auth_user',)):
+                list(User.objects.filter(first_name='user'))
+
+        self.assertIn('Sequential scan on auth_user', str(context.exception))
+        self.assertIn('Plan:', str(context.exception))
+
+
+class FindSeqScansTest(TestCase):
+    def test_sqlite_index_walks_and_lookups_are_not_scans(self):
+        plan = [
+            'SCAN recipes_recipe USING INDEX recipes_recipe_idx',
+            'SEARCH auth_user USING INTEGER PRIMARY KEY (rowid=?)',
+            'SCAN recipes_category',
+        ]
+        self.assertEqual(
+            find_seq_scans(plan, ('recipes_recipe', 'auth_user'), 'sqlite'), []
+        )
+        self.assertEqual(
+            find_seq_scans(plan, ('recipes_category',), 'sqlite'),
+            ['recipes_category'],
+        )
+
+    def test_postgresql_seq_scan(self):
+        plan = [
+            'Limit  (cost=0.29..1.02 rows=9 width=100)',
+            '  ->  Seq Scan on recipes_recipe  (cost=0.00..10.00 rows=9 width=100)',
+        ]
+        self.assertEqual(
+            find_seq_scans(plan, ('recipes_recipe',), 'postgresql'),
+            ['recipes_recipe'],
+        )
@@ -0,0 +1,44 @@
+from unittest import TestCase
+
+from utils.sanitizer import render_text, sanitize_html
+
+
+class SanitizerTest(TestCase):
+    def test_allowed_tags_are_kept(self):
+        html = '<p>Mix <strong>well</strong></p><ul><li>one</li></ul>'
+        self.assertEqual(sanitize_html(html), html)
+
+    def test_scripts_and_styles_are_dropped_with_their_content(self):
+        self.assertEqual(
+            sanitize_html('<p>a<script>alert(1)</script><style>p{}</style>b</p>'),
+            '<p>ab</p>',
+        )
+
+    def test_unknown_tags_and_attributes_are_stripped(self):
+        self.assertEqual(
+            sanitize_html('<div onclick="x()"><p class="a" onmouseover="y()">text</p></div>'),
+            '<p>text</p>',
+        )
+
+    def test_links_keep_safe_urls_only(self):
+        self.assertEqual(
+            sanitize_html('<a href="https://example.com/?a=1&b=2">ok</a>'),
+            '<a href="https://example.com/?a=1&amp;b=2" rel="nofollow noopener">ok</a>',
+        )
+        self.assertEqual(
+            sanitize_html('<a href=" JavaScript:alert(1)">bad</a>'),
+            '<a rel="nofollow noopener">bad</a>',
+        )
+
+    def test_text_is_escaped_and_open_tags_are_closed(self):
+        self.assertEqual(
+            sanitize_html('<p><em>1 < 2 &amp; 3'),
+            '<p><em>1 &lt; 2 &amp; 3</em></p>',
+        )
+        self.assertEqual(sanitize_html('<p><b>x</p>'), '<p><b>x</b></p>')
+
+    def test_plain_text_keeps_line_breaks_escaped(self):
+        self.assertEqual(
+            render_text('Mix\n<b>well</b>'), 'Mix<br>&lt;b&gt;well&lt;/b&gt;'
+        )
+        self.assertEqual(render_text('<b>well</b>', is_html=True), '<b>well</b>')
@@ -0,0 +1,101 @@
+import gzip
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.templatetags.static import static
+from django.test import SimpleTestCase, override_settings
+
+from utils.static_assets import (IMMUTABLE_CACHE_CONTROL, accepted_encodings,
+                                 minify_css, minify_js)
+
+
+class MinifyTest(SimpleTestCase):
+    def test_minify_css_drops_comments_and_whitespace(self):
+        css = '/* header */\n.a ,\n.b > p {\n  color: red;\n  margin: 0 auto;\n}\n'
+        self.assertEqual(minify_css(css), '.a,.b>p{color:red;margin:0 auto}')
+
+    def test_minify_css_keeps_strings_and_descendant_pseudo_classes(self):
+        css = '.a :hover { content: "/* not a comment */  x"; }'
+        self.assertEqual(minify_css(css), '.a :hover{content:"/* not a comment */  x"}')
+
+    def test_minify_js_keeps_line_breaks(self):
+        js = '// comment\nfunction a() {\n    return 1\n}\n\n'
+        self.assertEqual(minify_js(js), 'function a() {\nreturn 1\n}\n')
+
+    def test_minify_js_leaves_template_literals_alone(self):
+        js = 'const a = `\n    line\n`\n'
+        self.assertEqual(minify_js(js), js)
+
+    def test_accepted_encodings(self):
+        self.assertEqual(
+            accepted_encodings('gzip, br;q=0.5, identity;q=0'),
+            {'gzip': 1.0, 'br': 0.5, 'identity': 0.0},
+        )
+
+
+class CollectedStaticTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.static_root, ignore_errors=True)
+        cls.enterClassContext(override_settings(STATIC_ROOT=cls.static_root))
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    def hashed_name(self, name):
+        manifest = json.loads((Path(self.static_root) / 'staticfiles.json').read_text())
+        return manifest['paths'][name]
+
+    def test_files_are_minified_hashed_and_compressed(self):
+        hashed = Path(self.static_root) / self.hashed_name('global/css/style.css')
+
+        content = hashed.read_bytes()
+        self.assertNotIn(b'\n  ', content)
+        self.assertEqual(gzip.decompress(Path(f'{hashed}.gz').read_bytes()), content)
+
+    def test_static_tag_renders_the_hashed_name(self):
+        self.assertEqual(
+            static('global/css/style.css'),
+            f'/static/{self.hashed_name("global/css/style.css")}',
+        )
+
+    def test_hashed_files_are_served_compressed_and_immutable(self):
+        url = f'/static/{self.hashed_name("global/css/style.css")}'
+
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        content = b''.join(response.streaming_content)
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(response['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertFalse(response.has_header('Content-Disposition'))
+        self.assertIn(b'{', gzip.decompress(content))
+
+    def test_identity_is_served_to_clients_without_gzip(self):
+        url = f'/static/{self.hashed_name("global/css/style.css")}'
+
+        for accept_encoding in ('', 'gzip;q=0'):
+            response = self.client.get(url, HTTP_ACCEPT_ENCODING=accept_encoding)
+            self.assertFalse(response.has_header('Content-Encoding'))
+            self.assertIn(b'{', b''.join(response.streaming_content))
+
+    def test_unhashed_names_are_revalidated(self):
+        response = self.client.get('/static/global/css/style.css')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+
+    def test_missing_and_outside_files_are_not_found(self):
+        for url in ('/static/nothing.css', '/static/../project/settings.py'):
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class UncollectedStaticTest(SimpleTestCase):
+    def test_static_tag_falls_back_to_the_unhashed_name(self):
+        with tempfile.TemporaryDirectory() as static_root, \
+                override_settings(STATIC_ROOT=static_root):
+            self.assertEqual(staticfiles_storage.url('global/css/style.css'),
+                             '/static/global/css/style.css')